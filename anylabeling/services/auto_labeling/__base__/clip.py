@@ -1,12 +1,18 @@
 import os
+import os.path as osp
 import cv2
 import collections
+import hashlib
+import json
+import threading
 import unicodedata
+import uuid
 import six
 import numpy as np
-from typing import List
+from typing import List, Union
 from functools import lru_cache
 
+from ..embedding_cache import get_default_cache_dir
 from ..engines import OnnxBaseModel
 from anylabeling.views.labeling.logger import logger
 
@@ -32,8 +38,19 @@ _MODEL_INFO = {
 }
 
 
+def get_text_feature_cache_dir():
+    """Return the folder that keeps CLIP text features."""
+    return osp.join(get_default_cache_dir(), "clip_text")
+
+
 class ChineseClipONNX:
-    """Ref: https://github.com/OFA-Sys/Chinese-CLIP"""
+    """Ref: https://github.com/OFA-Sys/Chinese-CLIP
+
+    Text features of a class list are encoded in one batch and cached per
+    list, in memory and, unless `text_cache_dir` is False, as ``.npy``
+    files keyed by the text model file, so the same classes are not
+    re-encoded for every object or after a restart.
+    """
 
     def __init__(
         self,
@@ -42,6 +59,7 @@ class ChineseClipONNX:
         model_arch: str,
         device: str = "cpu",
         context_length: int = 52,
+        text_cache_dir: Union[str, bool, None] = None,
     ) -> None:
         # Load models
         self.txt_net = OnnxBaseModel(txt_model_path, device_type=device)
@@ -51,8 +69,29 @@ class ChineseClipONNX:
         # Text settings
         self._tokenizer = FullTokenizer()
         self.context_length = context_length
+        # Text feature cache
+        self._txt_features = {}
+        self._txt_lock = threading.Lock()
+        if text_cache_dir is False:
+            self.text_cache_dir = None
+        else:
+            self.text_cache_dir = (
+                text_cache_dir or get_text_feature_cache_dir()
+            )
+        try:
+            stat = os.stat(txt_model_path)
+            self._txt_model_id = (
+                f"{osp.abspath(txt_model_path)}|{stat.st_size}|"
+                f"{stat.st_mtime_ns}|{context_length}"
+            )
+        except OSError:
+            self._txt_model_id = None
 
-    def __call__(self, image: np.ndarray, text: List[str]):
+    def __call__(
+        self, image: Union[np.ndarray, List[np.ndarray]], text: List[str]
+    ):
+        """Class probabilities of an image, or of a list of image crops
+        scored in one batch, against the texts."""
         txt_features = self.txt_pipeline(text)
         img_features = self.img_pipeline(image)
         logits_per_image = 100 * np.dot(img_features, txt_features.T)
@@ -62,19 +101,73 @@ class ChineseClipONNX:
         return probabilities
 
     def txt_pipeline(self, text: List[str]):
-        text = self.tokenize(text, context_length=self.context_length)
-        features = []
-        for i in range(len(text)):
-            blob = np.expand_dims(text[i], axis=0)
-            feature = self.txt_net.get_ort_inference(blob)
-            features.append(feature)
-        features = np.squeeze(np.stack(features), axis=1)
-        features = self.postprocess(features)
+        """Return the normalized features of the texts, from the cache if
+        this list was encoded before."""
+        if isinstance(text, str):
+            text = [text]
+        key = tuple(text)
+        with self._txt_lock:
+            features = self._txt_features.get(key)
+            if features is None:
+                features = self._load_txt_features(key)
+            if features is None:
+                features = self.encode_text(text)
+                self._save_txt_features(key, features)
+            self._txt_features[key] = features
         return features
 
-    def img_pipeline(self, image: np.ndarray):
-        blob = self.image_preprocess(image, image_size=self.image_size)
-        outputs = self.img_net.get_ort_inference(blob)
+    def encode_text(self, text: List[str]):
+        """Run the text encoder once on all texts."""
+        tokens = self.tokenize(text, context_length=self.context_length)
+        features = self.txt_net.get_ort_batch_inference(tokens)[0]
+        return self.postprocess(features)
+
+    def _txt_feature_file(self, key):
+        if self.text_cache_dir is None or self._txt_model_id is None:
+            return None
+        signature = json.dumps([self._txt_model_id, key], ensure_ascii=False)
+        digest = hashlib.sha1(signature.encode("utf-8")).hexdigest()
+        return osp.join(self.text_cache_dir, f"{digest}.npy")
+
+    def _load_txt_features(self, key):
+        feature_file = self._txt_feature_file(key)
+        if feature_file is None or not osp.exists(feature_file):
+            return None
+        try:
+            features = np.load(feature_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable text features: {e}")
+            return None
+        return features if len(features) == len(key) else None
+
+    def _save_txt_features(self, key, features):
+        feature_file = self._txt_feature_file(key)
+        if feature_file is None:
+            return
+        tmp_file = f"{feature_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(self.text_cache_dir, exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                np.save(f, features)
+            os.replace(tmp_file, feature_file)
+        except OSError as e:
+            logger.warning(f"Could not persist text features: {e}")
+            if osp.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def img_pipeline(self, image: Union[np.ndarray, List[np.ndarray]]):
+        """Encode an image, or a list of images in one batch."""
+        if isinstance(image, np.ndarray):
+            blob = self.image_preprocess(image, image_size=self.image_size)
+            outputs = self.img_net.get_ort_inference(blob)
+        else:
+            blob = np.concatenate(
+                [
+                    self.image_preprocess(img, image_size=self.image_size)
+                    for img in image
+                ]
+            )
+            outputs = self.img_net.get_ort_batch_inference(blob)[0]
         features = self.postprocess(outputs)
         return features
 
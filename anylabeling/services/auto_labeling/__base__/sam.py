@@ -5,6 +5,8 @@ import onnxruntime as ort
 from typing import Tuple
 from copy import deepcopy
 
+from ..engines.ort_session import create_session
+
 
 class SegmentAnythingONNX:
     """Segmentation model using SegmentAnything"""
@@ -245,10 +247,10 @@ class EdgeSAMONNX(object):
         # TODO: Add back when TensorRT backend is stable
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
-        self.encoder_session = ort.InferenceSession(
+        self.encoder_session = create_session(
             encoder_model_path, providers=providers
         )
-        self.decoder_session = ort.InferenceSession(
+        self.decoder_session = create_session(
             decoder_model_path, providers=providers
         )
 
@@ -2,9 +2,10 @@ from typing import Any, List, Tuple, Union
 
 import cv2
 import numpy as np
-import onnxruntime as ort
 from numpy import ndarray
 
+from ..engines.ort_session import create_session
+
 
 class SegmentAnything2ONNX:
     """Segmentation model using Segment Anything 2 (SAM2)"""
@@ -82,10 +83,8 @@ class SAM2ImageEncoder:
         providers = ["CPUExecutionProvider"]
         if device.lower() == "gpu":
             providers = ["CUDAExecutionProvider"]
-        sess_options = ort.SessionOptions()
-        sess_options.log_severity_level = 3
-        self.session = ort.InferenceSession(
-            path, providers=providers, sess_options=sess_options
+        self.session = create_session(
+            path, providers=providers, log_severity_level=3
         )
 
         # Get model info
@@ -161,10 +160,8 @@ class SAM2ImageDecoder:
         providers = ["CPUExecutionProvider"]
         if device.lower() == "gpu":
             providers = ["CUDAExecutionProvider"]
-        sess_options = ort.SessionOptions()
-        sess_options.log_severity_level = 3
-        self.session = ort.InferenceSession(
-            path, providers=providers, sess_options=sess_options
+        self.session = create_session(
+            path, providers=providers, log_severity_level=3
         )
 
         self.orig_im_size = (
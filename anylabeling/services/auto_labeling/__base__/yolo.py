@@ -22,6 +22,7 @@ from ..utils import (
     scale_coords,
     point_in_bbox,
     masks2segments,
+    RoiMasks,
     xyxy2xywh,
     xywhr2xyxyxyxy,
     non_max_suppression_v5,
@@ -383,6 +384,61 @@ class YOLO(Model):
         self.image_shape = image.shape
         blob = self.preprocess(image, upsample_mode="letterbox")
         outputs = self.inference(blob)
+        return self.outputs_to_result(image, outputs)
+
+    def supports_batch_inference(self):
+        """Batching is available for plain ORT detectors with a fixed input
+        size; subclasses with their own predict_shapes fall back to the
+        per-image path."""
+        return (
+            self.engine.lower() != "dnn"
+            and self.input_width > 0
+            and self.input_height > 0
+            and type(self).predict_shapes is YOLO.predict_shapes
+        )
+
+    def predict_shapes_batch(self, images, image_paths=None):
+        """
+        Predict shapes for several images with a single batched session run
+        """
+        if image_paths is None:
+            image_paths = [None] * len(images)
+        if not self.supports_batch_inference():
+            return super().predict_shapes_batch(images, image_paths)
+
+        results = [[] for _ in images]
+        cv_images, blobs, indices = [], [], []
+        for i, (image, image_path) in enumerate(zip(images, image_paths)):
+            if image is None:
+                continue
+            try:
+                cv_image = qt_img_to_rgb_cv_img(image, image_path)
+            except Exception as e:  # noqa
+                logger.warning("Could not inference model")
+                logger.warning(e)
+                continue
+            cv_images.append(cv_image)
+            blobs.append(self.preprocess(cv_image, upsample_mode="letterbox"))
+            indices.append(i)
+        if not blobs:
+            return results
+
+        batch_outputs = self.net.get_ort_batch_inference(
+            np.concatenate(blobs, axis=0),
+            max_batch_size=self.config.get("batch_size"),
+        )
+        for j, (i, cv_image) in enumerate(zip(indices, cv_images)):
+            # Demultiplex: keep a batch axis of 1 so postprocess is unchanged
+            outputs = [out[j : j + 1] for out in batch_outputs]
+            self.img_height, self.img_width = cv_image.shape[:2]
+            self.image_shape = cv_image.shape
+            results[i] = self.outputs_to_result(cv_image, outputs)
+        return results
+
+    def outputs_to_result(self, image, outputs):
+        """
+        Convert the raw outputs of a single image into an AutoLabelingResult
+        """
         boxes, class_ids, scores, masks, keypoints = self.postprocess(outputs)
 
         points = [[] for _ in range(len(boxes))]
@@ -675,10 +731,17 @@ class YOLO(Model):
             row_ind += length
         return outs[np.newaxis, :]
 
-    def process_mask(self, protos, masks_in, bboxes, shape, upsample=False):
+    @staticmethod
+    def process_mask(protos, masks_in, bboxes, shape, upsample=False):
         """
         Apply masks to bounding boxes using the output of the mask head.
 
+        Only the proto pixels inside each box are decoded, in float32, and
+        each instance is upsampled on its own window, so the cost follows
+        the instance areas rather than n full-size float masks. With the
+        integer proto stride of YOLO models the result matches resizing
+        the full masks.
+
         Args:
             protos (np.ndarray): A tensor of shape [mask_dim, mask_h, mask_w].
             masks_in (np.ndarray): A tensor of shape [n, mask_dim], where n is the number of masks after NMS.
@@ -687,50 +750,70 @@ class YOLO(Model):
             upsample (bool): A flag to indicate whether to upsample the mask to the original image size. Default is False.
 
         Returns:
-            (np.ndarray): A binary mask tensor of shape [n, h, w],
-            where n is the number of masks after NMS, and h and w
-            are the height and width of the input image.
-            The mask is applied to the bounding boxes.
+            (RoiMasks): The binary masks of the n instances, cropped to
+            their bounding boxes, in a frame of size `shape` if upsampled
+            else of the mask size.
         """
         c, mh, mw = protos.shape
         ih, iw = shape
-        masks = 1 / (
-            1
-            + np.exp(
-                -np.dot(masks_in, protos.reshape(c, -1).astype(float)).astype(
-                    float
-                )
+        protos = protos.astype(np.float32, copy=False)
+        masks_in = masks_in.astype(np.float32, copy=False)
+
+        # Mask pixels x1 <= x < x2, y1 <= y < y2 are inside a box
+        downsampled_bboxes = bboxes[:, :4].copy()
+        downsampled_bboxes[:, [0, 2]] *= mw / iw
+        downsampled_bboxes[:, [1, 3]] *= mh / ih
+        cells = np.ceil(downsampled_bboxes).astype(int)
+        cells[:, [0, 2]] = cells[:, [0, 2]].clip(0, mw)
+        cells[:, [1, 3]] = cells[:, [1, 3]].clip(0, mh)
+
+        sx, sy = iw / mw, ih / mh
+        integral_scale = float(sx).is_integer() and float(sy).is_integer()
+        empty = (0, 0, np.zeros((0, 0), dtype=np.uint8))
+        rois = []
+        for coef, (x1, y1, x2, y2) in zip(masks_in, cells):
+            if x2 <= x1 or y2 <= y1:
+                rois.append(empty)
+                continue
+            logits = coef @ protos[:, y1:y2, x1:x2].reshape(c, -1)
+            logits = logits.reshape(y2 - y1, x2 - x1)
+            if not upsample:
+                # sigmoid(x) > 0.5 exactly when x > 0
+                rois.append((int(x1), int(y1), (logits > 0).view(np.uint8)))
+                continue
+
+            # Keep a margin of zeros that the interpolation reaches into
+            wx1, wy1 = max(x1 - 1, 0), max(y1 - 1, 0)
+            wx2, wy2 = min(x2 + 1, mw), min(y2 + 1, mh)
+            window = np.zeros((wy2 - wy1, wx2 - wx1), dtype=np.float32)
+            window[y1 - wy1 : y2 - wy1, x1 - wx1 : x2 - wx1] = 0.5 + 0.5 * (
+                np.tanh(0.5 * logits)
             )
-        )
-        masks = masks.reshape(-1, mh, mw)
-
-        downsampled_bboxes = bboxes.copy()
-        downsampled_bboxes[:, 0] *= mw / iw
-        downsampled_bboxes[:, 2] *= mw / iw
-        downsampled_bboxes[:, 3] *= mh / ih
-        downsampled_bboxes[:, 1] *= mh / ih
-        masks = self.crop_mask_np(masks, downsampled_bboxes)  # CHW
-        if upsample:
-            if masks.shape[0] == 1:
-                masks_np = np.squeeze(masks, axis=0)
-                masks_resized = cv2.resize(
-                    masks_np,
-                    (shape[1], shape[0]),
-                    interpolation=cv2.INTER_LINEAR,
-                )
-                masks = np.expand_dims(masks_resized, axis=0)
+            if integral_scale:
+                # Same sampling grid as resizing the whole mask
+                x0, y0 = wx1 * int(sx), wy1 * int(sy)
+                size = (window.shape[1] * int(sx), window.shape[0] * int(sy))
             else:
-                masks_np = np.transpose(masks, (1, 2, 0))
-                masks_resized = cv2.resize(
-                    masks_np,
-                    (shape[1], shape[0]),
-                    interpolation=cv2.INTER_LINEAR,
+                full = np.zeros((mh, mw), dtype=np.float32)
+                full[wy1:wy2, wx1:wx2] = window
+                window, x0, y0, size = full, 0, 0, (iw, ih)
+            mask = cv2.resize(window, size, interpolation=cv2.INTER_LINEAR)
+            mask = mask > 0.5
+            rows = np.flatnonzero(mask.any(axis=1))
+            cols = np.flatnonzero(mask.any(axis=0))
+            if rows.size == 0:
+                rois.append(empty)
+                continue
+            mask = mask[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+            rois.append(
+                (
+                    int(x0 + cols[0]),
+                    int(y0 + rows[0]),
+                    np.ascontiguousarray(mask).view(np.uint8),
                 )
-                masks = np.transpose(masks_resized, (2, 0, 1))
-        masks[masks > 0.5] = 1
-        masks[masks <= 0.5] = 0
+            )
 
-        return masks
+        return RoiMasks((ih, iw) if upsample else (mh, mw), rois)
 
     def postprocess_v10(
         self, prediction, task="det", conf_thres=0.25, classes=None
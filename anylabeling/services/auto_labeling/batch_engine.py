@@ -0,0 +1,442 @@
+"""Headless batch auto-labeling engine.
+
+The engine streams a list of images through three stages connected by
+bounded queues:
+
+    decode (thread pool) -> inference (single thread) -> save (writer)
+
+Models keep their own preprocess/postprocess inside ``predict_shapes``,
+so the inference stage calls the model exactly like the GUI does, but
+without touching the canvas. Images are consumed in list order, which
+keeps trackers and video models consistent.
+"""
+
+import os
+import os.path as osp
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import natsort
+
+from PyQt5.QtGui import QImage
+
+from anylabeling.views.labeling.logger import logger
+from anylabeling.views.labeling.label_file import LabelFile, LabelFileError
+from .types import AutoLabelingMode, AutoLabelingResult
+
+_STOP = object()
+
+AUTO_LABELING_MARKS = [
+    AutoLabelingMode.OBJECT,
+    AutoLabelingMode.ADD,
+    AutoLabelingMode.REMOVE,
+]
+
+
+class StageStats:
+    """Throughput counters for a single pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.busy_time = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, elapsed, count=1):
+        with self.lock:
+            self.count += count
+            self.busy_time += elapsed
+
+    @property
+    def throughput(self):
+        """Items per second of busy time."""
+        if self.busy_time <= 0:
+            return 0.0
+        return self.count / self.busy_time
+
+    def __repr__(self):
+        return (
+            f"{self.name}: {self.count} items, "
+            f"{self.busy_time:.2f}s busy, {self.throughput:.2f} it/s"
+        )
+
+
+class BatchProgress:
+    """Append-only record of finished images, used to resume a run."""
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.done = set()
+        self.lock = threading.Lock()
+        if filename and osp.exists(filename):
+            with open(filename, "r", encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+
+    def is_done(self, image_file):
+        return image_file in self.done
+
+    def mark_done(self, image_file):
+        with self.lock:
+            self.done.add(image_file)
+            if not self.filename:
+                return
+            with open(self.filename, "a", encoding="utf-8") as f:
+                f.write(image_file + "\n")
+
+    def clear(self):
+        with self.lock:
+            self.done = set()
+            if self.filename and osp.exists(self.filename):
+                os.remove(self.filename)
+
+
+def get_label_file_path(image_file, output_dir=None):
+    """Return the JSON label path that belongs to `image_file`."""
+    label_file = osp.splitext(image_file)[0] + LabelFile.suffix
+    if output_dir:
+        label_file = osp.join(output_dir, osp.basename(label_file))
+    return label_file
+
+
+def save_auto_labeling_result(
+    image_file,
+    result,
+    image_height,
+    image_width,
+    output_dir=None,
+    image_data=None,
+):
+    """Write an AutoLabelingResult to the label file of `image_file`.
+
+    Mirrors what the labeling widget does when a result is applied to the
+    canvas and saved: existing flags and extra fields are kept, existing
+    shapes are kept only if the result does not replace them.
+    """
+    label_file = get_label_file_path(image_file, output_dir)
+    image_dir = osp.dirname(image_file) if output_dir else None
+    shapes, flags, other_data = [], {}, {}
+    if osp.exists(label_file):
+        try:
+            prev = LabelFile(label_file, image_dir, load_image=False)
+            flags = prev.flags or {}
+            other_data = prev.other_data
+            if not result.replace:
+                shapes = [
+                    s.to_dict()
+                    for s in prev.shapes
+                    if s.label not in AUTO_LABELING_MARKS
+                ]
+        except LabelFileError as e:
+            logger.warning(f"Overwriting unreadable label file: {e}")
+    shapes += [
+        s.to_dict()
+        for s in result.shapes
+        if s.label not in AUTO_LABELING_MARKS
+    ]
+    if result.description:
+        other_data["description"] = result.description
+    other_data.setdefault("description", "")
+
+    label_dir = osp.dirname(label_file)
+    if label_dir and not osp.exists(label_dir):
+        os.makedirs(label_dir, exist_ok=True)
+    LabelFile().save(
+        filename=label_file,
+        shapes=shapes,
+        image_path=osp.relpath(image_file, label_dir or "."),
+        image_data=image_data,
+        image_height=image_height,
+        image_width=image_width,
+        other_data=other_data,
+        flags=flags,
+    )
+    return label_file
+
+
+class BatchLabelingEngine:
+    """Run a loaded auto-labeling model over many images without a canvas.
+
+    Args:
+        model (Model): A loaded auto-labeling model.
+        image_files (list): Image paths, processed in this order.
+        output_dir (str, optional): Where to write label files.
+            Defaults to next to each image.
+        predict_kwargs (dict, optional): Extra keyword arguments for
+            ``model.predict_shapes`` (e.g. ``text_prompt``).
+        num_workers (int): Number of decode threads.
+        batch_size (int): Number of images per inference call for models
+            that support batched inference.
+        queue_size (int): Capacity of each inter-stage queue.
+        progress_file (str, optional): File used to record finished images
+            so that an interrupted run can be resumed.
+        store_data (bool): Embed image data in the label files.
+        on_progress (callable, optional): Called as
+            ``on_progress(num_done, num_total, image_file)``.
+    """
+
+    def __init__(
+        self,
+        model,
+        image_files,
+        output_dir=None,
+        predict_kwargs=None,
+        num_workers=2,
+        batch_size=1,
+        queue_size=8,
+        progress_file=None,
+        store_data=False,
+        on_progress=None,
+    ):
+        self.model = model
+        self.image_files = list(image_files)
+        self.output_dir = output_dir
+        self.predict_kwargs = predict_kwargs or {}
+        self.num_workers = max(1, num_workers)
+        self.batch_size = max(1, batch_size)
+        if self.predict_kwargs or not model.supports_batch_inference():
+            self.batch_size = 1
+        self.queue_size = max(1, queue_size)
+        self.progress = BatchProgress(progress_file)
+        self.store_data = store_data
+        self.on_progress = on_progress
+        self.stats = {
+            name: StageStats(name) for name in ("decode", "inference", "save")
+        }
+        self.num_failed = 0
+        self._failed_lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Request the pipeline to stop after the current image."""
+        self._cancel_event.set()
+
+    def is_canceled(self):
+        return self._cancel_event.is_set()
+
+    def _add_failed(self, count=1):
+        # Failures are counted by both the inference and the save thread
+        with self._failed_lock:
+            self.num_failed += count
+
+    def pending_files(self):
+        return [f for f in self.image_files if not self.progress.is_done(f)]
+
+    def _decode(self, image_file):
+        start = time.perf_counter()
+        image_data = LabelFile.load_image_file(image_file)
+        image = QImage.fromData(image_data) if image_data else QImage()
+        self.stats["decode"].add(time.perf_counter() - start)
+        if image.isNull():
+            raise ValueError(f"Could not decode image: {image_file}")
+        return image, image_data if self.store_data else None
+
+    def _feed(self, executor, files, decode_queue):
+        for image_file in files:
+            if self.is_canceled():
+                break
+            decode_queue.put(
+                (image_file, executor.submit(self._decode, image_file))
+            )
+        decode_queue.put(_STOP)
+
+    def _save_loop(self, save_queue, num_done, num_total):
+        while True:
+            item = save_queue.get()
+            if item is _STOP:
+                break
+            image_file, result, height, width, image_data = item
+            start = time.perf_counter()
+            try:
+                if result is not None:
+                    save_auto_labeling_result(
+                        image_file,
+                        result,
+                        height,
+                        width,
+                        output_dir=self.output_dir,
+                        image_data=image_data,
+                    )
+                self.progress.mark_done(image_file)
+            except Exception as e:  # noqa
+                self._add_failed()
+                logger.error(f"Error saving labels for {image_file}: {e}")
+            self.stats["save"].add(time.perf_counter() - start)
+            num_done += 1
+            if self.on_progress is not None:
+                self.on_progress(num_done, num_total, image_file)
+
+    def _infer(self, batch, save_queue):
+        image_files = [item[0] for item in batch]
+        images = [item[1] for item in batch]
+        start = time.perf_counter()
+        try:
+            if len(batch) == 1:
+                results = [
+                    self.model.predict_shapes(
+                        images[0], image_files[0], **self.predict_kwargs
+                    )
+                ]
+            else:
+                results = self.model.predict_shapes_batch(images, image_files)
+        except Exception as e:  # noqa
+            self._add_failed(len(batch))
+            logger.error(f"Error in batch labeling {image_files}: {e}")
+            return
+        self.stats["inference"].add(time.perf_counter() - start, len(batch))
+        for (image_file, image, image_data), result in zip(batch, results):
+            if not isinstance(result, AutoLabelingResult):
+                # Models return [] when the image could not be handled
+                result = None
+            save_queue.put(
+                (image_file, result, image.height(), image.width(), image_data)
+            )
+
+    def run(self):
+        """Process all pending images. Returns the per-stage statistics."""
+        files = self.pending_files()
+        num_total = len(self.image_files)
+        logger.info(
+            f"Batch labeling {len(files)} of {num_total} images "
+            f"with {self.num_workers} decode workers "
+            f"and batch size {self.batch_size}"
+        )
+        decode_queue = queue.Queue(maxsize=self.queue_size)
+        save_queue = queue.Queue(maxsize=self.queue_size)
+        saver = threading.Thread(
+            target=self._save_loop,
+            args=(save_queue, num_total - len(files), num_total),
+            daemon=True,
+        )
+        saver.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            feeder = threading.Thread(
+                target=self._feed,
+                args=(executor, files, decode_queue),
+                daemon=True,
+            )
+            feeder.start()
+            batch = []
+            while True:
+                item = decode_queue.get()
+                if item is _STOP:
+                    break
+                image_file, future = item
+                if self.is_canceled():
+                    future.cancel()
+                    continue
+                try:
+                    image, image_data = future.result()
+                except Exception as e:  # noqa
+                    self._add_failed()
+                    logger.error(f"Error in batch labeling {image_file}: {e}")
+                    continue
+                batch.append((image_file, image, image_data))
+                if len(batch) >= self.batch_size:
+                    self._infer(batch, save_queue)
+                    batch = []
+            if batch and not self.is_canceled():
+                self._infer(batch, save_queue)
+            feeder.join()
+        save_queue.put(_STOP)
+        saver.join()
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Batch labeling finished in {elapsed:.2f}s "
+            f"({self.num_failed} failed)"
+        )
+        for stats in self.stats.values():
+            logger.info(f"  {stats}")
+        return self.stats
+
+
+def main():
+    """Command-line entry point: label a folder with a model config."""
+    import argparse
+
+    from PyQt5.QtCore import QCoreApplication
+
+    from PyQt5.QtGui import QImageReader
+    from tqdm import tqdm
+
+    from .model_manager import ModelManager
+
+    parser = argparse.ArgumentParser(
+        description="Run an auto-labeling model over a folder of images."
+    )
+    parser.add_argument("config", help="model config file (*.yaml)")
+    parser.add_argument("image_dir", help="folder with images to label")
+    parser.add_argument(
+        "--output", "-o", default=None, help="output folder for labels"
+    )
+    parser.add_argument("--text-prompt", default=None, help="text prompt")
+    parser.add_argument(
+        "--workers", type=int, default=2, help="number of decode threads"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="images per inference call for models that support batching",
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=8, help="inter-stage queue size"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the progress of a previous run",
+    )
+    parser.add_argument(
+        "--store-data",
+        action="store_true",
+        help="embed image data in the label files",
+    )
+    args = parser.parse_args()
+
+    app = QCoreApplication([])  # noqa: F841, needed by Qt image plugins
+    extensions = tuple(
+        f".{fmt.data().decode().lower()}"
+        for fmt in QImageReader.supportedImageFormats()
+    )
+    image_files = []
+    for root, _, files in os.walk(args.image_dir):
+        for file in files:
+            if file.lower().endswith(extensions):
+                image_files.append(osp.join(root, file))
+    image_files = natsort.os_sorted(image_files)
+
+    model = ModelManager().load_model_from_file(args.config)
+    if model is None:
+        raise SystemExit(1)
+
+    progress_file = osp.join(
+        args.output or args.image_dir, ".xanylabeling_batch_progress"
+    )
+    predict_kwargs = {}
+    if args.text_prompt:
+        predict_kwargs["text_prompt"] = args.text_prompt
+    engine = BatchLabelingEngine(
+        model,
+        image_files,
+        output_dir=args.output,
+        predict_kwargs=predict_kwargs,
+        num_workers=args.workers,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        progress_file=progress_file,
+        store_data=args.store_data,
+    )
+    if args.restart:
+        engine.progress.clear()
+    num_done = len(image_files) - len(engine.pending_files())
+    with tqdm(total=len(image_files), initial=num_done) as pbar:
+        engine.on_progress = lambda *_: pbar.update(1)
+        engine.run()
+    model.unload()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import os
 import cv2
 import numpy as np
-import onnxruntime as ort
 
 from scipy.interpolate import InterpolatedUnivariateSpline
 
@@ -13,6 +12,7 @@ from anylabeling.views.labeling.shape import Shape
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
 from .model import Model
+from .engines.ort_session import create_session
 from .types import AutoLabelingResult
 
 
@@ -53,20 +53,11 @@ class CLRNet(Model):
                 )
             )
 
-        self.sess_opts = ort.SessionOptions()
-        if "OMP_NUM_THREADS" in os.environ:
-            self.sess_opts.inter_op_num_threads = int(
-                os.environ["OMP_NUM_THREADS"]
-            )
         self.providers = ["CPUExecutionProvider"]
         if __preferred_device__ == "GPU":
             self.providers = ["CUDAExecutionProvider"]
 
-        self.net = ort.InferenceSession(
-            model_abs_path,
-            providers=self.providers,
-            sess_options=self.sess_opts,
-        )
+        self.net = create_session(model_abs_path, providers=self.providers)
         self.n_offsets = self.config["n_offsets"]
         self.n_strips = self.n_offsets - 1
         self.max_lanes = self.config["max_lanes"]
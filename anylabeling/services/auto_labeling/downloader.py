@@ -0,0 +1,301 @@
+"""Resumable, parallel downloader of model files."""
+
+import http.client
+import json
+import os
+import os.path as osp
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from anylabeling.views.labeling.logger import logger
+
+from .model_store import sha256sum
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+READ_SIZE = 256 * 1024
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _Download:
+    """A download in progress, shared by the threads requesting it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.sha256 = None
+        self.error = None
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.downloaded = 0
+        self.total = None
+
+    def add_listener(self, on_progress):
+        if on_progress is not None:
+            with self.lock:
+                self.listeners.append(on_progress)
+
+    def advance(self, nbytes):
+        with self.lock:
+            self.downloaded += nbytes
+            listeners = list(self.listeners)
+            downloaded, total = self.downloaded, self.total
+        for on_progress in listeners:
+            on_progress(downloaded, total)
+
+
+class ModelDownloader:
+    """Downloads model files over HTTP(S).
+
+    Files are written to ``<path>.part`` and renamed once complete and
+    verified. When the server supports range requests, the file is split
+    into `chunk_size` chunks fetched by `num_workers` threads; finished
+    chunks are recorded in ``<path>.part.json`` so an interrupted
+    download resumes where it stopped, and a dropped connection is
+    retried from the last received byte. Concurrent requests for the same
+    file wait for a single download.
+
+    Args:
+        num_workers (int): Number of parallel connections.
+        chunk_size (int): Size of the ranges fetched by one request.
+        timeout (float): Socket timeout of a request in seconds.
+        retries (int): Attempts per chunk before giving up.
+    """
+
+    def __init__(
+        self,
+        num_workers=4,
+        chunk_size=8 * 1024 * 1024,
+        timeout=30,
+        retries=5,
+    ):
+        self.num_workers = max(1, num_workers)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = max(1, retries)
+        self.lock = threading.Lock()
+        self._downloads = {}
+
+    def download(self, url, path, sha256=None, on_progress=None):
+        """Download `url` to `path`.
+
+        Args:
+            url (str): File URL.
+            path (str): Destination file.
+            sha256 (str, optional): Expected SHA-256 of the file.
+            on_progress (callable, optional): Called with the downloaded
+                and total bytes; the total is None if unknown.
+
+        Returns:
+            (str): SHA-256 of the downloaded file.
+
+        Raises:
+            DownloadError: If the download failed or the checksum differs.
+        """
+        path = osp.abspath(path)
+        with self.lock:
+            download = self._downloads.get(path)
+            owner = download is None
+            if owner:
+                download = self._downloads[path] = _Download()
+            download.add_listener(on_progress)
+        if not owner:
+            download.done.wait()
+        else:
+            try:
+                download.sha256 = self._download(url, path, sha256, download)
+            except Exception as e:  # noqa
+                download.error = e
+            finally:
+                with self.lock:
+                    del self._downloads[path]
+                download.done.set()
+        if download.error is not None:
+            if isinstance(download.error, DownloadError):
+                raise download.error
+            raise DownloadError(
+                f"Could not download {url}: {download.error}"
+            ) from download.error
+        return download.sha256
+
+    def _open(self, url, start=None, end=None):
+        request = urllib.request.Request(url)
+        if start is not None:
+            request.add_header("Range", f"bytes={start}-{end}")
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def _download(self, url, path, sha256, download):
+        part_path = f"{path}.part"
+        state_path = f"{part_path}.json"
+        os.makedirs(osp.dirname(path), exist_ok=True)
+
+        # Probe with a one-byte range: unlike HEAD, it survives redirects
+        response = self._open(url, 0, 0)
+        content_range = CONTENT_RANGE_PATTERN.match(
+            response.headers.get("Content-Range", "")
+        )
+        if response.status != 206 or content_range is None:
+            # No range support, the response is the whole file
+            total = response.headers.get("Content-Length")
+            download.total = int(total) if total is not None else None
+            with response, open(part_path, "wb") as f:
+                size = self._copy(response, f, download)
+            if download.total is not None and size != download.total:
+                raise DownloadError(f"Connection to {url} closed early")
+        elif content_range.group(3) == "*":
+            response.close()
+            raise DownloadError(f"Unknown size of {url}")
+        else:
+            response.close()
+            download.total = int(content_range.group(3))
+            validator = response.headers.get("ETag") or response.headers.get(
+                "Last-Modified"
+            )
+            self._download_ranges(
+                url, part_path, state_path, validator, download
+            )
+
+        actual_sha256 = sha256sum(part_path)
+        if sha256 is not None and actual_sha256 != sha256.lower():
+            for filename in [part_path, state_path]:
+                if osp.exists(filename):
+                    os.remove(filename)
+            raise DownloadError(
+                f"Checksum mismatch for {url}: expected {sha256}, "
+                f"got {actual_sha256}"
+            )
+        os.replace(part_path, path)
+        if osp.exists(state_path):
+            os.remove(state_path)
+        return actual_sha256
+
+    def _download_ranges(
+        self, url, part_path, state_path, validator, download
+    ):
+        total = download.total
+        chunks = [
+            (start, min(start + self.chunk_size, total) - 1)
+            for start in range(0, total, self.chunk_size)
+        ]
+        state = {
+            "url": url,
+            "size": total,
+            "validator": validator,
+            "chunk_size": self.chunk_size,
+            "done": [],
+        }
+        previous = self._read_state(state_path)
+        if (
+            previous is not None
+            and osp.exists(part_path)
+            and os.path.getsize(part_path) == total
+            and all(
+                previous.get(k) == v for k, v in state.items() if k != "done"
+            )
+        ):
+            state["done"] = previous["done"]
+            logger.info(
+                f"Resuming download of {url}: "
+                f"{len(state['done'])}/{len(chunks)} chunks done"
+            )
+        else:
+            with open(part_path, "wb") as f:
+                f.truncate(total)
+        done = set(state["done"])
+        download.advance(
+            sum(
+                end - start + 1
+                for i, (start, end) in enumerate(chunks)
+                if i in done
+            )
+        )
+
+        state_lock = threading.Lock()
+
+        def fetch(index):
+            start, end = chunks[index]
+            self._fetch_range(url, part_path, start, end, download)
+            with state_lock:
+                done.add(index)
+                state["done"] = sorted(done)
+                self._write_state(state_path, state)
+
+        pending = [i for i in range(len(chunks)) if i not in done]
+        with ThreadPoolExecutor(self.num_workers) as executor:
+            futures = [executor.submit(fetch, i) for i in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Stop at the first failure, the rest is fetched on resume
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _fetch_range(self, url, part_path, start, end, download):
+        offset = start
+        for attempt in range(self.retries):
+            try:
+                response = self._open(url, offset, end)
+                if response.status != 206:
+                    response.close()
+                    raise DownloadError(f"Range request refused by {url}")
+                with response, open(part_path, "r+b") as f:
+                    f.seek(offset)
+                    # Count bytes as they arrive, a retry resumes after them
+                    for block in iter(lambda: response.read(READ_SIZE), b""):
+                        block = block[: end + 1 - offset]
+                        f.write(block)
+                        offset += len(block)
+                        download.advance(len(block))
+                        if offset > end:
+                            return
+                raise DownloadError(f"Connection to {url} closed early")
+            except (OSError, http.client.HTTPException, DownloadError) as e:
+                if attempt == self.retries - 1:
+                    raise
+                logger.warning(
+                    f"Retrying bytes {offset}-{end} of {url} after: {e}"
+                )
+                time.sleep(min(2**attempt, 10) * 0.1)
+
+    @staticmethod
+    def _copy(response, f, download):
+        copied = 0
+        for block in iter(lambda: response.read(READ_SIZE), b""):
+            f.write(block)
+            copied += len(block)
+            download.advance(len(block))
+        return copied
+
+    @staticmethod
+    def _read_state(state_path):
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_state(state_path, state):
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+
+
+_downloader = ModelDownloader()
+
+
+def get_downloader():
+    """Return the downloader shared by all models."""
+    return _downloader
+
+
+def set_downloader(downloader):
+    global _downloader
+    _downloader = downloader
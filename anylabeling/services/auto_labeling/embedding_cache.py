@@ -0,0 +1,226 @@
+"""Persistent image embedding cache shared by SAM-family models."""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import threading
+import uuid
+
+import numpy as np
+
+from anylabeling.views.labeling.logger import logger
+from .lru_cache import LRUCache
+
+
+def get_default_cache_dir():
+    """Return the default folder used to persist image embeddings."""
+    home_dir = osp.expanduser("~")
+    return osp.join(home_dir, "xanylabeling_data", "embeddings")
+
+
+class EmbeddingDiskStore:
+    """Size-bounded store of image embeddings on disk.
+
+    Every entry is a folder named after the content hash of the image.
+    Array values are saved as ``.npy`` files and loaded memory-mapped,
+    the remaining values (sizes, scalars) go to ``meta.json``. Entries of
+    different models live in separate folders, so an embedding is only
+    reused by the model that produced it.
+
+    Args:
+        model_id (str): Identifies the encoder and its input size.
+        root (str, optional): Base folder of the store.
+        max_bytes (int): Disk budget; least recently used entries are
+            evicted once it is exceeded.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, model_id, root=None, max_bytes=2 * 1024**3):
+        self.model_id = model_id
+        self.root = osp.join(root or get_default_cache_dir(), model_id)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._hashes = {}
+        os.makedirs(self.root, exist_ok=True)
+        self._sizes = {}
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and not entry.name.startswith("."):
+                self._sizes[entry.name] = self._entry_size(entry.path)
+        self.total_bytes = sum(self._sizes.values())
+
+    @classmethod
+    def from_model_config(cls, config, encoder_path=None):
+        """Create a store for a model, or return None if it is disabled.
+
+        The store is keyed by the encoder file's name, size and mtime, so
+        replacing the weights behind an unchanged name starts afresh.
+        """
+        if not config.get("embedding_cache", True):
+            return None
+        encoder_path = encoder_path or config.get("encoder_model_path", "")
+        fields = [
+            str(config.get("type")),
+            str(config.get("name")),
+            osp.basename(str(encoder_path)),
+            str(config.get("input_size")),
+        ]
+        try:
+            stat = os.stat(encoder_path)
+            fields += [str(stat.st_size), str(stat.st_mtime_ns)]
+        except (OSError, TypeError, ValueError):
+            pass
+        signature = "|".join(fields)
+        digest = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12]
+        model_id = f"{config.get('type')}-{digest}"
+        max_mb = config.get("embedding_cache_size", 2048)
+        try:
+            return cls(
+                model_id,
+                root=config.get("embedding_cache_dir"),
+                max_bytes=int(max_mb) * 1024**2,
+            )
+        except OSError as e:
+            logger.warning(f"Embedding disk cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def _entry_size(path):
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(path)
+            if entry.is_file()
+        )
+
+    def content_hash(self, filename):
+        """Hash the image bytes; memoized by path, size and mtime."""
+        stat = os.stat(filename)
+        signature = (filename, stat.st_size, stat.st_mtime_ns)
+        digest = self._hashes.get(signature)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=20)
+            with open(filename, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._hashes[signature] = digest
+        return digest
+
+    def key(self, filename):
+        """Return the store key of an image file, or None."""
+        if not filename or not osp.isfile(filename):
+            return None
+        try:
+            return self.content_hash(filename)
+        except OSError:
+            return None
+
+    def contains(self, filename):
+        key = self.key(filename)
+        return key is not None and key in self._sizes
+
+    def get(self, filename):
+        """Load an embedding, or return None if it is not stored."""
+        key = self.key(filename)
+        if key is None or key not in self._sizes:
+            return None
+        path = osp.join(self.root, key)
+        try:
+            with open(osp.join(path, self.META_FILE), "r") as f:
+                meta = json.load(f)
+            embedding = {}
+            for name, value in meta["values"].items():
+                embedding[name] = (
+                    tuple(value) if name in meta["tuples"] else value
+                )
+            for name in meta["arrays"]:
+                embedding[name] = np.load(
+                    osp.join(path, f"{name}.npy"), mmap_mode="r"
+                )
+            os.utime(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Dropping unreadable embedding {key}: {e}")
+            self._remove(key)
+            return None
+        return embedding
+
+    def put(self, filename, embedding):
+        """Persist an embedding dict produced by a SAM encoder."""
+        key = self.key(filename)
+        if key is None or key in self._sizes:
+            return
+        tmp_path = osp.join(self.root, f".{key}-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(tmp_path)
+            meta = {"arrays": [], "tuples": [], "values": {}}
+            for name, value in embedding.items():
+                if isinstance(value, np.ndarray):
+                    np.save(osp.join(tmp_path, f"{name}.npy"), value)
+                    meta["arrays"].append(name)
+                else:
+                    if isinstance(value, tuple):
+                        meta["tuples"].append(name)
+                    meta["values"][name] = np.asarray(value).tolist()
+            with open(osp.join(tmp_path, self.META_FILE), "w") as f:
+                json.dump(meta, f)
+            size = self._entry_size(tmp_path)
+            os.rename(tmp_path, osp.join(self.root, key))
+        except (OSError, TypeError, ValueError) as e:
+            # Another worker may have stored the same image meanwhile
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not osp.isdir(osp.join(self.root, key)):
+                logger.warning(f"Could not persist embedding: {e}")
+            return
+        with self.lock:
+            self._sizes[key] = size
+            self.total_bytes += size
+        self.evict()
+
+    def _remove(self, key):
+        with self.lock:
+            size = self._sizes.pop(key, 0)
+            self.total_bytes -= size
+        shutil.rmtree(osp.join(self.root, key), ignore_errors=True)
+
+    def evict(self):
+        """Remove least recently used entries until within budget."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        entries = []
+        for key in list(self._sizes):
+            try:
+                mtime = os.stat(osp.join(self.root, key)).st_mtime
+            except OSError:
+                mtime = 0
+            entries.append((mtime, key))
+        entries.sort()
+        for _, key in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(key)
+
+    def clear(self):
+        for key in list(self._sizes):
+            self._remove(key)
+
+
+class EmbeddingCache(LRUCache):
+    """Byte-budgeted LRU cache of image embeddings backed by a disk store.
+
+    Keyed by image filename like the plain LRUCache. New embeddings are
+    written through to the disk store, so they survive restarts, and
+    misses fall back to it.
+    """
+
+    def __init__(self, model_config, maxsize=10, encoder_path=None):
+        max_mb = model_config.get("embedding_cache_memory", 1024)
+        super().__init__(
+            maxsize=maxsize,
+            max_bytes=int(max_mb) * 1024**2,
+            second_tier=EmbeddingDiskStore.from_model_config(
+                model_config, encoder_path
+            ),
+            write_through=True,
+        )
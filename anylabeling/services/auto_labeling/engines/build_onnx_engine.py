@@ -1,27 +1,20 @@
-import os
-import onnx
-import onnxruntime as ort
+import numpy as np
+
+from .ort_session import create_session
 
 
 class OnnxBaseModel:
     def __init__(
         self, model_path, device_type: str = "cpu", log_severity_level: int = 3
     ):
-        self.sess_opts = ort.SessionOptions()
-        self.sess_opts.log_severity_level = log_severity_level
-        if "OMP_NUM_THREADS" in os.environ:
-            self.sess_opts.inter_op_num_threads = int(
-                os.environ["OMP_NUM_THREADS"]
-            )
-
         self.providers = ["CPUExecutionProvider"]
         if device_type.lower() == "gpu":
             self.providers = ["CUDAExecutionProvider"]
 
-        self.ort_session = ort.InferenceSession(
+        self.ort_session = create_session(
             model_path,
             providers=self.providers,
-            sess_options=self.sess_opts,
+            log_severity_level=log_severity_level,
         )
         self.model_path = model_path
 
@@ -39,6 +32,55 @@ class OnnxBaseModel:
             outs = outs.squeeze(axis=0)
         return outs
 
+    def get_batch_size(self):
+        """Return the fixed batch size of the model, or None if dynamic."""
+        batch_size = self.get_input_shape()[0]
+        if isinstance(batch_size, int) and batch_size > 0:
+            return batch_size
+        return None
+
+    def get_ort_batch_inference(self, blob, max_batch_size=None):
+        """Run inference on inputs stacked along the batch axis.
+
+        Models exported with a dynamic batch axis receive up to
+        `max_batch_size` samples per call. Static exports are fed chunks
+        of exactly their batch size, padding the last chunk with zeros.
+        Every output is expected to be batch-first; the padded rows are
+        dropped before the per-chunk outputs are concatenated.
+
+        Args:
+            blob (np.ndarray): Input tensor of shape [N, ...].
+            max_batch_size (int, optional): Upper bound of the batch size
+                for dynamic models. Defaults to N.
+
+        Returns:
+            (List[np.ndarray]): Model outputs, each with N rows.
+        """
+        num_samples = blob.shape[0]
+        fixed_batch_size = self.get_batch_size()
+        if fixed_batch_size is not None:
+            chunk_size = fixed_batch_size
+        else:
+            chunk_size = max_batch_size or num_samples
+        input_name = self.get_input_name()
+
+        chunk_outs = []
+        for start in range(0, num_samples, chunk_size):
+            chunk = blob[start : start + chunk_size]
+            num_valid = chunk.shape[0]
+            if fixed_batch_size is not None and num_valid < fixed_batch_size:
+                padding = np.zeros(
+                    (fixed_batch_size - num_valid, *chunk.shape[1:]),
+                    dtype=chunk.dtype,
+                )
+                chunk = np.concatenate([chunk, padding], axis=0)
+            outs = self.ort_session.run(None, {input_name: chunk})
+            chunk_outs.append([out[:num_valid] for out in outs])
+
+        if len(chunk_outs) == 1:
+            return chunk_outs[0]
+        return [np.concatenate(outs, axis=0) for outs in zip(*chunk_outs)]
+
     def get_input_name(self):
         return self.ort_session.get_inputs()[0].name
 
@@ -49,9 +91,6 @@ class OnnxBaseModel:
         return [out.name for out in self.ort_session.get_outputs()]
 
     def get_metadata_info(self, field):
-        model = onnx.load(self.model_path)
-        metadata = model.metadata_props
-        for prop in metadata:
-            if prop.key == field:
-                return prop.value
-        return None
+        # Read from the session, without parsing the model file again
+        metadata = self.ort_session.get_modelmeta().custom_metadata_map
+        return metadata.get(field)
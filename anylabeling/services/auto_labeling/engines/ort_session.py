@@ -0,0 +1,414 @@
+"""Central factory of ONNX Runtime inference sessions.
+
+Every engine creates its sessions through `create_session`, which
+applies a session profile: thread topology, execution mode, graph
+optimization level and memory arena options, plus opt-in features,
+
+* ``optimized_model_cache``: the graph optimized by ONNX Runtime is saved
+  (``optimized_model_filepath``) and loaded directly by later sessions;
+* ``quantization``: "dynamic" runs CPU sessions on a copy of the model
+  with int8 weights, made once with `quantize_dynamic`;
+* ``auto_tune``: on the first load of a model a few thread settings are
+  benchmarked on dummy inputs and the fastest one is remembered.
+
+Optimized and quantized variants of downloaded models are saved next to
+them (see model_store.py), those of other models in the cache folder.
+
+The profile is the application default (`set_default_session_profile`)
+updated with the profile active in the calling thread
+(`use_session_profile`), which the model manager sets from the
+``onnxruntime`` mapping of a model config while the model is built.
+"""
+
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import os.path as osp
+import threading
+import time
+
+import numpy as np
+import onnxruntime as ort
+
+from anylabeling.views.labeling.logger import logger
+
+from .. import model_store
+
+# ONNX Runtime's own defaults; 0 threads lets it pick one per core
+DEFAULT_SESSION_PROFILE = {
+    "intra_op_num_threads": 0,
+    "inter_op_num_threads": 0,
+    "execution_mode": "sequential",
+    "graph_optimization_level": "all",
+    "enable_cpu_mem_arena": True,
+    "enable_mem_pattern": True,
+    "optimized_model_cache": False,
+    "auto_tune": False,
+    "quantization": None,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+INPUT_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(double)": np.float64,
+    "tensor(int64)": np.int64,
+    "tensor(int32)": np.int32,
+    "tensor(uint8)": np.uint8,
+    "tensor(int8)": np.int8,
+    "tensor(bool)": np.bool_,
+}
+
+# Size of the symbolic non-batch dimensions of dummy auto-tune inputs
+AUTO_TUNE_DIM = 640
+AUTO_TUNE_RUNS = 3
+
+_default_profile = {}
+_local = threading.local()
+_auto_tune_lock = threading.Lock()
+
+
+def get_ort_cache_dir():
+    """Return the folder of optimized models and auto-tune results."""
+    home_dir = osp.expanduser("~")
+    return osp.join(home_dir, "xanylabeling_data", "ort_cache")
+
+
+def set_default_session_profile(profile):
+    """Set the profile applied to every session, e.g. from the
+    ``onnxruntime`` section of the application config."""
+    global _default_profile
+    _default_profile = dict(profile or {})
+
+
+@contextlib.contextmanager
+def use_session_profile(profile):
+    """Apply `profile` on top of the default profile to the sessions
+    created by the calling thread within the block."""
+    previous = getattr(_local, "profile", None)
+    _local.profile = dict(profile or {})
+    try:
+        yield
+    finally:
+        _local.profile = previous
+
+
+def get_session_profile(profile=None):
+    """Return the complete profile for a new session."""
+    merged = dict(DEFAULT_SESSION_PROFILE)
+    merged.update(_default_profile)
+    merged.update(getattr(_local, "profile", None) or {})
+    merged.update(profile or {})
+    return merged
+
+
+def build_session_options(profile, log_severity_level=None):
+    """Return the SessionOptions of a complete profile."""
+    sess_opts = ort.SessionOptions()
+    if log_severity_level is not None:
+        sess_opts.log_severity_level = log_severity_level
+    sess_opts.intra_op_num_threads = int(profile["intra_op_num_threads"])
+    sess_opts.inter_op_num_threads = int(profile["inter_op_num_threads"])
+    try:
+        sess_opts.execution_mode = EXECUTION_MODES[profile["execution_mode"]]
+        sess_opts.graph_optimization_level = OPTIMIZATION_LEVELS[
+            profile["graph_optimization_level"]
+        ]
+    except KeyError as e:
+        raise ValueError(f"Invalid ONNX Runtime session setting: {e}")
+    sess_opts.enable_cpu_mem_arena = bool(profile["enable_cpu_mem_arena"])
+    sess_opts.enable_mem_pattern = bool(profile["enable_mem_pattern"])
+    return sess_opts
+
+
+def get_model_key(model_path, providers, *extra):
+    """Return a digest identifying a model file and how it is run."""
+    stat = os.stat(model_path)
+    key = "|".join(
+        [
+            osp.abspath(model_path),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            ort.__version__,
+            ",".join(providers),
+            *map(str, extra),
+        ]
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_variant_path(model_path, tag, key, cache_dir=None):
+    """Return where a variant of a model is saved: next to downloaded
+    models, which have a manifest, else in the cache folder."""
+    tag = f"{tag}-{key[:16]}"
+    if cache_dir is None and (
+        model_store.is_variant(model_path)
+        or model_store.read_manifest(model_path) is not None
+    ):
+        return model_store.get_variant_path(model_path, tag)
+    stem = osp.splitext(osp.basename(model_path))[0]
+    return osp.join(cache_dir or get_ort_cache_dir(), f"{stem}.{tag}.onnx")
+
+
+def save_variant(tmp_path, variant_path, model_path):
+    """Move a written variant in place, dropping the variants of the same
+    kind that older files or ONNX Runtime versions left next to the
+    model."""
+    os.replace(tmp_path, variant_path)
+    if osp.dirname(variant_path) != osp.dirname(model_path):
+        return
+    prefix = variant_path.rsplit("-", 1)[0]
+    for filename in glob.glob(f"{glob.escape(prefix)}-*.onnx"):
+        if filename != variant_path:
+            with contextlib.suppress(OSError):
+                os.remove(filename)
+
+
+def get_optimized_model_path(model_path, providers, profile, cache_dir=None):
+    """Return where the optimized graph of a model is cached."""
+    key = get_model_key(
+        model_path, providers, profile["graph_optimization_level"]
+    )
+    return get_variant_path(model_path, "optimized", key, cache_dir)
+
+
+def get_quantized_model(model_path, quantization, cache_dir=None):
+    """Return a quantized variant of a model, creating it on first use.
+
+    Returns `model_path` if the model cannot be quantized.
+    """
+    if quantization != "dynamic":
+        raise ValueError(f"Invalid ONNX Runtime quantization: {quantization}")
+    key = get_model_key(model_path, [], quantization)
+    quantized_path = get_variant_path(
+        model_path, f"{quantization}-quantized", key, cache_dir
+    )
+    if osp.exists(quantized_path):
+        return quantized_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(osp.dirname(quantized_path), exist_ok=True)
+    tmp_path = f"{quantized_path}.{os.getpid()}.tmp"
+    try:
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QUInt8)
+        save_variant(tmp_path, quantized_path, model_path)
+    except Exception as e:  # noqa
+        logger.warning(f"Could not quantize {model_path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return model_path
+    logger.info(f"Saved quantized model {quantized_path}")
+    return quantized_path
+
+
+def _new_session(model_path, providers, profile, log_severity_level):
+    sess_opts = build_session_options(profile, log_severity_level)
+    return ort.InferenceSession(
+        model_path, providers=providers, sess_options=sess_opts
+    )
+
+
+def _create_cached_session(
+    model_path, providers, profile, log_severity_level, cache_dir
+):
+    optimized_path = get_optimized_model_path(
+        model_path, providers, profile, cache_dir
+    )
+    if osp.exists(optimized_path):
+        try:
+            return _new_session(
+                optimized_path,
+                providers,
+                {**profile, "graph_optimization_level": "disable"},
+                log_severity_level,
+            )
+        except Exception as e:  # noqa
+            logger.warning(f"Dropping optimized model {optimized_path}: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(optimized_path)
+
+    os.makedirs(osp.dirname(optimized_path), exist_ok=True)
+    tmp_path = f"{optimized_path}.{os.getpid()}.tmp"
+    sess_opts = build_session_options(profile, log_severity_level)
+    sess_opts.optimized_model_filepath = tmp_path
+    try:
+        session = ort.InferenceSession(
+            model_path, providers=providers, sess_options=sess_opts
+        )
+        save_variant(tmp_path, optimized_path, model_path)
+        return session
+    except Exception as e:  # noqa
+        # e.g. models above 2GB, which cannot be saved in one file
+        logger.warning(f"Could not cache optimized model {model_path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return _new_session(model_path, providers, profile, log_severity_level)
+
+
+def make_dummy_inputs(session, dim=AUTO_TUNE_DIM):
+    """Return random inputs for a session, or None if an input type is
+    not supported. Symbolic batch dimensions are 1, others `dim`."""
+    feeds = {}
+    rng = np.random.default_rng(0)
+    for node in session.get_inputs():
+        dtype = INPUT_DTYPES.get(node.type)
+        if dtype is None:
+            return None
+        shape = [
+            d if isinstance(d, int) and d > 0 else (1 if i == 0 else dim)
+            for i, d in enumerate(node.shape)
+        ]
+        if np.issubdtype(dtype, np.floating):
+            feeds[node.name] = rng.random(shape).astype(dtype)
+        else:
+            feeds[node.name] = np.zeros(shape, dtype=dtype)
+    return feeds
+
+
+def get_tuning_candidates(cpu_count=None):
+    """Return the thread settings compared by auto-tuning."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    candidates = []
+    for intra in [cpu_count, cpu_count // 2, cpu_count // 4]:
+        candidate = {
+            "intra_op_num_threads": intra,
+            "inter_op_num_threads": 0,
+            "execution_mode": "sequential",
+        }
+        if intra >= 1 and candidate not in candidates:
+            candidates.append(candidate)
+    if cpu_count >= 4:
+        candidates.append(
+            {
+                "intra_op_num_threads": cpu_count // 2,
+                "inter_op_num_threads": 2,
+                "execution_mode": "parallel",
+            }
+        )
+    return candidates
+
+
+def benchmark_session(session, feeds, runs=AUTO_TUNE_RUNS):
+    """Return the median latency of `runs` inferences after a warmup."""
+    session.run(None, feeds)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        session.run(None, feeds)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def auto_tune(
+    model_path, providers, profile, log_severity_level=None, cache_dir=None
+):
+    """Return the fastest thread settings of a model, benchmarking the
+    candidates once and remembering the result in the cache folder.
+
+    Returns an empty dict if the model cannot be benchmarked.
+    """
+    cpu_count = os.cpu_count() or 1
+    key = get_model_key(model_path, providers, cpu_count)
+    results_file = osp.join(cache_dir or get_ort_cache_dir(), "auto_tune.json")
+    with _auto_tune_lock:
+        results = {}
+        if osp.exists(results_file):
+            try:
+                with open(results_file, "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            except (OSError, ValueError):
+                results = {}
+        if key in results:
+            return results[key]["settings"]
+
+        best, best_latency, feeds = {}, None, None
+        for candidate in get_tuning_candidates(cpu_count):
+            try:
+                session = _new_session(
+                    model_path,
+                    providers,
+                    {**profile, **candidate},
+                    log_severity_level,
+                )
+                if feeds is None:
+                    feeds = make_dummy_inputs(session)
+                    if feeds is None:
+                        return {}
+                latency = benchmark_session(session, feeds)
+            except Exception as e:  # noqa
+                logger.warning(f"Auto-tuning {model_path} failed: {e}")
+                return {}
+            logger.debug(f"Auto-tune {candidate}: {latency * 1000:.1f} ms")
+            if best_latency is None or latency < best_latency:
+                best, best_latency = candidate, latency
+        logger.info(
+            f"Auto-tuned {osp.basename(model_path)}: {best} "
+            f"({best_latency * 1000:.1f} ms)"
+        )
+        results[key] = {"settings": best, "latency": best_latency}
+        os.makedirs(osp.dirname(results_file), exist_ok=True)
+        tmp_file = f"{results_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp_file, results_file)
+        return best
+
+
+def create_session(
+    model_path,
+    providers=None,
+    device_type=None,
+    profile=None,
+    log_severity_level=None,
+    cache_dir=None,
+):
+    """Create an InferenceSession with the current session profile.
+
+    Args:
+        model_path (str): ONNX model file.
+        providers (list, optional): Execution providers. Defaults to CUDA
+            if `device_type` is "gpu", else CPU.
+        device_type (str, optional): "cpu" or "gpu".
+        profile (dict, optional): Settings overriding the current profile.
+        log_severity_level (int, optional): ONNX Runtime log level.
+        cache_dir (str, optional): Folder of optimized models and
+            auto-tune results.
+
+    Returns:
+        (ort.InferenceSession): The session.
+    """
+    if providers is None:
+        providers = ["CPUExecutionProvider"]
+        if device_type and device_type.lower() == "gpu":
+            providers = ["CUDAExecutionProvider"]
+    profile = get_session_profile(profile)
+    on_cpu = providers[0] == "CPUExecutionProvider"
+    if profile["quantization"] and on_cpu:
+        model_path = get_quantized_model(
+            model_path, profile["quantization"], cache_dir
+        )
+    if profile["auto_tune"] and on_cpu:
+        profile.update(
+            auto_tune(
+                model_path, providers, profile, log_severity_level, cache_dir
+            )
+        )
+    if profile["optimized_model_cache"]:
+        return _create_cached_session(
+            model_path, providers, profile, log_severity_level, cache_dir
+        )
+    return _new_session(model_path, providers, profile, log_severity_level)
@@ -22,6 +22,7 @@ from .types import AutoLabelingResult
 from .lru_cache import LRUCache
 from .utils.general import Args
 from .engines.build_onnx_engine import OnnxBaseModel
+from .engines.ort_session import create_session
 
 
 class SegmentAnythingONNX:
@@ -38,11 +39,11 @@ class SegmentAnythingONNX:
         # TODO: Add back when TensorRT backend is stable
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
-        self.encoder_session = onnxruntime.InferenceSession(
+        self.encoder_session = create_session(
             encoder_model_path, providers=providers
         )
         self.encoder_input_name = self.encoder_session.get_inputs()[0].name
-        self.decoder_session = onnxruntime.InferenceSession(
+        self.decoder_session = create_session(
             decoder_model_path, providers=providers
         )
 
@@ -1,34 +1,179 @@
 """Thread-safe LRU cache implementation."""
 
 from collections import OrderedDict
+import sys
 import threading
 
 
+def get_nbytes(value):
+    """Estimate the memory footprint of a cached value in bytes.
+
+    Arrays report their ``nbytes``; dicts, lists and tuples (e.g. the
+    embedding dicts of SAM models) are summed recursively.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, dict):
+        return sum(get_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(get_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
 class LRUCache:
-    """Thread-safe LRU cache implementation."""
+    """Thread-safe LRU cache implementation.
+
+    Entries are bounded by count (`maxsize`) and optionally by their total
+    size in bytes (`max_bytes`). An optional second tier (any object with
+    ``get(key)``, ``put(key, value)`` and ``contains(key)``, e.g. a disk
+    store) receives evicted entries and is consulted on misses. With
+    `write_through` every put goes to the second tier right away.
 
-    def __init__(self, maxsize=10):
+    Args:
+        maxsize (int, optional): Maximum number of entries.
+        max_bytes (int, optional): Maximum total size of the entries.
+        second_tier (object, optional): Spill store for evicted entries.
+        write_through (bool): Write new entries to the second tier on put.
+        sizeof (callable): Returns the size of a value in bytes.
+    """
+
+    def __init__(
+        self,
+        maxsize=10,
+        max_bytes=None,
+        second_tier=None,
+        write_through=False,
+        sizeof=get_nbytes,
+    ):
         self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.second_tier = second_tier
+        self.write_through = write_through
+        self.sizeof = sizeof
         self.lock = threading.Lock()
         self._cache = OrderedDict()
+        self._nbytes = {}
+        self.total_bytes = 0
+        self._inflight = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "second_tier_hits": 0,
+            "evictions": 0,
+            "spills": 0,
+            "computes": 0,
+            "waits": 0,
+        }
 
     def get(self, key):
         """Get value from cache. Returns None if key is not present."""
         with self.lock:
-            if key not in self._cache:
-                return None
-            self._cache.move_to_end(key)
-            return self._cache[key]
+            if key in self._cache:
+                self._stats["hits"] += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self._stats["misses"] += 1
+        if self.second_tier is None:
+            return None
+        value = self.second_tier.get(key)
+        if value is not None:
+            with self.lock:
+                self._stats["second_tier_hits"] += 1
+            self._insert(key, value)
+        return value
 
     def put(self, key, value):
-        """Put value into cache. If cache is full, oldest item is evicted."""
+        """Put value into cache. If cache is full, oldest items are evicted."""
+        if self.write_through and self.second_tier is not None:
+            self.second_tier.put(key, value)
+        self._insert(key, value)
+
+    def _insert(self, key, value):
+        nbytes = self.sizeof(value)
+        evicted = []
         with self.lock:
+            if key in self._cache:
+                self.total_bytes -= self._nbytes.pop(key)
             self._cache[key] = value
             self._cache.move_to_end(key)
-            if len(self._cache) > self.maxsize:
-                self._cache.popitem(last=False)
+            self._nbytes[key] = nbytes
+            self.total_bytes += nbytes
+            while len(self._cache) > 1 and self._is_over_budget():
+                old_key, old_value = self._cache.popitem(last=False)
+                self.total_bytes -= self._nbytes.pop(old_key)
+                self._stats["evictions"] += 1
+                evicted.append((old_key, old_value))
+        if self.second_tier is not None and not self.write_through:
+            for old_key, old_value in evicted:
+                self.second_tier.put(old_key, old_value)
+                with self.lock:
+                    self._stats["spills"] += 1
+
+    def _is_over_budget(self):
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
 
     def find(self, key):
         """Returns True if key is in cache, False otherwise."""
         with self.lock:
-            return key in self._cache
+            if key in self._cache:
+                return True
+        return self.second_tier is not None and self.second_tier.contains(key)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value of `key`, computing it on a miss.
+
+        Concurrent callers asking for the same key share one computation:
+        the first caller runs `compute()` and the others wait for it.
+        Results that are None are not cached.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+            with self.lock:
+                if key in self._cache:
+                    continue
+                event = self._inflight.get(key)
+                is_owner = event is None
+                if is_owner:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    self._stats["computes"] += 1
+                else:
+                    self._stats["waits"] += 1
+            if not is_owner:
+                # If the owner failed, the next iteration computes again
+                event.wait()
+                continue
+            try:
+                value = compute()
+                if value is not None:
+                    self.put(key, value)
+                return value
+            finally:
+                with self.lock:
+                    del self._inflight[key]
+                event.set()
+
+    def is_computing(self, key):
+        """Returns True if a get_or_compute call is running for key."""
+        with self.lock:
+            return key in self._inflight
+
+    def stats(self):
+        """Return a snapshot of the hit/miss/eviction counters."""
+        with self.lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._cache)
+            stats["bytes"] = self.total_bytes
+        return stats
+
+    def clear(self):
+        """Remove all entries from the first tier."""
+        with self.lock:
+            self._cache.clear()
+            self._nbytes.clear()
+            self.total_bytes = 0
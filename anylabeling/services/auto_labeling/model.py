@@ -2,7 +2,6 @@ import os
 import pathlib
 import yaml
 import onnx
-import urllib.request
 from urllib.parse import urlparse
 
 from PyQt5.QtCore import QCoreApplication
@@ -13,10 +12,6 @@ ssl._create_default_https_context = (
     ssl._create_unverified_context
 )  # Prevent issue when downloading models behind a proxy
 
-import socket
-
-socket.setdefaulttimeout(240)  # Prevent timeout when downloading models
-
 from abc import abstractmethod
 
 
@@ -24,6 +19,13 @@ from PyQt5.QtCore import QFile, QObject
 from PyQt5.QtGui import QImage
 
 from .types import AutoLabelingResult
+from .downloader import get_downloader
+from .model_store import (
+    read_manifest,
+    remove_model_file,
+    verify_model_file,
+    write_manifest,
+)
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.label_file import LabelFile, LabelFileError
 
@@ -67,6 +69,8 @@ class Model(QObject):
             config=self.config,
         )
         self.output_mode = self.Meta.default_output_mode
+        # Weight files resolved by get_model_abs_path
+        self.model_files = []
 
     def get_required_widgets(self):
         """
@@ -101,6 +105,25 @@ class Model(QObject):
         """
         Get model absolute path from config path or download from url
         """
+        model_abs_path = self._get_model_abs_path(
+            model_config, model_path_field_name
+        )
+        if model_abs_path is not None:
+            self.model_files.append(model_abs_path)
+        return model_abs_path
+
+    def get_memory_footprint(self):
+        """
+        Estimate the memory held by the model in bytes from the size of
+        its weight files
+        """
+        nbytes = 0
+        for model_file in getattr(self, "model_files", []):
+            if os.path.isfile(model_file):
+                nbytes += os.path.getsize(model_file)
+        return nbytes
+
+    def _get_model_abs_path(self, model_config, model_path_field_name):
         # Try getting model path from config folder
         model_path = model_config[model_path_field_name]
 
@@ -138,6 +161,8 @@ class Model(QObject):
 
         filename = get_filename_from_url(model_path)
         download_url = model_path
+        # Optional published checksums, keyed by model path field name
+        sha256 = (model_config.get("sha256") or {}).get(model_path_field_name)
 
         # Continue with the rest of your function logic
         migrate_flag = self.allow_migrate_data()
@@ -156,20 +181,12 @@ class Model(QObject):
             )
         )
         if os.path.exists(model_abs_path):
-            if model_abs_path.lower().endswith(".onnx"):
-                try:
-                    onnx.checker.check_model(model_abs_path)
-                except onnx.checker.ValidationError as e:
-                    logger.error(f"{str(e)}")
-                    logger.warning("Action: Delete and redownload...")
-                    try:
-                        os.remove(model_abs_path)
-                    except Exception as e:  # noqa
-                        logger.error(f"Could not delete: {str(e)}")
-                else:
-                    return model_abs_path
-            else:
+            if self.is_cached_model_valid(
+                model_abs_path, download_url, sha256
+            ):
                 return model_abs_path
+            logger.warning("Action: Delete and redownload...")
+            remove_model_file(model_abs_path)
         pathlib.Path(model_abs_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Download url
@@ -179,21 +196,31 @@ class Model(QObject):
                 download_url[:20] + "..." + download_url[-20:]
             )
         logger.info(f"Downloading {ellipsis_download_url} to {model_abs_path}")
-        try:
-            # Download and show progress
-            def _progress(count, block_size, total_size):
-                percent = int(count * block_size * 100 / total_size)
-                self.on_message(
-                    QCoreApplication.translate(
-                        "Model", "Downloading {download_url}: {percent}%"
-                    ).format(
-                        download_url=ellipsis_download_url, percent=percent
-                    )
-                )
+        last_percent = None
+
+        # Show progress, once per percent
+        def _progress(downloaded, total_size):
+            nonlocal last_percent
+            if not total_size:
+                return
+            percent = int(downloaded * 100 / total_size)
+            if percent == last_percent:
+                return
+            last_percent = percent
+            self.on_message(
+                QCoreApplication.translate(
+                    "Model", "Downloading {download_url}: {percent}%"
+                ).format(download_url=ellipsis_download_url, percent=percent)
+            )
 
-            urllib.request.urlretrieve(
-                download_url, model_abs_path, reporthook=_progress
+        try:
+            sha256 = get_downloader().download(
+                download_url,
+                model_abs_path,
+                sha256=sha256,
+                on_progress=_progress,
             )
+            write_manifest(model_abs_path, url=download_url, sha256=sha256)
         except Exception as e:  # noqa
             logger.error(f"Could not download {download_url}: {e}")
             self.on_message(f"Could not download {download_url}")
@@ -201,6 +228,32 @@ class Model(QObject):
 
         return model_abs_path
 
+    @staticmethod
+    def is_cached_model_valid(model_abs_path, download_url, sha256=None):
+        """
+        Check a downloaded model file against the manifest written when it
+        was downloaded, and against the published checksum if known.
+        Files downloaded before manifests existed are checked once with
+        onnx.checker and given a manifest.
+        """
+        manifest = read_manifest(model_abs_path)
+        if manifest is not None:
+            if not verify_model_file(model_abs_path):
+                logger.error(f"{model_abs_path} does not match its manifest")
+                return False
+            if sha256 is not None and manifest["sha256"] != sha256.lower():
+                logger.error(f"{model_abs_path} has an outdated checksum")
+                return False
+            return True
+        if model_abs_path.lower().endswith(".onnx"):
+            try:
+                onnx.checker.check_model(model_abs_path)
+            except onnx.checker.ValidationError as e:
+                logger.error(f"{str(e)}")
+                return False
+        manifest = write_manifest(model_abs_path, url=download_url)
+        return sha256 is None or manifest["sha256"] == sha256.lower()
+
     def check_missing_config(self, config_names, config):
         """
         Check if config has all required config names
@@ -216,6 +269,23 @@ class Model(QObject):
         """
         raise NotImplementedError
 
+    def supports_batch_inference(self):
+        """
+        Whether predict_shapes_batch can process several images at once
+        """
+        return False
+
+    def predict_shapes_batch(self, images, filenames=None):
+        """
+        Predict a list of images and return one result per image
+        """
+        if filenames is None:
+            filenames = [None] * len(images)
+        return [
+            self.predict_shapes(image, filename)
+            for image, filename in zip(images, filenames)
+        ]
+
     @abstractmethod
     def unload(self):
         """
@@ -12,6 +12,19 @@ from anylabeling.utils import GenericWorker
 from anylabeling.views.labeling.logger import logger
 from anylabeling.config import get_config, save_config
 from anylabeling.configs import auto_labeling as auto_labeling_configs
+from anylabeling.services.auto_labeling.downloader import (
+    ModelDownloader,
+    set_downloader,
+)
+from anylabeling.services.auto_labeling.engines.ort_session import (
+    set_default_session_profile,
+    use_session_profile,
+)
+from anylabeling.services.auto_labeling.model_pool import ModelPool
+from anylabeling.services.auto_labeling.model_registry import (
+    get_model_class,
+    get_model_spec,
+)
 from anylabeling.services.auto_labeling.types import AutoLabelingResult
 
 
@@ -111,6 +124,29 @@ class ModelManager(QObject):
         self.model_execution_thread = None
         self.model_execution_thread_lock = Lock()
 
+        # Models kept loaded after switching to another one
+        pool_config = get_config().get("model_pool") or {}
+        max_memory_mb = pool_config.get("max_memory_mb")
+        self.model_pool = ModelPool(
+            max_models=pool_config.get("max_models", 2),
+            max_bytes=(max_memory_mb * 1024 * 1024 if max_memory_mb else None),
+        )
+
+        # Shared downloader of model files
+        download_config = get_config().get("model_download") or {}
+        chunk_size_mb = download_config.get("chunk_size_mb", 8)
+        set_downloader(
+            ModelDownloader(
+                num_workers=download_config.get("num_workers", 4),
+                chunk_size=chunk_size_mb * 1024 * 1024,
+                timeout=download_config.get("timeout", 30),
+                retries=download_config.get("retries", 5),
+            )
+        )
+
+        # ONNX Runtime session settings, see engines/ort_session.py
+        set_default_session_profile(get_config().get("onnxruntime"))
+
         self.load_model_configs()
 
     def load_model_configs(self):
@@ -357,1666 +393,192 @@ class ModelManager(QObject):
         )
         self.model_download_thread.start()
 
-    def _load_model(self, model_id):  # noqa: C901
+    def load_model_from_file(self, config_file):
+        """Load a model from a config file in the calling thread.
+
+        Intended for headless use (e.g. batch labeling from the command
+        line). Returns the model instance, or None if loading failed.
+        """
+        with open(config_file, "r", encoding="utf-8") as f:
+            model_config = yaml.safe_load(f)
+        model_config["config_file"] = os.path.normpath(
+            os.path.abspath(config_file)
+        )
+        self.model_configs.append(model_config)
+        self._load_model(len(self.model_configs) - 1)
+        if self.loaded_model_config is None:
+            return None
+        return self.loaded_model_config["model"]
+
+    def _load_model(self, model_id):
         """Load and return model info"""
         if self.loaded_model_config is not None:
-            self.loaded_model_config["model"].unload()
-            self.loaded_model_config = None
+            self._release_loaded_model()
             self.auto_segmentation_model_unselected.emit()
 
         model_config = copy.deepcopy(self.model_configs[model_id])
-        if model_config["type"] == "yolov5":
-            from .yolov5 import YOLOv5
-
-            try:
-                model_config["model"] = YOLOv5(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov6":
-            from .yolov6 import YOLOv6
-
-            try:
-                model_config["model"] = YOLOv6(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov7":
-            from .yolov7 import YOLOv7
-
-            try:
-                model_config["model"] = YOLOv7(
-                    model_config, on_message=self.new_model_status.emit
+        try:
+            model_spec = get_model_spec(model_config["type"])
+            pooled_config = self.model_pool.acquire(
+                ModelPool.make_key(model_config)
+            )
+            if pooled_config is not None:
+                model_config = pooled_config
+                # Do not carry tracks over from the last time it was used
+                reset_tracker = getattr(
+                    model_config["model"],
+                    "set_auto_labeling_reset_tracker",
+                    None,
                 )
-                self.auto_segmentation_model_unselected.emit()
+                if reset_tracker is not None:
+                    reset_tracker()
                 logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
+                    f"✅ Model reused from the warm pool: {model_config['type']}"
                 )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
+            else:
+                model_class = get_model_class(model_config["type"])
+                with use_session_profile(model_config.get("onnxruntime")):
+                    model_config["model"] = model_class(
+                        model_config, on_message=self.new_model_status.emit
                     )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_sahi":
-            from .yolov5_sahi import YOLOv5_SAHI
-
-            try:
-                model_config["model"] = YOLOv5_SAHI(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
                 logger.info(
                     f"✅ Model loaded successfully: {model_config['type']}"
                 )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
+        except Exception as e:  # noqa
+            logger.error(
+                f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
+            )
+            self.new_model_status.emit(
+                self.tr(
+                    "Error in loading model: {error_message}".format(
+                        error_message=str(e)
                     )
                 )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_sahi":
-            from .yolov8_sahi import YOLOv8_SAHI
+            )
+            return
 
-            try:
-                model_config["model"] = YOLOv8_SAHI(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8":
-            from .yolov8 import YOLOv8
+        if model_spec.interactive:
+            self.auto_segmentation_model_selected.emit()
+        else:
+            self.auto_segmentation_model_unselected.emit()
+        if model_spec.prefetch:
+            # Request next files for prediction
+            self.request_next_files_requested.emit()
 
-            try:
-                model_config["model"] = YOLOv8(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov9":
-            from .yolov9 import YOLOv9
+        self.loaded_model_config = model_config
+        return self.loaded_model_config
 
-            try:
-                model_config["model"] = YOLOv9(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov10":
-            from .yolov10 import YOLOv10
+    def _release_loaded_model(self):
+        """Move the loaded model to the warm pool, which unloads it if it
+        does not fit"""
+        model_config = self.loaded_model_config
+        self.loaded_model_config = None
+        self.model_pool.release(ModelPool.make_key(model_config), model_config)
 
-            try:
-                model_config["model"] = YOLOv10(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11":
-            from .yolo11 import YOLO11
+    def set_cache_auto_label(self, text, gid):
+        """Set cache auto label"""
+        valid_models = [
+            "segment_anything_2_video",
+        ]
+        if (
+            self.loaded_model_config is not None
+            and self.loaded_model_config["type"] in valid_models
+        ):
+            self.loaded_model_config["model"].set_cache_auto_label(text, gid)
 
-            try:
-                model_config["model"] = YOLO11(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolow":
-            from .yolow import YOLOW
+    def set_auto_labeling_marks(self, marks):
+        """Set auto labeling marks
+        (For example, for segment_anything model, it is the marks for)
+        """
+        marks_model_list = [
+            "segment_anything",
+            "segment_anything_2",
+            "segment_anything_2_video",
+            "sam_med2d",
+            "sam_hq",
+            "yolov5_sam",
+            "efficientvit_sam",
+            "yolov8_efficientvit_sam",
+            "grounding_sam",
+            "grounding_sam2",
+            "open_vision",
+            "edge_sam",
+        ]
+        if (
+            self.loaded_model_config is None
+            or self.loaded_model_config["type"] not in marks_model_list
+        ):
+            return
+        self.loaded_model_config["model"].set_auto_labeling_marks(marks)
 
-            try:
-                model_config["model"] = YOLOW(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_seg":
-            from .yolov5_seg import YOLOv5_Seg
+    def set_auto_labeling_reset_tracker(self):
+        """Resets the tracker to its initial state,
+        clearing all tracked objects and internal states.
+        """
+        model_list = [
+            "yolov5_det_track",
+            "yolov8_det_track",
+            "yolov8_obb_track",
+            "yolov8_seg_track",
+            "yolov8_pose_track",
+            "segment_anything_2_video",
+            "yolo11_det_track",
+            "yolo11_seg_track",
+            "yolo11_obb_track",
+            "yolo11_pose_track",
+        ]
+        if (
+            self.loaded_model_config is None
+            or self.loaded_model_config["type"] not in model_list
+        ):
+            return
+        self.loaded_model_config["model"].set_auto_labeling_reset_tracker()
 
-            try:
-                model_config["model"] = YOLOv5_Seg(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_ram":
-            from .yolov5_ram import YOLOv5_RAM
-
-            try:
-                model_config["model"] = YOLOv5_RAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolow_ram":
-            from .yolow_ram import YOLOW_RAM
-
-            try:
-                model_config["model"] = YOLOW_RAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_seg":
-            from .yolov8_seg import YOLOv8_Seg
-
-            try:
-                model_config["model"] = YOLOv8_Seg(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_seg":
-            from .yolo11_seg import YOLO11_Seg
-
-            try:
-                model_config["model"] = YOLO11_Seg(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_obb":
-            from .yolov8_obb import YOLOv8_OBB
-
-            try:
-                model_config["model"] = YOLOv8_OBB(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_obb":
-            from .yolo11_obb import YOLO11_OBB
-
-            try:
-                model_config["model"] = YOLO11_OBB(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_pose":
-            from .yolov8_pose import YOLOv8_Pose
-
-            try:
-                model_config["model"] = YOLOv8_Pose(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_pose":
-            from .yolo11_pose import YOLO11_Pose
-
-            try:
-                model_config["model"] = YOLO11_Pose(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolox":
-            from .yolox import YOLOX
-
-            try:
-                model_config["model"] = YOLOX(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo_nas":
-            from .yolo_nas import YOLO_NAS
-
-            try:
-                model_config["model"] = YOLO_NAS(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "damo_yolo":
-            from .damo_yolo import DAMO_YOLO
-
-            try:
-                model_config["model"] = DAMO_YOLO(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "gold_yolo":
-            from .gold_yolo import Gold_YOLO
-
-            try:
-                model_config["model"] = Gold_YOLO(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "grounding_dino":
-            from .grounding_dino import Grounding_DINO
-
-            try:
-                model_config["model"] = Grounding_DINO(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "ram":
-            from .ram import RAM
-
-            try:
-                model_config["model"] = RAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "internimage_cls":
-            from .internimage_cls import InternImage_CLS
-
-            try:
-                model_config["model"] = InternImage_CLS(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "pulc_attribute":
-            from .pulc_attribute import PULC_Attribute
-
-            try:
-                model_config["model"] = PULC_Attribute(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_sam":
-            from .yolov5_sam import YOLOv5SegmentAnything
-
-            try:
-                model_config["model"] = YOLOv5SegmentAnything(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "yolov8_efficientvit_sam":
-            from .yolov8_efficientvit_sam import YOLOv8_EfficientViT_SAM
-
-            try:
-                model_config["model"] = YOLOv8_EfficientViT_SAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "grounding_sam":
-            from .grounding_sam import GroundingSAM
-
-            try:
-                model_config["model"] = GroundingSAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "grounding_sam2":
-            from .grounding_sam2 import GroundingSAM2
-
-            try:
-                model_config["model"] = GroundingSAM2(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "open_vision":
-            from .open_vision import OpenVision
-
-            try:
-                model_config["model"] = OpenVision(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "doclayout_yolo":
-            from .doclayout_yolo import DocLayoutYOLO
-
-            try:
-                model_config["model"] = DocLayoutYOLO(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-        elif model_config["type"] == "yolov5_obb":
-            from .yolov5_obb import YOLOv5OBB
-
-            try:
-                model_config["model"] = YOLOv5OBB(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "segment_anything":
-            from .segment_anything import SegmentAnything
-
-            try:
-                model_config["model"] = SegmentAnything(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "segment_anything_2":
-            from .segment_anything_2 import SegmentAnything2
-
-            try:
-                model_config["model"] = SegmentAnything2(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "segment_anything_2_video":
-            try:
-                from .segment_anything_2_video import SegmentAnything2Video
-
-                model_config["model"] = SegmentAnything2Video(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "efficientvit_sam":
-            from .efficientvit_sam import EfficientViT_SAM
-
-            try:
-                model_config["model"] = EfficientViT_SAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "sam_med2d":
-            from .sam_med2d import SAM_Med2D
-
-            try:
-                model_config["model"] = SAM_Med2D(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "edge_sam":
-            from .edge_sam import EdgeSAM
-
-            try:
-                model_config["model"] = EdgeSAM(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "sam_hq":
-            from .sam_hq import SAM_HQ
-
-            try:
-                model_config["model"] = SAM_HQ(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_selected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                return
-            # Request next files for prediction
-            self.request_next_files_requested.emit()
-        elif model_config["type"] == "yolov5_resnet":
-            from .yolov5_resnet import YOLOv5_ResNet
-
-            try:
-                model_config["model"] = YOLOv5_ResNet(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "rtdetr":
-            from .rtdetr import RTDETR
-
-            try:
-                model_config["model"] = RTDETR(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "rtdetrv2":
-            from .rtdetrv2 import RTDETRv2
-
-            try:
-                model_config["model"] = RTDETRv2(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov6_face":
-            from .yolov6_face import YOLOv6Face
-
-            try:
-                model_config["model"] = YOLOv6Face(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolox_dwpose":
-            from .yolox_dwpose import YOLOX_DWPose
-
-            try:
-                model_config["model"] = YOLOX_DWPose(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "rtmdet_pose":
-            from .rtmdet_pose import RTMDet_Pose
-
-            try:
-                model_config["model"] = RTMDet_Pose(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "clrnet":
-            from .clrnet import CLRNet
-
-            try:
-                model_config["model"] = CLRNet(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "ppocr_v4":
-            from .ppocr_v4 import PPOCRv4
-
-            try:
-                model_config["model"] = PPOCRv4(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_cls":
-            from .yolov5_cls import YOLOv5_CLS
-
-            try:
-                model_config["model"] = YOLOv5_CLS(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_car_plate":
-            from .yolov5_car_plate import YOLOv5CarPlateDetRec
-
-            try:
-                model_config["model"] = YOLOv5CarPlateDetRec(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_cls":
-            from .yolov8_cls import YOLOv8_CLS
-
-            try:
-                model_config["model"] = YOLOv8_CLS(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_cls":
-            from .yolo11_cls import YOLO11_CLS
-
-            try:
-                model_config["model"] = YOLO11_CLS(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov5_det_track":
-            from .yolov5_det_track import YOLOv5_Det_Tracker
-
-            try:
-                model_config["model"] = YOLOv5_Det_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_det_track":
-            from .yolov8_det_track import YOLOv8_Det_Tracker
-
-            try:
-                model_config["model"] = YOLOv8_Det_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_det_track":
-            from .yolo11_det_track import YOLO11_Det_Tracker
-
-            try:
-                model_config["model"] = YOLO11_Det_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_seg_track":
-            from .yolov8_seg_track import YOLOv8_Seg_Tracker
-
-            try:
-                model_config["model"] = YOLOv8_Seg_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_seg_track":
-            from .yolo11_seg_track import YOLO11_Seg_Tracker
-
-            try:
-                model_config["model"] = YOLO11_Seg_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_obb_track":
-            from .yolov8_obb_track import YOLOv8_Obb_Tracker
-
-            try:
-                model_config["model"] = YOLOv8_Obb_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_obb_track":
-            from .yolo11_obb_track import YOLO11_Obb_Tracker
-
-            try:
-                model_config["model"] = YOLO11_Obb_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolov8_pose_track":
-            from .yolov8_pose_track import YOLOv8_Pose_Tracker
-
-            try:
-                model_config["model"] = YOLOv8_Pose_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "yolo11_pose_track":
-            from .yolo11_pose_track import YOLO11_Pose_Tracker
-
-            try:
-                model_config["model"] = YOLO11_Pose_Tracker(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "rmbg":
-            from .rmbg import RMBG
-
-            try:
-                model_config["model"] = RMBG(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "depth_anything":
-            from .depth_anything import DepthAnything
-
-            try:
-                model_config["model"] = DepthAnything(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "depth_anything_v2":
-            from .depth_anything_v2 import DepthAnythingV2
-
-            try:
-                model_config["model"] = DepthAnythingV2(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        elif model_config["type"] == "upn":
-            from .upn import UPN
-
-            try:
-                model_config["model"] = UPN(
-                    model_config, on_message=self.new_model_status.emit
-                )
-                self.auto_segmentation_model_unselected.emit()
-                logger.info(
-                    f"✅ Model loaded successfully: {model_config['type']}"
-                )
-            except Exception as e:  # noqa
-                self.new_model_status.emit(
-                    self.tr(
-                        "Error in loading model: {error_message}".format(
-                            error_message=str(e)
-                        )
-                    )
-                )
-                logger.error(
-                    f"❌ Error in loading model: {model_config['type']} with error: {str(e)}"
-                )
-                return
-        else:
-            raise Exception(f"Unknown model type: {model_config['type']}")
-
-        self.loaded_model_config = model_config
-        return self.loaded_model_config
-
-    def set_cache_auto_label(self, text, gid):
-        """Set cache auto label"""
-        valid_models = [
-            "segment_anything_2_video",
-        ]
-        if (
-            self.loaded_model_config is not None
-            and self.loaded_model_config["type"] in valid_models
-        ):
-            self.loaded_model_config["model"].set_cache_auto_label(text, gid)
-
-    def set_auto_labeling_marks(self, marks):
-        """Set auto labeling marks
-        (For example, for segment_anything model, it is the marks for)
-        """
-        marks_model_list = [
-            "segment_anything",
-            "segment_anything_2",
-            "segment_anything_2_video",
-            "sam_med2d",
-            "sam_hq",
-            "yolov5_sam",
-            "efficientvit_sam",
-            "yolov8_efficientvit_sam",
-            "grounding_sam",
-            "grounding_sam2",
-            "open_vision",
-            "edge_sam",
-        ]
-        if (
-            self.loaded_model_config is None
-            or self.loaded_model_config["type"] not in marks_model_list
-        ):
-            return
-        self.loaded_model_config["model"].set_auto_labeling_marks(marks)
-
-    def set_auto_labeling_reset_tracker(self):
-        """Resets the tracker to its initial state,
-        clearing all tracked objects and internal states.
-        """
-        model_list = [
-            "yolov5_det_track",
-            "yolov8_det_track",
-            "yolov8_obb_track",
-            "yolov8_seg_track",
-            "yolov8_pose_track",
-            "segment_anything_2_video",
-            "yolo11_det_track",
-            "yolo11_seg_track",
-            "yolo11_obb_track",
-            "yolo11_pose_track",
-        ]
-        if (
-            self.loaded_model_config is None
-            or self.loaded_model_config["type"] not in model_list
-        ):
-            return
-        self.loaded_model_config["model"].set_auto_labeling_reset_tracker()
-
-    def set_auto_labeling_conf(self, value):
-        """Set auto labeling confidences"""
-        model_list = [
-            "upn",
-            "damo_yolo",
-            "gold_yolo",
-            "grounding_dino",
-            "rtdetr",
-            "rtdetrv2",
-            "yolo_nas",
-            "yolov5_obb",
-            "yolov5_seg",
-            "yolov5_det_track",
-            "yolov5",
-            "yolov6",
-            "yolov6_face",
-            "yolov7",
-            "yolov8_obb",
-            "yolov8_pose",
-            "yolov8_seg",
-            "yolov8_det_track",
-            "yolov8_seg_track",
-            "yolov8_obb_track",
-            "yolov8_pose_track",
-            "yolov8",
-            "yolov9",
-            "yolov10",
-            "yolo11",
-            "yolo11_obb",
-            "yolo11_seg",
-            "yolo11_pose",
-            "yolo11_det_track",
-            "yolo11_seg_track",
-            "yolo11_obb_track",
-            "yolo11_pose_track",
-            "yolow",
-            "yolox",
-            "doclayout_yolo",
-        ]
-        if (
-            self.loaded_model_config is None
-            or self.loaded_model_config["type"] not in model_list
-        ):
-            return
-        self.loaded_model_config["model"].set_auto_labeling_conf(value)
+    def set_auto_labeling_conf(self, value):
+        """Set auto labeling confidences"""
+        model_list = [
+            "upn",
+            "damo_yolo",
+            "gold_yolo",
+            "grounding_dino",
+            "rtdetr",
+            "rtdetrv2",
+            "yolo_nas",
+            "yolov5_obb",
+            "yolov5_seg",
+            "yolov5_det_track",
+            "yolov5",
+            "yolov6",
+            "yolov6_face",
+            "yolov7",
+            "yolov8_obb",
+            "yolov8_pose",
+            "yolov8_seg",
+            "yolov8_det_track",
+            "yolov8_seg_track",
+            "yolov8_obb_track",
+            "yolov8_pose_track",
+            "yolov8",
+            "yolov9",
+            "yolov10",
+            "yolo11",
+            "yolo11_obb",
+            "yolo11_seg",
+            "yolo11_pose",
+            "yolo11_det_track",
+            "yolo11_seg_track",
+            "yolo11_obb_track",
+            "yolo11_pose_track",
+            "yolow",
+            "yolox",
+            "doclayout_yolo",
+        ]
+        if (
+            self.loaded_model_config is None
+            or self.loaded_model_config["type"] not in model_list
+        ):
+            return
+        self.loaded_model_config["model"].set_auto_labeling_conf(value)
 
     def set_auto_labeling_iou(self, value):
         """Set auto labeling iou"""
@@ -2110,10 +672,15 @@ class ModelManager(QObject):
             self.loaded_model_config["model"].set_auto_labeling_prompt()
 
     def unload_model(self):
-        """Unload model"""
-        if self.loaded_model_config is not None:
-            self.loaded_model_config["model"].unload()
-            self.loaded_model_config = None
+        """Unload model and free its memory; only switching to another
+        model keeps the outgoing one in the warm pool"""
+        if self.loaded_model_config is None:
+            return
+        model_config = self.loaded_model_config
+        self.loaded_model_config = None
+        key = ModelPool.make_key(model_config)
+        self.model_pool.discard(key)
+        model_config["model"].unload()
 
     def predict_shapes(
         self, image, filename=None, text_prompt=None, run_tracker=False
@@ -0,0 +1,118 @@
+"""Warm pool of loaded auto-labeling models."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from anylabeling.views.labeling.logger import logger
+
+
+class ModelPool:
+    """Keeps recently used models loaded after switching away from them.
+
+    Models that are released to the pool stay resident, so switching back
+    to one of them skips creating its inference sessions again. The pool
+    holds at most `max_models` models whose estimated size (see
+    `Model.get_memory_footprint`) stays within `max_bytes`; the least
+    recently used models are unloaded first.
+
+    Args:
+        max_models (int): Number of models to keep, 0 disables the pool.
+        max_bytes (int, optional): Memory budget of the kept models.
+    """
+
+    def __init__(self, max_models=2, max_bytes=None):
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._models = OrderedDict()
+        self.total_bytes = 0
+
+    @staticmethod
+    def make_key(model_config):
+        """Return the pool key of a model config.
+
+        Configs that only differ in the loaded model instance share a key;
+        editing a custom model config gives it a new one.
+        """
+        config = {
+            k: v
+            for k, v in model_config.items()
+            if k not in ("model", "last_used")
+        }
+        digest = hashlib.sha1(
+            json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{model_config.get('config_file')}|{digest}"
+
+    def __len__(self):
+        with self.lock:
+            return len(self._models)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self._models
+
+    def acquire(self, key):
+        """Take a model config (with its "model") out of the pool.
+
+        Returns None if the model is not in the pool.
+        """
+        with self.lock:
+            entry = self._models.pop(key, None)
+            if entry is None:
+                return None
+            model_config, nbytes = entry
+            self.total_bytes -= nbytes
+            return model_config
+
+    def discard(self, key):
+        """Unload the model of `key` if it is in the pool."""
+        model_config = self.acquire(key)
+        if model_config is not None:
+            self._unload(model_config)
+
+    def release(self, key, model_config):
+        """Put a loaded model config in the pool, unloading the least
+        recently used models that no longer fit."""
+        nbytes = model_config["model"].get_memory_footprint()
+        evicted = []
+        with self.lock:
+            old = self._models.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+                evicted.append(old[0])
+            self._models[key] = (model_config, nbytes)
+            self.total_bytes += nbytes
+            while self._models and self._is_over_budget():
+                _, (old_config, old_nbytes) = self._models.popitem(last=False)
+                self.total_bytes -= old_nbytes
+                evicted.append(old_config)
+        for old_config in evicted:
+            self._unload(old_config)
+
+    def _is_over_budget(self):
+        if len(self._models) > self.max_models:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def clear(self):
+        """Unload all models of the pool."""
+        with self.lock:
+            evicted = [
+                model_config for model_config, _ in self._models.values()
+            ]
+            self._models.clear()
+            self.total_bytes = 0
+        for model_config in evicted:
+            self._unload(model_config)
+
+    @staticmethod
+    def _unload(model_config):
+        try:
+            model_config["model"].unload()
+        except Exception as e:  # noqa
+            logger.warning(
+                f"Error in unloading model {model_config.get('type')}: {e}"
+            )
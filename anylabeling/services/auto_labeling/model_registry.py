@@ -0,0 +1,133 @@
+"""Declarative registry of the auto-labeling models.
+
+Maps the `type` of a model config to the class implementing it. The
+module of a model is only imported when a model of that type is
+loaded, so starting the application does not import every backend.
+"""
+
+import importlib
+from collections import namedtuple
+
+ModelSpec = namedtuple(
+    "ModelSpec",
+    ["class_name", "module", "interactive", "prefetch"],
+    defaults=(None, False, False),
+)
+ModelSpec.__doc__ = """How to construct the model of a config type.
+
+Args:
+    class_name (str): Model class, a subclass of `Model`.
+    module (str, optional): Module of the class, absolute or relative
+        to this package (".yolov8"). Defaults to ".<config type>".
+    interactive (bool): The model takes point/box prompts, so the
+        auto-segmentation tools are shown while it is loaded.
+    prefetch (bool): The model precomputes the next files (image
+        embeddings), so they are requested right after loading.
+"""
+
+MODEL_REGISTRY = {
+    "yolov5": ModelSpec("YOLOv5"),
+    "yolov6": ModelSpec("YOLOv6"),
+    "yolov7": ModelSpec("YOLOv7"),
+    "yolov5_sahi": ModelSpec("YOLOv5_SAHI"),
+    "yolov8_sahi": ModelSpec("YOLOv8_SAHI"),
+    "yolov8": ModelSpec("YOLOv8"),
+    "yolov9": ModelSpec("YOLOv9"),
+    "yolov10": ModelSpec("YOLOv10"),
+    "yolo11": ModelSpec("YOLO11"),
+    "yolow": ModelSpec("YOLOW"),
+    "yolov5_seg": ModelSpec("YOLOv5_Seg"),
+    "yolov5_ram": ModelSpec("YOLOv5_RAM"),
+    "yolow_ram": ModelSpec("YOLOW_RAM"),
+    "yolov8_seg": ModelSpec("YOLOv8_Seg"),
+    "yolo11_seg": ModelSpec("YOLO11_Seg"),
+    "yolov8_obb": ModelSpec("YOLOv8_OBB"),
+    "yolo11_obb": ModelSpec("YOLO11_OBB"),
+    "yolov8_pose": ModelSpec("YOLOv8_Pose"),
+    "yolo11_pose": ModelSpec("YOLO11_Pose"),
+    "yolox": ModelSpec("YOLOX"),
+    "yolo_nas": ModelSpec("YOLO_NAS"),
+    "damo_yolo": ModelSpec("DAMO_YOLO"),
+    "gold_yolo": ModelSpec("Gold_YOLO"),
+    "grounding_dino": ModelSpec("Grounding_DINO"),
+    "ram": ModelSpec("RAM"),
+    "internimage_cls": ModelSpec("InternImage_CLS"),
+    "pulc_attribute": ModelSpec("PULC_Attribute"),
+    "yolov5_sam": ModelSpec(
+        "YOLOv5SegmentAnything", interactive=True, prefetch=True
+    ),
+    "yolov8_efficientvit_sam": ModelSpec(
+        "YOLOv8_EfficientViT_SAM", interactive=True, prefetch=True
+    ),
+    "grounding_sam": ModelSpec(
+        "GroundingSAM", interactive=True, prefetch=True
+    ),
+    "grounding_sam2": ModelSpec(
+        "GroundingSAM2", interactive=True, prefetch=True
+    ),
+    "open_vision": ModelSpec("OpenVision", interactive=True, prefetch=True),
+    "doclayout_yolo": ModelSpec("DocLayoutYOLO", interactive=True),
+    "yolov5_obb": ModelSpec("YOLOv5OBB"),
+    "segment_anything": ModelSpec(
+        "SegmentAnything", interactive=True, prefetch=True
+    ),
+    "segment_anything_2": ModelSpec(
+        "SegmentAnything2", interactive=True, prefetch=True
+    ),
+    "segment_anything_2_video": ModelSpec(
+        "SegmentAnything2Video", interactive=True, prefetch=True
+    ),
+    "efficientvit_sam": ModelSpec(
+        "EfficientViT_SAM", interactive=True, prefetch=True
+    ),
+    "sam_med2d": ModelSpec("SAM_Med2D", interactive=True, prefetch=True),
+    "edge_sam": ModelSpec("EdgeSAM", interactive=True, prefetch=True),
+    "sam_hq": ModelSpec("SAM_HQ", interactive=True, prefetch=True),
+    "yolov5_resnet": ModelSpec("YOLOv5_ResNet"),
+    "rtdetr": ModelSpec("RTDETR"),
+    "rtdetrv2": ModelSpec("RTDETRv2"),
+    "yolov6_face": ModelSpec("YOLOv6Face"),
+    "yolox_dwpose": ModelSpec("YOLOX_DWPose"),
+    "rtmdet_pose": ModelSpec("RTMDet_Pose"),
+    "clrnet": ModelSpec("CLRNet"),
+    "ppocr_v4": ModelSpec("PPOCRv4"),
+    "yolov5_cls": ModelSpec("YOLOv5_CLS"),
+    "yolov5_car_plate": ModelSpec("YOLOv5CarPlateDetRec"),
+    "yolov8_cls": ModelSpec("YOLOv8_CLS"),
+    "yolo11_cls": ModelSpec("YOLO11_CLS"),
+    "yolov5_det_track": ModelSpec("YOLOv5_Det_Tracker"),
+    "yolov8_det_track": ModelSpec("YOLOv8_Det_Tracker"),
+    "yolo11_det_track": ModelSpec("YOLO11_Det_Tracker"),
+    "yolov8_seg_track": ModelSpec("YOLOv8_Seg_Tracker"),
+    "yolo11_seg_track": ModelSpec("YOLO11_Seg_Tracker"),
+    "yolov8_obb_track": ModelSpec("YOLOv8_Obb_Tracker"),
+    "yolo11_obb_track": ModelSpec("YOLO11_Obb_Tracker"),
+    "yolov8_pose_track": ModelSpec("YOLOv8_Pose_Tracker"),
+    "yolo11_pose_track": ModelSpec("YOLO11_Pose_Tracker"),
+    "rmbg": ModelSpec("RMBG"),
+    "depth_anything": ModelSpec("DepthAnything"),
+    "depth_anything_v2": ModelSpec("DepthAnythingV2"),
+    "upn": ModelSpec("UPN"),
+}
+
+
+def register_model(model_type, class_name, module=None, **kwargs):
+    """Add or replace the model class of a config type."""
+    MODEL_REGISTRY[model_type] = ModelSpec(class_name, module, **kwargs)
+
+
+def get_model_spec(model_type):
+    """Return the ModelSpec of a config type, or raise ValueError."""
+    spec = MODEL_REGISTRY.get(model_type)
+    if spec is None:
+        raise ValueError(f"Unknown model type: {model_type}")
+    return spec
+
+
+def get_model_class(model_type):
+    """Import the module of a config type and return its model class."""
+    spec = get_model_spec(model_type)
+    module = spec.module or f".{model_type}"
+    return getattr(
+        importlib.import_module(module, __package__), spec.class_name
+    )
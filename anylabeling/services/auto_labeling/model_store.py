@@ -0,0 +1,114 @@
+"""Manifests and derived variants of downloaded model files.
+
+Each downloaded file gets a ``<file>.manifest.json`` written next to it,
+holding its size, mtime and SHA-256. A cached download is then validated
+by comparing its size and mtime with the manifest, and only hashed again
+when the mtime changed (e.g. after copying the data folder), instead of
+running `onnx.checker` over the whole model on every load.
+
+Variants derived from a model, such as graphs optimized by ONNX Runtime
+or quantized weights, are kept next to the original as
+``<stem>.ort-<tag><ext>`` and removed with it.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import os.path as osp
+
+from anylabeling.views.labeling.logger import logger
+
+MANIFEST_SUFFIX = ".manifest.json"
+VARIANT_PREFIX = "ort-"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_manifest_path(model_file):
+    return f"{model_file}{MANIFEST_SUFFIX}"
+
+
+def sha256sum(filename):
+    """Return the SHA-256 hex digest of a file."""
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def read_manifest(model_file):
+    """Return the manifest of a model file, or None if it has none."""
+    try:
+        with open(get_manifest_path(model_file), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(model_file, url=None, sha256=None):
+    """Record the size, mtime and checksum of a model file.
+
+    Args:
+        model_file (str): Model file.
+        url (str, optional): Where the file was downloaded from.
+        sha256 (str, optional): Known checksum, computed if omitted.
+
+    Returns:
+        (dict): The manifest.
+    """
+    stat = os.stat(model_file)
+    manifest = {
+        "url": url,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or sha256sum(model_file),
+    }
+    manifest_path = get_manifest_path(model_file)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def verify_model_file(model_file):
+    """Check a model file against its manifest.
+
+    Returns True if the file matches, False if it is missing, has no
+    manifest or differs from it.
+    """
+    manifest = read_manifest(model_file)
+    if manifest is None or not osp.isfile(model_file):
+        return False
+    stat = os.stat(model_file)
+    if stat.st_size != manifest.get("size"):
+        return False
+    if stat.st_mtime_ns == manifest.get("mtime_ns"):
+        return True
+    if sha256sum(model_file) != manifest.get("sha256"):
+        return False
+    write_manifest(model_file, manifest.get("url"), manifest["sha256"])
+    return True
+
+
+def get_variant_path(model_file, tag):
+    """Return the path of a variant of a model file, next to it."""
+    stem, ext = osp.splitext(model_file)
+    return f"{stem}.{VARIANT_PREFIX}{tag}{ext}"
+
+
+def is_variant(model_file):
+    return f".{VARIANT_PREFIX}" in osp.basename(model_file)
+
+
+def remove_model_file(model_file):
+    """Delete a model file with its manifest and variants."""
+    stem, ext = osp.splitext(model_file)
+    variants = glob.glob(f"{glob.escape(stem)}.{VARIANT_PREFIX}*{ext}")
+    for filename in [model_file, get_manifest_path(model_file), *variants]:
+        try:
+            if osp.exists(filename):
+                os.remove(filename)
+        except OSError as e:
+            logger.error(f"Could not delete {filename}: {e}")
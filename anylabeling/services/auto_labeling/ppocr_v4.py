@@ -1,7 +1,6 @@
 import os
 import cv2
 import numpy as np
-import onnxruntime as ort
 
 from PyQt5 import QtCore
 from PyQt5.QtCore import QCoreApplication
@@ -11,6 +10,7 @@ from anylabeling.views.labeling.shape import Shape
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
 from .model import Model
+from .engines.ort_session import create_session
 from .types import AutoLabelingResult
 from .utils.ppocr_utils.text_system import TextSystem
 from ...views.labeling.utils.general import is_possible_rectangle
@@ -53,20 +53,11 @@ class PPOCRv4(Model):
                 )
             )
 
-        self.sess_opts = ort.SessionOptions()
-        if "OMP_NUM_THREADS" in os.environ:
-            self.sess_opts.inter_op_num_threads = int(
-                os.environ["OMP_NUM_THREADS"]
-            )
         self.providers = ["CPUExecutionProvider"]
 
         if __preferred_device__ == "GPU":
             self.providers = ["CUDAExecutionProvider"]
-        net = ort.InferenceSession(
-            model_abs_path,
-            providers=self.providers,
-            sess_options=self.sess_opts,
-        )
+        net = create_session(model_abs_path, providers=self.providers)
         return net
 
     def __init__(self, model_config, on_message) -> None:
@@ -84,6 +75,7 @@ class PPOCRv4(Model):
             self.rec_char_dict = "ppocr_keys_v1.txt"
         elif self.lang == "japan":
             self.rec_char_dict = "japan_dict.txt"
+        self.text_sys = None
 
     def parse_args(self):
         args = Args(
@@ -171,6 +163,21 @@ class PPOCRv4(Model):
         )
         return args
 
+    def get_text_system(self):
+        if self.text_sys is None:
+            self.text_sys = TextSystem(self.parse_args())
+        return self.text_sys
+
+    @staticmethod
+    def load_bgr_image(image, image_path=None):
+        try:
+            image = qt_img_to_rgb_cv_img(image, image_path)
+            return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        except Exception as e:  # noqa
+            logger.warning("Could not inference model")
+            logger.warning(e)
+            return None
+
     def predict_shapes(self, image, image_path=None):
         """
         Predict shapes from image
@@ -179,18 +186,45 @@ class PPOCRv4(Model):
         if image is None:
             return []
 
-        try:
-            image = qt_img_to_rgb_cv_img(image, image_path)
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        except Exception as e:  # noqa
-            logger.warning("Could not inference model")
-            logger.warning(e)
+        image = self.load_bgr_image(image, image_path)
+        if image is None:
             return []
 
-        args = self.parse_args()
-        text_sys = TextSystem(args)
-        dt_boxes, rec_res, scores = text_sys(image)
+        dt_boxes, rec_res, scores = self.get_text_system()(image)
+        return self.ocr_to_result(dt_boxes, rec_res, scores)
+
+    def supports_batch_inference(self):
+        return True
+
+    def predict_shapes_batch(self, images, image_paths=None):
+        """
+        Predict shapes for several images, detecting text on the next
+        images while the crops of the previous ones are recognized
+        """
+        if image_paths is None:
+            image_paths = [None] * len(images)
+        cv_images = [
+            (
+                self.load_bgr_image(image, image_path)
+                if image is not None
+                else None
+            )
+            for image, image_path in zip(images, image_paths)
+        ]
+        ocr_results = self.get_text_system().batch(
+            cv_images,
+            det_batch_num=self.config.get("det_batch_num", 4),
+            rec_pool_size=self.config.get("rec_pool_size", 64),
+        )
+        return [
+            self.ocr_to_result(*ocr_result) if image is not None else []
+            for image, ocr_result in zip(cv_images, ocr_results)
+        ]
 
+    def ocr_to_result(self, dt_boxes, rec_res, scores):
+        """
+        Convert the OCR output of one image into an AutoLabelingResult
+        """
         results = [
             {
                 "description": rec_res[i][0],
@@ -233,6 +267,7 @@ class PPOCRv4(Model):
         return result
 
     def unload(self):
+        self.text_sys = None
         del self.det_net
         del self.rec_net
         del self.cls_net
@@ -0,0 +1,86 @@
+"""Prioritised background prefetcher for image embeddings."""
+
+import threading
+
+from anylabeling.views.labeling.logger import logger
+
+
+class EmbeddingPrefetcher:
+    """Encode upcoming images in the background on a pool of workers.
+
+    `schedule` receives the files in priority order (current image first,
+    then its neighbours in navigation direction). Every call replaces the
+    pending queue, so jobs for images the user has already skipped past
+    are dropped before they start. Results go through the cache's
+    ``get_or_compute`` so an image is never encoded twice, whether it is
+    requested by a worker or by the interactive path.
+
+    Args:
+        cache (LRUCache): Cache that stores the embeddings.
+        encode_file (callable): Returns the embedding of an image file,
+            or None if the file cannot be read.
+        num_workers (int): Number of encoder threads.
+    """
+
+    def __init__(self, cache, encode_file, num_workers=1):
+        self.cache = cache
+        self.encode_file = encode_file
+        self.num_workers = max(1, int(num_workers))
+        self.condition = threading.Condition()
+        self.pending = []
+        self.stopped = False
+        self.workers = []
+
+    def _start_workers(self):
+        while len(self.workers) < self.num_workers:
+            worker = threading.Thread(target=self._run, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def schedule(self, files):
+        """Replace the pending jobs with `files`, highest priority first."""
+        with self.condition:
+            if self.stopped:
+                return
+            seen = set()
+            self.pending = []
+            for filename in files:
+                if filename and filename not in seen:
+                    seen.add(filename)
+                    self.pending.append(filename)
+            self._start_workers()
+            self.condition.notify_all()
+
+    def _next_job(self):
+        with self.condition:
+            while not self.stopped and not self.pending:
+                self.condition.wait()
+            if self.stopped:
+                return None
+            return self.pending.pop(0)
+
+    def _run(self):
+        while True:
+            filename = self._next_job()
+            if filename is None:
+                return
+            if self.cache.find(filename) or self.cache.is_computing(filename):
+                continue
+            try:
+                self.cache.get_or_compute(
+                    filename, lambda: self.encode_file(filename)
+                )
+            except Exception as e:  # noqa
+                logger.warning(f"Could not prefetch {filename}: {e}")
+
+    def cancel(self):
+        """Drop all pending jobs; running encodes finish normally."""
+        with self.condition:
+            self.pending = []
+
+    def stop(self):
+        """Stop the workers after their current job."""
+        with self.condition:
+            self.stopped = True
+            self.pending = []
+            self.condition.notify_all()
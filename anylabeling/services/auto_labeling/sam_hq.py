@@ -6,17 +6,17 @@ import numpy as np
 
 from copy import deepcopy
 from PyQt5 import QtCore
-from PyQt5.QtCore import QThread
 from PyQt5.QtCore import QCoreApplication
 
 from anylabeling.app_info import __preferred_device__
-from anylabeling.utils import GenericWorker
 from anylabeling.views.labeling.shape import Shape
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
 
-from .lru_cache import LRUCache
+from .embedding_cache import EmbeddingCache
+from .prefetcher import EmbeddingPrefetcher
 from .model import Model
+from .engines.ort_session import create_session
 from .types import AutoLabelingResult
 from .__base__.clip import ChineseClipONNX
 
@@ -35,11 +35,11 @@ class SegmentAnythingONNX:
         # TODO: Add back when TensorRT backend is stable
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
-        self.encoder_session = onnxruntime.InferenceSession(
+        self.encoder_session = create_session(
             encoder_model_path, providers=providers
         )
         self.encoder_input_name = self.encoder_session.get_inputs()[0].name
-        self.decoder_session = onnxruntime.InferenceSession(
+        self.decoder_session = create_session(
             decoder_model_path, providers=providers
         )
 
@@ -291,12 +291,17 @@ class SAM_HQ(Model):
         # Cache for image embedding
         self.cache_size = 10
         self.preloaded_size = self.cache_size - 3
-        self.image_embedding_cache = LRUCache(self.cache_size)
+        self.image_embedding_cache = EmbeddingCache(
+            self.config, self.cache_size, encoder_model_abs_path
+        )
 
-        # Pre-inference worker
-        self.pre_inference_thread = None
-        self.pre_inference_worker = None
+        # Embedding prefetcher
         self.stop_inference = False
+        self.prefetcher = EmbeddingPrefetcher(
+            self.image_embedding_cache,
+            self.encode_file,
+            num_workers=self.config.get("prefetch_workers", 1),
+        )
 
         # CLIP models
         self.clip_net = None
@@ -448,18 +453,14 @@ class SAM_HQ(Model):
         shapes = []
         cv_image = qt_img_to_rgb_cv_img(image, filename)
         try:
-            # Use cached image embedding if possible
-            cached_data = self.image_embedding_cache.get(filename)
-            if cached_data is not None:
-                image_embedding = cached_data
-            else:
-                if self.stop_inference:
-                    return AutoLabelingResult([], replace=False)
-                image_embedding = self.model.encode(cv_image)
-                self.image_embedding_cache.put(
-                    filename,
-                    image_embedding,
-                )
+            # Use cached image embedding if possible. Concurrent requests
+            # for the same image (e.g. from the preload worker) share a
+            # single encoder run.
+            if self.stop_inference:
+                return AutoLabelingResult([], replace=False)
+            image_embedding = self.image_embedding_cache.get_or_compute(
+                filename, lambda: self.model.encode(cv_image)
+            )
             if self.stop_inference:
                 return AutoLabelingResult([], replace=False)
             masks = self.model.predict_masks(image_embedding, self.marks)
@@ -479,47 +480,23 @@ class SAM_HQ(Model):
 
     def unload(self):
         self.stop_inference = True
-        if self.pre_inference_thread:
-            self.pre_inference_thread.quit()
+        self.prefetcher.stop()
 
-    def preload_worker(self, files):
+    def encode_file(self, filename):
         """
-        Preload next files, run inference and cache results
+        Load an image file and compute its embedding
         """
-        files = files[: self.preloaded_size]
-        for filename in files:
-            if self.image_embedding_cache.find(filename):
-                continue
-            image = self.load_image_from_filename(filename)
-            if image is None:
-                continue
-            if self.stop_inference:
-                return
-            cv_image = qt_img_to_rgb_cv_img(image)
-            image_embedding = self.model.encode(cv_image)
-            self.image_embedding_cache.put(
-                filename,
-                image_embedding,
-            )
+        if self.stop_inference:
+            return None
+        image = self.load_image_from_filename(filename)
+        if image is None:
+            return None
+        cv_image = qt_img_to_rgb_cv_img(image)
+        return self.model.encode(cv_image)
 
     def on_next_files_changed(self, next_files):
         """
-        Handle next files changed. This function can preload next files
-        and run inference to save time for user.
+        Handle next files changed. The files are ordered by priority
+        (current image first); stale prefetch jobs are replaced.
         """
-        if (
-            self.pre_inference_thread is None
-            or not self.pre_inference_thread.isRunning()
-        ):
-            self.pre_inference_thread = QThread()
-            self.pre_inference_worker = GenericWorker(
-                self.preload_worker, next_files
-            )
-            self.pre_inference_worker.finished.connect(
-                self.pre_inference_thread.quit
-            )
-            self.pre_inference_worker.moveToThread(self.pre_inference_thread)
-            self.pre_inference_thread.started.connect(
-                self.pre_inference_worker.run
-            )
-            self.pre_inference_thread.start()
+        self.prefetcher.schedule(next_files[: self.preloaded_size])
@@ -4,6 +4,8 @@ import cv2
 import numpy as np
 import onnxruntime
 
+from .engines.ort_session import create_session
+
 
 class SegmentAnythingONNX:
     """Segmentation model using SegmentAnything"""
@@ -19,11 +21,11 @@ class SegmentAnythingONNX:
         # TODO: Add back when TensorRT backend is stable
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
-        self.encoder_session = onnxruntime.InferenceSession(
+        self.encoder_session = create_session(
             encoder_model_path, providers=providers
         )
         self.encoder_input_name = self.encoder_session.get_inputs()[0].name
-        self.decoder_session = onnxruntime.InferenceSession(
+        self.decoder_session = create_session(
             decoder_model_path, providers=providers
         )
 
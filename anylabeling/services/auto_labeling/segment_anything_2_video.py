@@ -14,6 +14,7 @@ from anylabeling.app_info import __preferred_device__
 from anylabeling.views.labeling.shape import Shape
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
+from anylabeling.views.labeling.utils.video import get_video_source
 
 from .model import Model
 from .types import AutoLabelingResult
@@ -469,6 +470,10 @@ class SegmentAnything2Video(Model):
         Returns:
             int: The index of the frame in the sorted list of frames, or -1 if not found.
         """
+        video_source = get_video_source(filename)
+        if video_source is not None:
+            index = video_source.index_of(filename)
+            return -1 if index is None else index
         frame_names = [
             p
             for p in os.listdir(os.path.dirname(filename))
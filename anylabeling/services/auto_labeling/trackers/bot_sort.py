@@ -28,11 +28,12 @@ class BOTrack(STrack):
     Methods:
         update_features(feat): Update features vector and smooth it using exponential moving average.
         predict(): Predicts the mean and covariance using Kalman filter.
-        re_activate(new_track, frame_id, new_id): Reactivates a track with updated features and optionally new ID.
-        update(new_track, frame_id): Update the YOLOv8 instance with new track and frame ID.
+        mark_re_activated(new_track, frame_id, new_id): Reactivates a track with updated features and optionally new ID.
+        mark_updated(new_track, frame_id): Update the YOLOv8 instance with new track and frame ID.
         tlwh: Property that gets the current position in tlwh format `(top left x, top left y, width, height)`.
         multi_predict(stracks): Predicts the mean and covariance of multiple object tracks using shared Kalman filter.
         convert_coords(tlwh): Converts tlwh bounding box coordinates to xywh format.
+        convert_multi_coords(tlwhs): Converts several tlwh bounding boxes to xywh format.
         tlwh_to_xywh(tlwh): Convert bounding box to xywh format `(center x, center y, width, height)`.
 
     Examples:
@@ -97,17 +98,17 @@ class BOTrack(STrack):
             mean_state, self.covariance
         )
 
-    def re_activate(self, new_track, frame_id, new_id=False):
+    def mark_re_activated(self, new_track, frame_id, new_id=False):
         """Reactivates a track with updated features and optionally assigns a new ID."""
         if new_track.curr_feat is not None:
             self.update_features(new_track.curr_feat)
-        super().re_activate(new_track, frame_id, new_id)
+        super().mark_re_activated(new_track, frame_id, new_id)
 
-    def update(self, new_track, frame_id):
+    def mark_updated(self, new_track, frame_id):
         """Updates the YOLOv8 instance with new track information and the current frame ID."""
         if new_track.curr_feat is not None:
             self.update_features(new_track.curr_feat)
-        super().update(new_track, frame_id)
+        super().mark_updated(new_track, frame_id)
 
     @property
     def tlwh(self):
@@ -123,23 +124,23 @@ class BOTrack(STrack):
         """Predicts the mean and covariance for multiple object tracks using a shared Kalman filter."""
         if len(stracks) <= 0:
             return
-        multi_mean = np.asarray([st.mean.copy() for st in stracks])
-        multi_covariance = np.asarray([st.covariance for st in stracks])
-        for i, st in enumerate(stracks):
-            if st.state != TrackState.Tracked:
-                multi_mean[i][6] = 0
-                multi_mean[i][7] = 0
+        multi_mean, multi_covariance, states = STrack.get_states(stracks)
+        multi_mean[states != TrackState.Tracked, 6:8] = 0
         multi_mean, multi_covariance = BOTrack.shared_kalman.multi_predict(
             multi_mean, multi_covariance
         )
-        for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-            stracks[i].mean = mean
-            stracks[i].covariance = cov
+        STrack.set_states(stracks, multi_mean, multi_covariance)
 
     def convert_coords(self, tlwh):
         """Converts tlwh bounding box coordinates to xywh format."""
         return self.tlwh_to_xywh(tlwh)
 
+    def convert_multi_coords(self, tlwhs):
+        """Converts (N, 4) tlwh bounding boxes to xywh format."""
+        ret = np.array(tlwhs, dtype=np.float64)
+        ret[:, :2] += ret[:, 2:] / 2
+        return ret
+
     @staticmethod
     def tlwh_to_xywh(tlwh):
         """Convert bounding box from tlwh (top-left-width-height) to xywh (center-x-center-y-width-height) format."""
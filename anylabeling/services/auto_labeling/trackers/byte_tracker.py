@@ -1,3 +1,6 @@
+import threading
+import weakref
+
 import numpy as np
 
 from .basetrack import BaseTrack, TrackState
@@ -21,6 +24,72 @@ def xywh2ltwh(x):
     return y
 
 
+class TrackTable:
+    """
+    Structure-of-arrays storage for the Kalman filter states of tracks.
+
+    Every activated track owns one row (slot) of the contiguous `mean`, `covariance` and `state` arrays, so the states
+    of many tracks are predicted, corrected and warped with single vectorized calls instead of being stacked from and
+    scattered back to per-track arrays every frame. Rows are recycled once their track is garbage collected, and the
+    arrays double in size when they run out of rows.
+
+    Attributes:
+        mean (np.ndarray): (capacity, 8) state means.
+        covariance (np.ndarray): (capacity, 8, 8) state covariances.
+        state (np.ndarray): (capacity,) TrackState of every row.
+
+    Examples:
+        >>> table = TrackTable()
+        >>> slot = table.allocate()
+        >>> table.mean[slot] = np.zeros(8)
+        >>> table.release(slot)
+    """
+
+    def __init__(self, capacity=64, ndim=8):
+        """Initialize a table with room for `capacity` tracks with `ndim` dimensional states."""
+        self.mean = np.zeros((capacity, ndim))
+        self.covariance = np.zeros((capacity, ndim, ndim))
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self._free = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of rows in use."""
+        return len(self.mean) - len(self._free)
+
+    def allocate(self):
+        """Returns a free row index, growing the arrays if needed."""
+        with self._lock:
+            if not self._free:
+                capacity = len(self.mean)
+                self.mean = np.concatenate(
+                    [self.mean, np.zeros_like(self.mean)]
+                )
+                self.covariance = np.concatenate(
+                    [self.covariance, np.zeros_like(self.covariance)]
+                )
+                self.state = np.concatenate(
+                    [self.state, np.zeros_like(self.state)]
+                )
+                self._free = list(range(2 * capacity - 1, capacity - 1, -1))
+            return self._free.pop()
+
+    def release(self, slot):
+        """Returns a row to the pool of free rows."""
+        with self._lock:
+            self._free.append(slot)
+
+    @staticmethod
+    def rows(stracks):
+        """Returns (table, slots) if all tracks are stored in the same table, otherwise None."""
+        table = stracks[0]._table
+        if table is None or any(st._table is not table for st in stracks):
+            return None
+        return table, np.fromiter(
+            (st._slot for st in stracks), dtype=np.intp, count=len(stracks)
+        )
+
+
 class STrack(BaseTrack):
     """
     Single object tracking representation that uses Kalman filtering for state estimation.
@@ -30,10 +99,11 @@ class STrack(BaseTrack):
 
     Attributes:
         shared_kalman (KalmanFilterXYAH): Shared Kalman filter that is used across all STrack instances for prediction.
+        shared_table (TrackTable): Table that stores tracks activated without a table of their own.
         _tlwh (np.ndarray): Private attribute to store top-left corner coordinates and width and height of bounding box.
         kalman_filter (KalmanFilterXYAH): Instance of Kalman filter used for this particular object track.
-        mean (np.ndarray): Mean state estimate vector.
-        covariance (np.ndarray): Covariance of state estimate.
+        mean (np.ndarray): Mean state estimate vector, a view of the track's row once activated.
+        covariance (np.ndarray): Covariance of state estimate, a view of the track's row once activated.
         is_activated (bool): Boolean flag indicating if the track has been activated.
         score (float): Confidence score of the track.
         tracklet_len (int): Length of the tracklet.
@@ -46,7 +116,8 @@ class STrack(BaseTrack):
         predict(): Predict the next state of the object using Kalman filter.
         multi_predict(stracks): Predict the next states for multiple tracks.
         multi_gmc(stracks, H): Update multiple track states using a homography matrix.
-        activate(kalman_filter, frame_id): Activate a new tracklet.
+        multi_update(stracks, detections, frame_id): Correct multiple matched tracks with their detections.
+        activate(kalman_filter, frame_id, table): Activate a new tracklet.
         re_activate(new_track, frame_id, new_id): Reactivate a previously lost tracklet.
         update(new_track, frame_id): Update the state of a matched track.
         convert_coords(tlwh): Convert bounding box to x-y-aspect-height format.
@@ -59,6 +130,7 @@ class STrack(BaseTrack):
     """
 
     shared_kalman = KalmanFilterXYAH()
+    shared_table = TrackTable()
 
     def __init__(self, xywh, score, cls):
         """
@@ -76,6 +148,10 @@ class STrack(BaseTrack):
             >>> cls = 'person'
             >>> track = STrack(xywh, score, cls)
         """
+        # The Kalman state lives in these attributes until the track is stored in a table
+        self._table, self._slot = None, None
+        self._mean, self._covariance = None, None
+        self._state = TrackState.New
         super().__init__()
         # xywh+idx or xywha+idx
         assert len(xywh) in {
@@ -84,7 +160,6 @@ class STrack(BaseTrack):
         }, f"expected 5 or 6 values but got {len(xywh)}"
         self._tlwh = np.asarray(xywh2ltwh(xywh[:4]), dtype=np.float32)
         self.kalman_filter = None
-        self.mean, self.covariance = None, None
         self.is_activated = False
 
         self.score = score
@@ -93,6 +168,61 @@ class STrack(BaseTrack):
         self.idx = xywh[-1]
         self.angle = xywh[4] if len(xywh) == 6 else None
 
+    @property
+    def mean(self):
+        """Mean state estimate, None before the track is activated."""
+        if self._slot is None:
+            return self._mean
+        return self._table.mean[self._slot]
+
+    @mean.setter
+    def mean(self, value):
+        if self._slot is None:
+            self._mean = value
+        else:
+            self._table.mean[self._slot] = value
+
+    @property
+    def covariance(self):
+        """Covariance of the state estimate, None before the track is activated."""
+        if self._slot is None:
+            return self._covariance
+        return self._table.covariance[self._slot]
+
+    @covariance.setter
+    def covariance(self, value):
+        if self._slot is None:
+            self._covariance = value
+        else:
+            self._table.covariance[self._slot] = value
+
+    @property
+    def state(self):
+        """TrackState of the track."""
+        if self._slot is None:
+            return self._state
+        return int(self._table.state[self._slot])
+
+    @state.setter
+    def state(self, value):
+        if self._slot is None:
+            self._state = value
+        else:
+            self._table.state[self._slot] = value
+
+    def attach(self, table):
+        """Move the Kalman state of the track into a row of `table`, which is freed with the track."""
+        if self._table is table:
+            return
+        mean, covariance, state = self.mean, self.covariance, self.state
+        if self._table is not None:
+            self._finalizer()
+        self._table, self._slot = table, table.allocate()
+        self._finalizer = weakref.finalize(self, table.release, self._slot)
+        self.state = state
+        if mean is not None:
+            self.mean, self.covariance = mean, covariance
+
     def predict(self):
         """Predicts the next state (mean and covariance) of the object using the Kalman filter."""
         mean_state = self.mean.copy()
@@ -102,44 +232,102 @@ class STrack(BaseTrack):
             mean_state, self.covariance
         )
 
+    @staticmethod
+    def get_states(stracks):
+        """Returns the stacked means, covariances and states of tracks, read straight from their table if shared."""
+        rows = TrackTable.rows(stracks)
+        if rows is not None:
+            table, slots = rows
+            return (
+                table.mean[slots],
+                table.covariance[slots],
+                table.state[slots],
+            )
+        return (
+            np.asarray([st.mean for st in stracks]),
+            np.asarray([st.covariance for st in stracks]),
+            np.asarray([st.state for st in stracks]),
+        )
+
+    @staticmethod
+    def set_states(stracks, multi_mean, multi_covariance):
+        """Writes stacked means and covariances back to tracks."""
+        rows = TrackTable.rows(stracks)
+        if rows is not None:
+            table, slots = rows
+            table.mean[slots] = multi_mean
+            table.covariance[slots] = multi_covariance
+            return
+        for st, mean, cov in zip(stracks, multi_mean, multi_covariance):
+            st.mean = mean
+            st.covariance = cov
+
     @staticmethod
     def multi_predict(stracks):
         """Perform multi-object predictive tracking using Kalman filter for the provided list of STrack instances."""
         if len(stracks) <= 0:
             return
-        multi_mean = np.asarray([st.mean.copy() for st in stracks])
-        multi_covariance = np.asarray([st.covariance for st in stracks])
-        for i, st in enumerate(stracks):
-            if st.state != TrackState.Tracked:
-                multi_mean[i][7] = 0
+        multi_mean, multi_covariance, states = STrack.get_states(stracks)
+        multi_mean[states != TrackState.Tracked, 7] = 0
         multi_mean, multi_covariance = STrack.shared_kalman.multi_predict(
             multi_mean, multi_covariance
         )
-        for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-            stracks[i].mean = mean
-            stracks[i].covariance = cov
+        STrack.set_states(stracks, multi_mean, multi_covariance)
 
     @staticmethod
     def multi_gmc(stracks, H=np.eye(2, 3)):
         """Update state tracks positions and covariances using a homography matrix for multiple tracks."""
         if len(stracks) > 0:
-            multi_mean = np.asarray([st.mean.copy() for st in stracks])
-            multi_covariance = np.asarray([st.covariance for st in stracks])
+            multi_mean, multi_covariance, _ = STrack.get_states(stracks)
 
             R = H[:2, :2]
             R8x8 = np.kron(np.eye(4, dtype=float), R)
             t = H[:2, 2]
 
-            for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-                mean = R8x8.dot(mean)
-                mean[:2] += t
-                cov = R8x8.dot(cov).dot(R8x8.transpose())
+            multi_mean = multi_mean @ R8x8.T
+            multi_mean[:, :2] += t
+            multi_covariance = R8x8 @ multi_covariance @ R8x8.T
+
+            STrack.set_states(stracks, multi_mean, multi_covariance)
+
+    @staticmethod
+    def multi_update(stracks, detections, frame_id):
+        """
+        Update matched tracks with their detections, running the Kalman correction of all tracks at once.
+
+        Tracks in the Tracked state are updated like `update`, the others are re-activated like `re_activate`.
+
+        Args:
+            stracks (List[STrack]): Matched tracks sharing one Kalman filter.
+            detections (List[STrack]): The detection matched to each track.
+            frame_id (int): The ID of the current frame.
 
-                stracks[i].mean = mean
-                stracks[i].covariance = cov
+        Returns:
+            (tuple[List[STrack], List[STrack]]): The updated tracks and the re-activated tracks.
+        """
+        activated, refind = [], []
+        if len(stracks) <= 0:
+            return activated, refind
+        multi_mean, multi_covariance, states = STrack.get_states(stracks)
+        tlwhs = np.asarray([det.tlwh for det in detections], dtype=np.float64)
+        multi_mean, multi_covariance = stracks[0].kalman_filter.multi_update(
+            multi_mean,
+            multi_covariance,
+            stracks[0].convert_multi_coords(tlwhs),
+        )
+        STrack.set_states(stracks, multi_mean, multi_covariance)
+        for track, det, state in zip(stracks, detections, states):
+            if state == TrackState.Tracked:
+                track.mark_updated(det, frame_id)
+                activated.append(track)
+            else:
+                track.mark_re_activated(det, frame_id)
+                refind.append(track)
+        return activated, refind
 
-    def activate(self, kalman_filter, frame_id):
+    def activate(self, kalman_filter, frame_id, table=None):
         """Activate a new tracklet using the provided Kalman filter and initialize its state and covariance."""
+        self.attach(table if table is not None else self.shared_table)
         self.kalman_filter = kalman_filter
         self.track_id = self.next_id()
         self.mean, self.covariance = self.kalman_filter.initiate(
@@ -158,6 +346,10 @@ class STrack(BaseTrack):
         self.mean, self.covariance = self.kalman_filter.update(
             self.mean, self.covariance, self.convert_coords(new_track.tlwh)
         )
+        self.mark_re_activated(new_track, frame_id, new_id)
+
+    def mark_re_activated(self, new_track, frame_id, new_id=False):
+        """Sets the attributes of a track re-activated with `new_track`, once its Kalman state is corrected."""
         self.tracklet_len = 0
         self.state = TrackState.Tracked
         self.is_activated = True
@@ -183,13 +375,16 @@ class STrack(BaseTrack):
             >>> new_track = STrack([105, 205, 55, 85, 0.95, 1])
             >>> track.update(new_track, 2)
         """
-        self.frame_id = frame_id
-        self.tracklet_len += 1
-
         new_tlwh = new_track.tlwh
         self.mean, self.covariance = self.kalman_filter.update(
             self.mean, self.covariance, self.convert_coords(new_tlwh)
         )
+        self.mark_updated(new_track, frame_id)
+
+    def mark_updated(self, new_track, frame_id):
+        """Sets the attributes of a track updated with `new_track`, once its Kalman state is corrected."""
+        self.frame_id = frame_id
+        self.tracklet_len += 1
         self.state = TrackState.Tracked
         self.is_activated = True
 
@@ -219,6 +414,13 @@ class STrack(BaseTrack):
         ret[2:] += ret[:2]
         return ret
 
+    def convert_multi_coords(self, tlwhs):
+        """Convert (N, 4) top-left-width-height boxes to the measurement format of the Kalman filter."""
+        ret = np.array(tlwhs, dtype=np.float64)
+        ret[:, :2] += ret[:, 2:] / 2
+        ret[:, 2] /= ret[:, 3]
+        return ret
+
     @staticmethod
     def tlwh_to_xyah(tlwh):
         """Convert bounding box from tlwh format to center-x-center-y-aspect-height (xyah) format."""
@@ -316,6 +518,7 @@ class BYTETracker:
         self.args = args
         self.max_time_lost = int(frame_rate / 30.0 * args.track_buffer)
         self.kalman_filter = self.get_kalmanfilter()
+        self.track_table = TrackTable()
         self.reset_id()
 
     def update(self, scores, bboxes, cls, img=None):
@@ -365,15 +568,13 @@ class BYTETracker:
             dists, thresh=self.args.match_thresh
         )
 
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        activated, refind = STrack.multi_update(
+            [strack_pool[i] for i in matches[:, 0]],
+            [detections[i] for i in matches[:, 1]],
+            self.frame_id,
+        )
+        activated_stracks.extend(activated)
+        refind_stracks.extend(refind)
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
         detections_second = self.init_track(
             dets_second, scores_second, cls_second, img
@@ -388,15 +589,13 @@ class BYTETracker:
         matches, u_track, u_detection_second = matching.linear_assignment(
             dists, thresh=0.5
         )
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        activated, refind = STrack.multi_update(
+            [r_tracked_stracks[i] for i in matches[:, 0]],
+            [detections_second[i] for i in matches[:, 1]],
+            self.frame_id,
+        )
+        activated_stracks.extend(activated)
+        refind_stracks.extend(refind)
 
         for it in u_track:
             track = r_tracked_stracks[it]
@@ -409,9 +608,12 @@ class BYTETracker:
         matches, u_unconfirmed, u_detection = matching.linear_assignment(
             dists, thresh=0.7
         )
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_stracks.append(unconfirmed[itracked])
+        activated, _ = STrack.multi_update(
+            [unconfirmed[i] for i in matches[:, 0]],
+            [detections[i] for i in matches[:, 1]],
+            self.frame_id,
+        )
+        activated_stracks.extend(activated)
         for it in u_unconfirmed:
             track = unconfirmed[it]
             track.mark_removed()
@@ -421,7 +623,7 @@ class BYTETracker:
             track = detections[inew]
             if track.score < self.args.new_track_thresh:
                 continue
-            track.activate(self.kalman_filter, self.frame_id)
+            track.activate(self.kalman_filter, self.frame_id, self.track_table)
             activated_stracks.append(track)
         # Step 5: Update state
         for track in self.lost_stracks:
@@ -497,20 +699,17 @@ class BYTETracker:
         self.removed_stracks = []  # type: list[STrack]
         self.frame_id = 0
         self.kalman_filter = self.get_kalmanfilter()
+        self.track_table = TrackTable()
         self.reset_id()
 
     @staticmethod
     def joint_stracks(tlista, tlistb):
         """Combines two lists of STrack objects into a single list, ensuring no duplicates based on track IDs."""
-        exists = {}
-        res = []
-        for t in tlista:
-            exists[t.track_id] = 1
-            res.append(t)
+        exists = {t.track_id for t in tlista}
+        res = list(tlista)
         for t in tlistb:
-            tid = t.track_id
-            if not exists.get(tid, 0):
-                exists[tid] = 1
+            if t.track_id not in exists:
+                exists.add(t.track_id)
                 res.append(t)
         return res
 
@@ -524,15 +723,13 @@ class BYTETracker:
     def remove_duplicate_stracks(stracksa, stracksb):
         """Removes duplicate stracks from two lists based on Intersection over Union (IoU) distance."""
         pdist = matching.iou_distance(stracksa, stracksb)
-        pairs = np.where(pdist < 0.15)
-        dupa, dupb = [], []
-        for p, q in zip(*pairs):
-            timep = stracksa[p].frame_id - stracksa[p].start_frame
-            timeq = stracksb[q].frame_id - stracksb[q].start_frame
-            if timep > timeq:
-                dupb.append(q)
-            else:
-                dupa.append(p)
+        p, q = np.where(pdist < 0.15)
+        if not len(p):
+            return list(stracksa), list(stracksb)
+        agea = np.array([t.frame_id - t.start_frame for t in stracksa])
+        ageb = np.array([t.frame_id - t.start_frame for t in stracksb])
+        older = agea[p] > ageb[q]
+        dupa, dupb = set(p[~older].tolist()), set(q[older].tolist())
         resa = [t for i, t in enumerate(stracksa) if i not in dupa]
         resb = [t for i, t in enumerate(stracksb) if i not in dupb]
         return resa, resb
@@ -2,6 +2,14 @@ import numpy as np
 import scipy.linalg
 
 
+def batch_diag(values: np.ndarray) -> np.ndarray:
+    """Stack the rows of an (N, D) array into N diagonal (D, D) matrices."""
+    num, ndim = values.shape
+    diag = np.zeros((num, ndim, ndim), dtype=values.dtype)
+    diag[:, np.arange(ndim), np.arange(ndim)] = values
+    return diag
+
+
 class KalmanFilterXYAH:
     """
     A KalmanFilterXYAH class for tracking bounding boxes in image space using a Kalman filter.
@@ -199,8 +207,7 @@ class KalmanFilterXYAH:
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = batch_diag(sqr)
 
         mean = np.dot(mean, self._motion_mat.T)
         left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
@@ -248,6 +255,64 @@ class KalmanFilterXYAH:
         )
         return new_mean, new_covariance
 
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray) -> tuple:
+        """
+        Project the state distributions of multiple objects to measurement space (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional mean matrix of the object states.
+            covariance (ndarray): The Nx8x8 covariance matrix of the object states.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx4 projected means and Nx4x4 projected covariances.
+        """
+        std = [
+            self._std_weight_position * mean[:, 3],
+            self._std_weight_position * mean[:, 3],
+            1e-1 * np.ones_like(mean[:, 3]),
+            self._std_weight_position * mean[:, 3],
+        ]
+        innovation_cov = batch_diag(np.square(np.r_[std]).T)
+
+        mean = np.dot(mean, self._update_mat.T)
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        return mean, covariance + innovation_cov
+
+    def multi_update(
+        self, mean: np.ndarray, covariance: np.ndarray, measurement: np.ndarray
+    ) -> tuple:
+        """
+        Run Kalman filter correction step for multiple object states (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional predicted mean matrix.
+            covariance (ndarray): The Nx8x8 covariance matrix of the predicted states.
+            measurement (ndarray): The Nx4 dimensional measurement matrix, one measurement per state.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the measurement-corrected state distributions.
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean = np.array([[0, 0, 1, 1, 0, 0, 0, 0]] * 3, dtype=float)
+            >>> covariance = np.stack([np.eye(8)] * 3)
+            >>> measurement = np.array([[1, 1, 1, 1]] * 3, dtype=float)
+            >>> new_mean, new_covariance = kf.multi_update(mean, covariance, measurement)
+        """
+        projected_mean, projected_cov = self.multi_project(mean, covariance)
+
+        # K = P H^T S^-1, solved as S K^T = H P for every state
+        kalman_gain = np.linalg.solve(
+            projected_cov, self._update_mat @ covariance
+        ).transpose((0, 2, 1))
+        innovation = measurement - projected_mean
+
+        new_mean = mean + np.einsum("nij,nj->ni", kalman_gain, innovation)
+        new_covariance = covariance - (
+            kalman_gain @ projected_cov @ kalman_gain.transpose((0, 2, 1))
+        )
+        return new_mean, new_covariance
+
     def gating_distance(
         self,
         mean: np.ndarray,
@@ -485,8 +550,7 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = batch_diag(sqr)
 
         mean = np.dot(mean, self._motion_mat.T)
         left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
@@ -494,6 +558,29 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
 
         return mean, covariance
 
+    def multi_project(self, mean, covariance) -> tuple:
+        """
+        Project the state distributions of multiple objects to measurement space (Vectorized version).
+
+        Args:
+            mean (ndarray): The Nx8 dimensional mean matrix of the object states.
+            covariance (ndarray): The Nx8x8 covariance matrix of the object states.
+
+        Returns:
+            (tuple[ndarray, ndarray]): Returns the Nx4 projected means and Nx4x4 projected covariances.
+        """
+        std = [
+            self._std_weight_position * mean[:, 2],
+            self._std_weight_position * mean[:, 3],
+            self._std_weight_position * mean[:, 2],
+            self._std_weight_position * mean[:, 3],
+        ]
+        innovation_cov = batch_diag(np.square(np.r_[std]).T)
+
+        mean = np.dot(mean, self._update_mat.T)
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        return mean, covariance + innovation_cov
+
     def update(self, mean, covariance, measurement) -> tuple:
         """
         Run Kalman filter correction step.
@@ -138,7 +138,8 @@ def linear_assignment(
         # Use lap.lapjv
         # https://github.com/gatagat/lap
         _, x, y = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=thresh)
-        matches = [[ix, mx] for ix, mx in enumerate(x) if mx >= 0]
+        matched = np.flatnonzero(x >= 0)
+        matches = np.column_stack([matched, x[matched]]).astype(int)
         unmatched_a = np.where(x < 0)[0]
         unmatched_b = np.where(y < 0)[0]
     else:
@@ -147,13 +148,8 @@ def linear_assignment(
         x, y = scipy.optimize.linear_sum_assignment(
             cost_matrix
         )  # row x, col y
-        matches = np.asarray(
-            [
-                [x[i], y[i]]
-                for i in range(len(x))
-                if cost_matrix[x[i], y[i]] <= thresh
-            ]
-        )
+        valid = cost_matrix[x, y] <= thresh
+        matches = np.column_stack([x[valid], y[valid]]).astype(int)
         if len(matches) == 0:
             unmatched_a = list(np.arange(cost_matrix.shape[0]))
             unmatched_b = list(np.arange(cost_matrix.shape[1]))
@@ -503,13 +503,41 @@ def clip_boxes(boxes, shape):
     boxes[..., [1, 3]] = boxes[..., [1, 3]].clip(0, shape[0])  # y1, y2
 
 
+class RoiMasks:
+    """
+    Binary instance masks, each kept as the region of interest around
+    its pixels instead of a full-size array.
+
+    Args:
+      shape (tuple): (h, w) of the frame the masks belong to.
+      rois (list): (x, y, mask) of each instance, where `mask` is a uint8
+        array whose top left pixel is at column x, row y of the frame.
+    """
+
+    def __init__(self, shape, rois=None):
+        self.shape = tuple(shape)
+        self.rois = rois if rois is not None else []
+
+    def __len__(self):
+        return len(self.rois)
+
+    def to_dense(self):
+        """Return the masks as a (n, h, w) uint8 array."""
+        dense = np.zeros((len(self.rois), *self.shape), dtype=np.uint8)
+        for i, (x, y, mask) in enumerate(self.rois):
+            dense[i, y : y + mask.shape[0], x : x + mask.shape[1]] = mask
+        return dense
+
+
 def masks2segments(masks, epsilon_factor=0):
     """
     It takes a list of masks(n,h,w) and returns a list of segments(n,xy)
 
     Args:
-      masks (np.ndarray):
-        the output of the model, which is a tensor of shape (batch_size, 160, 160)
+      masks (np.ndarray | RoiMasks):
+        the output of the model, which is a tensor of shape (batch_size, 160, 160),
+        or the region of interest of each mask, whose contours are found
+        without scanning the whole frame
       epsilon_factor (float, optional):
         Factor used for epsilon calculation in contour approximation.
         A smaller value results in smoother contours but with more points.
@@ -518,10 +546,20 @@ def masks2segments(masks, epsilon_factor=0):
     Returns:
       segments (List): list of segment masks
     """
-    segments = []
-    for x in masks.astype("uint8"):
-        c = cv2.findContours(x, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+    if isinstance(masks, RoiMasks):
+        img_area = masks.shape[0] * masks.shape[1]
+        rois = masks.rois
+    else:
         img_area = masks.shape[1] * masks.shape[2]
+        rois = [(0, 0, x) for x in masks.astype("uint8")]
+    segments = []
+    for x, y, mask in rois:
+        if mask.size == 0:
+            segments.append(np.zeros((0, 2), dtype="float32"))
+            continue
+        c = cv2.findContours(
+            mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x, y)
+        )[0]
         c = refine_contours(c, img_area, epsilon_factor)
         if c:
             c = np.array([c[0] for c in c[0]])
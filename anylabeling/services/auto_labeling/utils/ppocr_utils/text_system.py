@@ -5,6 +5,9 @@ import os
 os.environ["FLAGS_allocator_strategy"] = "auto_growth"
 
 import copy
+import queue
+import threading
+from collections import defaultdict
 
 from .operators import *
 from .db_postprocess import *
@@ -213,6 +216,52 @@ class TextDetector(object):
             input_dict[self.input_tensor.name] = img
             outputs = self.predictor.run(self.output_tensors, input_dict)
 
+        return self.postprocess(outputs, shape_list, ori_im.shape)
+
+    def batch(self, img_list, batch_num=4):
+        """Detect text in several images.
+
+        Images whose preprocessed size is equal are stacked into one run
+        of up to `batch_num` images, so each image gets the same result as
+        from `__call__`. Returns one box array per image, None for images
+        that could not be preprocessed.
+        """
+        batch_size = self.input_tensor.shape[0]
+        if isinstance(batch_size, int) and batch_size > 0:
+            batch_num = batch_size
+        elif self.det_algorithm not in ["DB", "PSE", "DB++"]:
+            batch_num = 1
+
+        dt_boxes_list = [None] * len(img_list)
+        groups = defaultdict(list)
+        for ino, img in enumerate(img_list):
+            if img is None:
+                continue
+            data = self.transform({"image": img}, self.preprocess_op)
+            if data is None:
+                continue
+            norm_img, shape = data
+            groups[norm_img.shape].append((ino, norm_img, shape))
+
+        for items in groups.values():
+            for beg in range(0, len(items), batch_num):
+                chunk = items[beg : beg + batch_num]
+                input_dict = {
+                    self.input_tensor.name: np.stack(
+                        [norm_img for _, norm_img, _ in chunk]
+                    )
+                }
+                outputs = self.predictor.run(self.output_tensors, input_dict)
+                for i, (ino, _, shape) in enumerate(chunk):
+                    dt_boxes_list[ino] = self.postprocess(
+                        [output[i : i + 1] for output in outputs],
+                        np.expand_dims(shape, axis=0),
+                        img_list[ino].shape,
+                    )
+        return dt_boxes_list
+
+    def postprocess(self, outputs, shape_list, image_shape):
+        """Turn the outputs of one image into filtered text boxes"""
         preds = {}
         if self.det_algorithm == "EAST":
             preds["f_geo"] = outputs[0]
@@ -237,11 +286,9 @@ class TextDetector(object):
         dt_boxes = post_result[0]["points"]
 
         if self.args.det_box_type == "poly":
-            dt_boxes = self.filter_tag_det_res_only_clip(
-                dt_boxes, ori_im.shape
-            )
+            dt_boxes = self.filter_tag_det_res_only_clip(dt_boxes, image_shape)
         else:
-            dt_boxes = self.filter_tag_det_res(dt_boxes, ori_im.shape)
+            dt_boxes = self.filter_tag_det_res(dt_boxes, image_shape)
 
         return dt_boxes
 
@@ -975,6 +1022,16 @@ class TextSystem(object):
         else:
             pass
             # logger.debug("dt_boxes num : {}, elapsed : {}".format(len(dt_boxes), elapse))
+        dt_boxes, img_crop_list = self.crop_boxes(ori_im, dt_boxes)
+        if self.use_angle_cls and cls:
+            img_crop_list, angle_list = self.text_classifier(img_crop_list)
+
+        rec_res = self.text_recognizer(img_crop_list)
+
+        return self.filter_results(dt_boxes, rec_res)
+
+    def crop_boxes(self, img, dt_boxes):
+        """Sort the detected boxes and crop them out of the image"""
         img_crop_list = []
 
         dt_boxes = sorted_boxes(dt_boxes)
@@ -982,15 +1039,13 @@ class TextSystem(object):
         for bno in range(len(dt_boxes)):
             tmp_box = copy.deepcopy(dt_boxes[bno])
             if self.args.det_box_type == "quad":
-                img_crop = get_rotate_crop_image(ori_im, tmp_box)
+                img_crop = get_rotate_crop_image(img, tmp_box)
             else:
-                img_crop = get_minarea_rect_crop(ori_im, tmp_box)
+                img_crop = get_minarea_rect_crop(img, tmp_box)
             img_crop_list.append(img_crop)
-        if self.use_angle_cls and cls:
-            img_crop_list, angle_list = self.text_classifier(img_crop_list)
-
-        rec_res = self.text_recognizer(img_crop_list)
+        return dt_boxes, img_crop_list
 
+    def filter_results(self, dt_boxes, rec_res):
         filter_boxes, filter_rec_res, scores = [], [], []
         for box, rec_result in zip(dt_boxes, rec_res):
             text, score = rec_result
@@ -1001,6 +1056,93 @@ class TextSystem(object):
 
         return filter_boxes, filter_rec_res, scores
 
+    def batch(
+        self,
+        img_list,
+        cls=True,
+        det_batch_num=4,
+        rec_pool_size=64,
+        queue_size=4,
+    ):
+        """Run OCR on several images.
+
+        Detection runs batched in a worker thread and hands the text crops
+        of every image to a bounded queue. The crops of consecutive images
+        are pooled until `rec_pool_size` of them are waiting, then
+        classified and recognized together, so the width-sorted
+        recognition batches fill up across image boundaries while the
+        next images are being detected.
+
+        Returns one (boxes, rec_res, scores) tuple per image, like
+        `__call__`.
+        """
+        results = [(None, None, None)] * len(img_list)
+        crop_queue = queue.Queue(maxsize=max(1, queue_size))
+        stop_event = threading.Event()
+        errors = []
+
+        def detect():
+            try:
+                for beg in range(0, len(img_list), det_batch_num):
+                    chunk = img_list[beg : beg + det_batch_num]
+                    dt_boxes_list = self.text_detector.batch(
+                        chunk, det_batch_num
+                    )
+                    for i, dt_boxes in enumerate(dt_boxes_list):
+                        if stop_event.is_set():
+                            return
+                        if dt_boxes is None:
+                            continue
+                        dt_boxes, img_crop_list = self.crop_boxes(
+                            chunk[i], dt_boxes
+                        )
+                        crop_queue.put((beg + i, dt_boxes, img_crop_list))
+            except Exception as e:  # noqa
+                errors.append(e)
+            finally:
+                crop_queue.put(None)
+
+        detect_thread = threading.Thread(target=detect, daemon=True)
+        detect_thread.start()
+        try:
+            pending, num_crops = [], 0
+            while True:
+                item = crop_queue.get()
+                if item is not None:
+                    pending.append(item)
+                    num_crops += len(item[2])
+                if pending and (item is None or num_crops >= rec_pool_size):
+                    self._recognize_pool(pending, results, cls)
+                    pending, num_crops = [], 0
+                if item is None:
+                    break
+        finally:
+            stop_event.set()
+            # Unblock the detector if it waits for room in the queue
+            while detect_thread.is_alive():
+                try:
+                    crop_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        if errors:
+            raise errors[0]
+        return results
+
+    def _recognize_pool(self, pending, results, cls):
+        img_crop_list = [crop for _, _, crops in pending for crop in crops]
+        if img_crop_list:
+            if self.use_angle_cls and cls:
+                img_crop_list, _ = self.text_classifier(img_crop_list)
+            rec_res = self.text_recognizer(img_crop_list)
+        else:
+            rec_res = []
+        offset = 0
+        for ino, dt_boxes, crops in pending:
+            results[ino] = self.filter_results(
+                dt_boxes, rec_res[offset : offset + len(crops)]
+            )
+            offset += len(crops)
+
 
 def build_post_process(config, global_config=None):
     support_dict = [
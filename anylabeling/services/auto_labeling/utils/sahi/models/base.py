@@ -11,6 +11,9 @@ from anylabeling.services.auto_labeling.utils.sahi.utils.import_utils import (
 
 
 class DetectionModel:
+    # Set by models that implement preprocess_batch/perform_batch_inference
+    supports_batch_inference = False
+
     def __init__(
         self,
         model_path: Optional[str] = None,
@@ -114,6 +117,24 @@ class DetectionModel:
         """
         raise NotImplementedError()
 
+    def preprocess_batch(self, images: List[np.ndarray]):
+        """
+        Prepares a list of images for perform_batch_inference(). Runs on a worker
+        thread while the previous batch is being inferred, so it must not touch
+        the prediction state of the model.
+        Args:
+            images: list of np.ndarray
+                Images to be predicted, in the same format as for perform_inference().
+        """
+        return images
+
+    def perform_batch_inference(self, batch):
+        """
+        Like perform_inference() for the output of preprocess_batch(); sets one
+        entry of self._original_predictions per image.
+        """
+        raise NotImplementedError()
+
     def _create_object_prediction_list_from_original_predictions(
         self,
         shift_amount_list: Optional[List[List[int]]] = [[0, 0]],
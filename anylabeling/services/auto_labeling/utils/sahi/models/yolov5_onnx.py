@@ -35,6 +35,31 @@ class Yolov5ONNX(object):
         bboxes, scores, class_ids = self.postprocess(outputs, img_size)
         return bboxes, scores, class_ids
 
+    def preprocess_batch(self, images):
+        """
+        Pre-process several images into one blob stacked along the batch axis.
+        """
+        _, _, input_height, input_width = self.net.get_input_shape()
+        blob = np.empty(
+            (len(images), 3, input_height, input_width), dtype=np.float32
+        )
+        for i, image in enumerate(images):
+            resized = cv2.resize(image, (input_width, input_height))
+            blob[i] = resized.transpose(2, 0, 1)
+        blob *= 1 / 255.0
+        return blob, [image.shape[:2] for image in images]
+
+    def inference_batch(self, blob, img_sizes):
+        """
+        Run the output of preprocess_batch() and return a list with the
+        (bboxes, scores, class_ids) of every image.
+        """
+        outputs = self.net.get_ort_batch_inference(blob)[0]
+        return [
+            self.postprocess(outputs[i : i + 1], img_size)
+            for i, img_size in enumerate(img_sizes)
+        ]
+
     def preprocess(self, input_image):
         """
         Pre-process the input image before feeding it to the network.
@@ -123,6 +148,10 @@ class Yolov5ONNX(object):
 
 
 class Yolov5OnnxDetectionModel(DetectionModel):
+    supports_batch_inference = True
+    # Number of slices inferred together by get_sliced_prediction
+    batch_size = 8
+
     def check_dependencies(self) -> None:
         check_requirements(["onnxruntime"])
 
@@ -164,6 +193,22 @@ class Yolov5OnnxDetectionModel(DetectionModel):
 
         self._original_predictions = [prediction_result]
 
+    def preprocess_batch(self, images: List[np.ndarray]):
+        return self.model.preprocess_batch(images)
+
+    def perform_batch_inference(self, batch):
+        """
+        Prediction is performed on the output of preprocess_batch() and one result per
+        image is set to self._original_predictions.
+        """
+        assert (
+            self.model is not None
+        ), "Model is not loaded, load it by calling .load_model()"
+        blob, img_sizes = batch
+        self._original_predictions = self.model.inference_batch(
+            blob, img_sizes
+        )
+
     @property
     def num_categories(self):
         return self.category_name_list_len
@@ -22,80 +22,175 @@ from anylabeling.services.auto_labeling.utils.sahi.utils.import_utils import (
 logger = logging.getLogger(__name__)
 
 
-def batched_nms(predictions, match_metric="IOU", match_threshold=0.5):
-    scores = predictions[:, 4].squeeze()
-    category_ids = predictions[:, 5].squeeze()
-    keep_mask = np.zeros_like(category_ids, dtype=bool)
-    unique_categories = np.unique(category_ids)
-
-    for category_id in unique_categories:
-        curr_indices = np.where(category_ids == category_id)[0]
-        curr_keep_indices = nms(
-            predictions[curr_indices], match_metric, match_threshold
-        )
-        keep_mask[curr_indices[curr_keep_indices]] = True
+# Upper bound of candidate box pairs evaluated at once by `match_pairs`
+PAIR_BLOCK_SIZE = 1 << 20
 
-    keep_indices = np.where(keep_mask)[0]
-    sorted_indices = np.argsort(scores[keep_indices])[::-1]
-    keep_indices = keep_indices[sorted_indices].tolist()
-
-    return keep_indices
 
+def match_metric_values(
+    predictions, inds1, inds2, match_metric="IOU", areas=None
+):
+    """IoU/IoS of the box pairs (inds1[k], inds2[k]) of an N x 6 table.
 
-def nms(predictions, match_metric="IOU", match_threshold=0.5):
+    The boxes of `inds1` are the selected (higher scoring) ones.
+    """
     x1 = predictions[:, 0]
     y1 = predictions[:, 1]
     x2 = predictions[:, 2]
     y2 = predictions[:, 3]
-    scores = predictions[:, 4]
+    if areas is None:
+        areas = (x2 - x1) * (y2 - y1)
 
-    areas = (x2 - x1) * (y2 - y1)
-    order = np.argsort(scores)
+    w = np.minimum(x2[inds1], x2[inds2]) - np.maximum(x1[inds1], x1[inds2])
+    h = np.minimum(y2[inds1], y2[inds2]) - np.maximum(y1[inds1], y1[inds2])
+    inter = np.maximum(w, 0.0) * np.maximum(h, 0.0)
 
-    keep = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if match_metric == "IOU":
+            union = (areas[inds2] - inter) + areas[inds1]
+            return inter / union
+        elif match_metric == "IOS":
+            smaller = np.minimum(areas[inds2], areas[inds1])
+            return inter / smaller
+    raise ValueError()
 
-    while len(order) > 0:
-        idx = order[-1]
-        keep.append(idx)
 
-        order = order[:-1]
+def match_pairs(predictions, ranks, match_metric="IOU", match_threshold=0.5):
+    """Find all box pairs whose IoU/IoS reaches `match_threshold`.
 
-        if len(order) == 0:
-            break
+    Candidate pairs are the boxes overlapping along x, found by sweeping
+    the boxes sorted by their left edge, and are evaluated in blocks of at
+    most `PAIR_BLOCK_SIZE` pairs, so the cost follows the number of
+    overlaps instead of growing quadratically with the detections.
 
-        xx1 = x1[order]
-        xx2 = x2[order]
-        yy1 = y1[order]
-        yy2 = y2[order]
+    Args:
+        predictions (np.ndarray): N x [x1, y1, x2, y2, score, category_id]
+        ranks (np.ndarray): Position of every box in the score order.
 
-        xx1 = np.maximum(xx1, x1[idx])
-        yy1 = np.maximum(yy1, y1[idx])
-        xx2 = np.minimum(xx2, x2[idx])
-        yy2 = np.minimum(yy2, y2[idx])
+    Returns:
+        (inds1, inds2) arrays where inds1 is the better ranked box.
+    """
+    num_predictions = len(predictions)
+    x1 = predictions[:, 0]
+    x2 = predictions[:, 2]
+    areas = (x2 - x1) * (predictions[:, 3] - predictions[:, 1])
+
+    by_x1 = np.argsort(x1, kind="stable")
+    sorted_x1 = x1[by_x1]
+    if match_threshold > 0:
+        ends = np.searchsorted(sorted_x1, x2[by_x1], side="right")
+    else:
+        # boxes without any overlap still match
+        ends = np.full(num_predictions, num_predictions)
+    counts = np.maximum(ends - np.arange(num_predictions) - 1, 0)
+    cum_counts = np.cumsum(counts)
+
+    inds1_list, inds2_list = [], []
+    start = 0
+    while start < num_predictions:
+        offset = cum_counts[start - 1] if start > 0 else 0
+        stop = int(
+            np.searchsorted(cum_counts, offset + PAIR_BLOCK_SIZE, "right")
+        )
+        stop = min(max(stop, start + 1), num_predictions)
+        block_counts = counts[start:stop]
+        total = int(block_counts.sum())
+        if total > 0:
+            rows = np.repeat(np.arange(start, stop), block_counts)
+            steps = np.arange(total) - np.repeat(
+                np.cumsum(block_counts) - block_counts, block_counts
+            )
+            first = by_x1[rows]
+            second = by_x1[rows + 1 + steps]
+            swap = ranks[second] < ranks[first]
+            inds1 = np.where(swap, second, first)
+            inds2 = np.where(swap, first, second)
+            values = match_metric_values(
+                predictions, inds1, inds2, match_metric, areas
+            )
+            matched = ~(values < match_threshold)
+            inds1_list.append(inds1[matched])
+            inds2_list.append(inds2[matched])
+        start = stop
+
+    if not inds1_list:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(inds1_list), np.concatenate(inds2_list)
+
+
+def _score_order(predictions):
+    """Box indices by descending score, and the rank of every box."""
+    order = np.argsort(-predictions[:, 4], kind="stable")
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return order, ranks
+
+
+def _neighbors(sources, targets, sort_keys, num_predictions):
+    """Group the `targets` of `sources` by source, sorted by `sort_keys`."""
+    order = np.lexsort((sort_keys, sources))
+    targets = targets[order]
+    indptr = np.zeros(num_predictions + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_predictions), out=indptr[1:])
+    return targets, indptr
+
+
+def _greedy_groups(predictions, match_metric, match_threshold):
+    """Greedy suppression shared by `nms` and `greedy_nmm`.
+
+    Each box that is not suppressed yet is kept, and suppresses the
+    remaining lower scored boxes that match it. Returns a keep index to
+    merge index list mapping, with the merge lists in ascending score.
+    """
+    num_predictions = len(predictions)
+    order, ranks = _score_order(predictions)
+    inds1, inds2 = match_pairs(
+        predictions, ranks, match_metric, match_threshold
+    )
+    targets, indptr = _neighbors(inds1, inds2, -ranks[inds2], num_predictions)
 
-        w = xx2 - xx1
-        h = yy2 - yy1
+    keep_to_merge_list = {}
+    suppressed = np.zeros(num_predictions, dtype=bool)
+    for idx in order.tolist():
+        if suppressed[idx]:
+            continue
+        begin, end = indptr[idx], indptr[idx + 1]
+        if begin == end:
+            keep_to_merge_list[idx] = []
+            continue
+        merge_inds = targets[begin:end]
+        merge_inds = merge_inds[~suppressed[merge_inds]]
+        suppressed[merge_inds] = True
+        keep_to_merge_list[idx] = merge_inds.tolist()
+    return keep_to_merge_list
 
-        w = np.maximum(w, 0.0)
-        h = np.maximum(h, 0.0)
 
-        inter = w * h
+def batched_nms(predictions, match_metric="IOU", match_threshold=0.5):
+    scores = predictions[:, 4].squeeze()
+    category_ids = predictions[:, 5].squeeze()
+    keep_mask = np.zeros_like(category_ids, dtype=bool)
+    unique_categories = np.unique(category_ids)
 
-        rem_areas = areas[order]
+    for category_id in unique_categories:
+        curr_indices = np.where(category_ids == category_id)[0]
+        curr_keep_indices = nms(
+            predictions[curr_indices], match_metric, match_threshold
+        )
+        keep_mask[curr_indices[curr_keep_indices]] = True
 
-        if match_metric == "IOU":
-            union = (rem_areas - inter) + areas[idx]
-            match_metric_value = inter / union
-        elif match_metric == "IOS":
-            smaller = np.minimum(rem_areas, areas[idx])
-            match_metric_value = inter / smaller
-        else:
-            raise ValueError()
+    keep_indices = np.where(keep_mask)[0]
+    sorted_indices = np.argsort(scores[keep_indices])[::-1]
+    keep_indices = keep_indices[sorted_indices].tolist()
+
+    return keep_indices
 
-        mask = match_metric_value < match_threshold
-        order = order[mask]
 
-    return keep
+def nms(predictions, match_metric="IOU", match_threshold=0.5):
+    """Indices of the boxes kept by greedy non-maximum suppression, by
+    descending score."""
+    return list(
+        _greedy_groups(predictions, match_metric, match_threshold).keys()
+    )
 
 
 def batched_greedy_nmm(
@@ -128,93 +223,11 @@ def batched_greedy_nmm(
 def greedy_nmm(
     object_predictions_as_tensor, match_metric="IOU", match_threshold=0.5
 ):
-    keep_to_merge_list = {}
-
-    # Extract coordinates for every prediction box present in P
-    x1 = object_predictions_as_tensor[:, 0]
-    y1 = object_predictions_as_tensor[:, 1]
-    x2 = object_predictions_as_tensor[:, 2]
-    y2 = object_predictions_as_tensor[:, 3]
-    scores = object_predictions_as_tensor[:, 4]
-
-    # Calculate area of every block in P
-    areas = (x2 - x1) * (y2 - y1)
-
-    # Sort the prediction boxes in P according to their confidence scores
-    order = np.argsort(scores)
-
-    # Initialise an empty list for filtered prediction boxes
-    keep = []
-
-    while len(order) > 0:
-        # Extract the index of the prediction with the highest score (prediction S)
-        idx = order[-1]
-
-        # Push S in the filtered predictions list
-        keep.append(idx)
-
-        # Remove S from P
-        order = order[:-1]
-
-        # Sanity check
-        if len(order) == 0:
-            keep_to_merge_list[idx] = []
-            break
-
-        # Select coordinates of BBoxes according to the indices in order
-        xx1 = x1[order]
-        xx2 = x2[order]
-        yy1 = y1[order]
-        yy2 = y2[order]
-
-        # Find the coordinates of the intersection boxes
-        xx1 = np.maximum(xx1, x1[idx])
-        yy1 = np.maximum(yy1, y1[idx])
-        xx2 = np.minimum(xx2, x2[idx])
-        yy2 = np.minimum(yy2, y2[idx])
-
-        # Find height and width of the intersection boxes
-        w = xx2 - xx1
-        h = yy2 - yy1
-
-        # Take max with 0.0 to avoid negative w and h due to non-overlapping boxes
-        w = np.maximum(w, 0.0)
-        h = np.maximum(h, 0.0)
-
-        # Find the intersection area
-        inter = w * h
-
-        # Find the areas of BBoxes according to the indices in order
-        rem_areas = areas[order]
-
-        if match_metric == "IOU":
-            # Find the union of every prediction T in P with the prediction S
-            # Note that areas[idx] represents the area of S
-            union = (rem_areas - inter) + areas[idx]
-            # Find the IoU of every prediction in P with S
-            match_metric_value = inter / union
-
-        elif match_metric == "IOS":
-            # Find the smaller area of every prediction T in P with the prediction S
-            # Note that areas[idx] represents the area of S
-            smaller = np.minimum(rem_areas, areas[idx])
-            # Find the IoS of every prediction in P with S
-            match_metric_value = inter / smaller
-        else:
-            raise ValueError()
-
-        # Keep the boxes with IoU/IoS less than thresh_iou
-        mask = match_metric_value < match_threshold
-        matched_box_indices = order[np.where(mask == False)[0]]  # noqa: E712
-        unmatched_indices = order[np.where(mask == True)[0]]  # noqa: E712
-
-        # Update box pool
-        order = unmatched_indices[np.argsort(scores[unmatched_indices])]
-
-        # Create keep_ind to merge_ind_list mapping
-        keep_to_merge_list[idx] = matched_box_indices.tolist()
-
-    return keep_to_merge_list
+    """Map every box kept by greedy non-maximum merging to the boxes it
+    absorbs, in ascending score order."""
+    return _greedy_groups(
+        object_predictions_as_tensor, match_metric, match_threshold
+    )
 
 
 def batched_nmm(
@@ -245,87 +258,37 @@ def batched_nmm(
 
 
 def nmm(object_predictions_as_tensor, match_metric="IOU", match_threshold=0.5):
+    """Non-maximum merging where boxes matching an already merged box join
+    the group of its keep box as well."""
+    num_predictions = len(object_predictions_as_tensor)
+    order, ranks = _score_order(object_predictions_as_tensor)
+    inds1, inds2 = match_pairs(
+        object_predictions_as_tensor, ranks, match_metric, match_threshold
+    )
+    # every box sees all its matches, best scored first
+    sources = np.concatenate([inds1, inds2])
+    targets = np.concatenate([inds2, inds1])
+    targets, indptr = _neighbors(
+        sources, targets, ranks[targets], num_predictions
+    )
+    targets = targets.tolist()
+    indptr = indptr.tolist()
+
     keep_to_merge_list = {}
     merge_to_keep = {}
-
-    # Extract coordinates for every prediction box present in P
-    x1 = object_predictions_as_tensor[:, 0]
-    y1 = object_predictions_as_tensor[:, 1]
-    x2 = object_predictions_as_tensor[:, 2]
-    y2 = object_predictions_as_tensor[:, 3]
-    scores = object_predictions_as_tensor[:, 4]
-
-    # Calculate area of every block in P
-    areas = (x2 - x1) * (y2 - y1)
-
-    # Sort the prediction boxes in P according to their confidence scores
-    order = np.argsort(scores)[::-1]
-
-    for ind in range(len(object_predictions_as_tensor)):
-        # Extract the index of the prediction with the highest score (prediction S)
-        pred_ind = order[ind]
-
-        # Remove selected pred
-        other_pred_inds = order[order != pred_ind]
-
-        # Select coordinates of BBoxes according to the indices in order
-        xx1 = x1[other_pred_inds]
-        xx2 = x2[other_pred_inds]
-        yy1 = y1[other_pred_inds]
-        yy2 = y2[other_pred_inds]
-
-        # Find the coordinates of the intersection boxes
-        xx1 = np.maximum(xx1, x1[pred_ind])
-        yy1 = np.maximum(yy1, y1[pred_ind])
-        xx2 = np.minimum(xx2, x2[pred_ind])
-        yy2 = np.minimum(yy2, y2[pred_ind])
-
-        # Find height and width of the intersection boxes
-        w = xx2 - xx1
-        h = yy2 - yy1
-
-        # Take max with 0.0 to avoid negative w and h due to non-overlapping boxes
-        w = np.maximum(w, 0.0)
-        h = np.maximum(h, 0.0)
-
-        # Find the intersection area
-        inter = w * h
-
-        # Find the areas of BBoxes according to the indices in order
-        rem_areas = areas[other_pred_inds]
-
-        if match_metric == "IOU":
-            # Find the union of every prediction T in P with the prediction S
-            # Note that areas[idx] represents the area of S
-            union = (rem_areas - inter) + areas[pred_ind]
-            # Find the IoU of every prediction in P with S
-            match_metric_value = inter / union
-
-        elif match_metric == "IOS":
-            # Find the smaller area of every prediction T in P with the prediction S
-            # Note that areas[idx] represents the area of S
-            smaller = np.minimum(rem_areas, areas[pred_ind])
-            # Find the IoS of every prediction in P with S
-            match_metric_value = inter / smaller
-        else:
-            raise ValueError()
-
-        # Keep the boxes with IoU/IoS less than thresh_iou
-        mask = match_metric_value < match_threshold
-        matched_box_indices = other_pred_inds[~mask]
-
-        # Create keep_ind to merge_ind_list mapping
+    for pred_ind in order.tolist():
+        matched_box_indices = targets[indptr[pred_ind] : indptr[pred_ind + 1]]
         if pred_ind not in merge_to_keep:
             keep_to_merge_list[pred_ind] = []
 
-            for matched_box_ind in matched_box_indices.tolist():
+            for matched_box_ind in matched_box_indices:
                 if matched_box_ind not in merge_to_keep:
                     keep_to_merge_list[pred_ind].append(matched_box_ind)
                     merge_to_keep[matched_box_ind] = pred_ind
 
         else:
             keep = merge_to_keep[pred_ind]
-            for matched_box_ind in matched_box_indices.tolist():
+            for matched_box_ind in matched_box_indices:
                 if (
                     matched_box_ind not in keep_to_merge_list
                     and matched_box_ind not in merge_to_keep
@@ -352,6 +315,24 @@ class PostprocessPredictions:
     def __call__(self):
         raise NotImplementedError()
 
+    def merge(self, object_predictions, keep_to_merge_list):
+        """Merge every kept prediction with the matching ones of its list."""
+        selected_object_predictions = []
+        for keep_ind, merge_ind_list in keep_to_merge_list.items():
+            keep_prediction = object_predictions[keep_ind]
+            for merge_ind in merge_ind_list:
+                if has_match(
+                    keep_prediction,
+                    object_predictions[merge_ind],
+                    self.match_metric,
+                    self.match_threshold,
+                ):
+                    keep_prediction = merge_object_prediction_pair(
+                        keep_prediction, object_predictions[merge_ind]
+                    )
+            selected_object_predictions.append(keep_prediction)
+        return selected_object_predictions
+
 
 class NMSPostprocess(PostprocessPredictions):
     def __call__(
@@ -359,25 +340,21 @@ class NMSPostprocess(PostprocessPredictions):
         object_predictions: List[ObjectPrediction],
     ):
         object_prediction_list = ObjectPredictionList(object_predictions)
-        object_predictions_as_torch = object_prediction_list.totensor()
+        object_predictions_as_numpy = object_prediction_list.tonumpy()
         if self.class_agnostic:
             keep = nms(
-                object_predictions_as_torch,
+                object_predictions_as_numpy,
                 match_threshold=self.match_threshold,
                 match_metric=self.match_metric,
             )
         else:
             keep = batched_nms(
-                object_predictions_as_torch,
+                object_predictions_as_numpy,
                 match_threshold=self.match_threshold,
                 match_metric=self.match_metric,
             )
 
-        selected_object_predictions = object_prediction_list[keep].tolist()
-        if not isinstance(selected_object_predictions, list):
-            selected_object_predictions = [selected_object_predictions]
-
-        return selected_object_predictions
+        return [object_predictions[ind] for ind in keep]
 
 
 class NMMPostprocess(PostprocessPredictions):
@@ -386,40 +363,21 @@ class NMMPostprocess(PostprocessPredictions):
         object_predictions: List[ObjectPrediction],
     ):
         object_prediction_list = ObjectPredictionList(object_predictions)
-        object_predictions_as_torch = object_prediction_list.totensor()
+        object_predictions_as_numpy = object_prediction_list.tonumpy()
         if self.class_agnostic:
             keep_to_merge_list = nmm(
-                object_predictions_as_torch,
+                object_predictions_as_numpy,
                 match_threshold=self.match_threshold,
                 match_metric=self.match_metric,
             )
         else:
             keep_to_merge_list = batched_nmm(
-                object_predictions_as_torch,
+                object_predictions_as_numpy,
                 match_threshold=self.match_threshold,
                 match_metric=self.match_metric,
             )
 
-        selected_object_predictions = []
-        for keep_ind, merge_ind_list in keep_to_merge_list.items():
-            for merge_ind in merge_ind_list:
-                if has_match(
-                    object_prediction_list[keep_ind].tolist(),
-                    object_prediction_list[merge_ind].tolist(),
-                    self.match_metric,
-                    self.match_threshold,
-                ):
-                    object_prediction_list[
-                        keep_ind
-                    ] = merge_object_prediction_pair(
-                        object_prediction_list[keep_ind].tolist(),
-                        object_prediction_list[merge_ind].tolist(),
-                    )
-            selected_object_predictions.append(
-                object_prediction_list[keep_ind].tolist()
-            )
-
-        return selected_object_predictions
+        return self.merge(object_predictions, keep_to_merge_list)
 
 
 class GreedyNMMPostprocess(PostprocessPredictions):
@@ -442,26 +400,7 @@ class GreedyNMMPostprocess(PostprocessPredictions):
                 match_metric=self.match_metric,
             )
 
-        selected_object_predictions = []
-        for keep_ind, merge_ind_list in keep_to_merge_list.items():
-            for merge_ind in merge_ind_list:
-                if has_match(
-                    object_prediction_list[keep_ind].tolist(),
-                    object_prediction_list[merge_ind].tolist(),
-                    self.match_metric,
-                    self.match_threshold,
-                ):
-                    object_prediction_list[
-                        keep_ind
-                    ] = merge_object_prediction_pair(
-                        object_prediction_list[keep_ind].tolist(),
-                        object_prediction_list[merge_ind].tolist(),
-                    )
-            selected_object_predictions.append(
-                object_prediction_list[keep_ind].tolist()
-            )
-
-        return selected_object_predictions
+        return self.merge(object_predictions, keep_to_merge_list)
 
 
 class LSNMSPostprocess(PostprocessPredictions):
@@ -97,15 +97,18 @@ def object_prediction_list_to_numpy(
     Returns:
         np.ndarray of size N x [x1, y1, x2, y2, score, category_id]
     """
-    num_predictions = len(object_prediction_list)
-    numpy_predictions = np.zeros([num_predictions, 6], dtype=np.float32)
-    for ind, object_prediction in enumerate(object_prediction_list):
-        numpy_predictions[ind, :4] = np.array(
-            object_prediction.tolist().bbox.to_xyxy(), dtype=np.float32
-        )
-        numpy_predictions[ind, 4] = object_prediction.tolist().score.value
-        numpy_predictions[ind, 5] = object_prediction.tolist().category.id
-    return numpy_predictions
+    numpy_predictions = np.array(
+        [
+            [
+                *object_prediction.bbox.to_xyxy(),
+                object_prediction.score.value,
+                object_prediction.category.id,
+            ]
+            for object_prediction in object_prediction_list.list
+        ],
+        dtype=np.float32,
+    )
+    return numpy_predictions.reshape(-1, 6)
 
 
 def calculate_box_union(
@@ -4,6 +4,7 @@
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from functools import cmp_to_key
@@ -28,7 +29,10 @@ from anylabeling.services.auto_labeling.utils.sahi.prediction import (
     ObjectPrediction,
     PredictionResult,
 )
-from anylabeling.services.auto_labeling.utils.sahi.slicing import slice_image
+from anylabeling.services.auto_labeling.utils.sahi.slicing import (
+    get_slice_bboxes,
+    iter_image_slices,
+)
 from anylabeling.services.auto_labeling.utils.sahi.utils.coco import (
     Coco,
     CocoImage,
@@ -138,6 +142,76 @@ def get_prediction(
     )
 
 
+def iter_slice_predictions(
+    image_arr: np.ndarray,
+    slice_bboxes: List[List[int]],
+    detection_model,
+    num_batch: int = None,
+):
+    """
+    Yields the object predictions of each slice of an image, in order.
+
+    Models that support batch inference get `num_batch` slices per call,
+    and the next batch is preprocessed in a worker thread while the
+    current one is inferred. Other models predict one slice at a time.
+
+    Arguments:
+        image_arr: np.ndarray
+            Full image the slices are cut from
+        slice_bboxes: List
+            Slice windows as [xmin, ymin, xmax, ymax]
+        detection_model: model.DetectionModel
+        num_batch: int
+            Slices per batch, defaults to the ``batch_size`` of the model
+
+    Yields:
+        A list of ObjectPrediction per slice, not yet shifted to the
+        full image
+    """
+    full_shape = list(image_arr.shape[:2])
+    if not detection_model.supports_batch_inference:
+        for image_slice, starting_pixel in iter_image_slices(
+            image_arr, slice_bboxes
+        ):
+            prediction_result = get_prediction(
+                image=image_slice,
+                detection_model=detection_model,
+                shift_amount=starting_pixel,
+                full_shape=full_shape,
+            )
+            yield prediction_result.object_prediction_list
+        return
+
+    if num_batch is None:
+        num_batch = detection_model.batch_size
+    batches = [
+        slice_bboxes[i : i + num_batch]
+        for i in range(0, len(slice_bboxes), num_batch)
+    ]
+
+    def preprocess_batch(bboxes):
+        images = [view for view, _ in iter_image_slices(image_arr, bboxes)]
+        return detection_model.preprocess_batch(images)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        if batches:
+            pending = executor.submit(preprocess_batch, batches[0])
+        for batch_ind, bboxes in enumerate(batches):
+            batch = pending.result()
+            # preprocess the next batch while this one is inferred
+            if batch_ind + 1 < len(batches):
+                pending = executor.submit(
+                    preprocess_batch, batches[batch_ind + 1]
+                )
+            detection_model.perform_batch_inference(batch)
+            detection_model.convert_original_predictions(
+                shift_amount=[bbox[:2] for bbox in bboxes],
+                full_shape=[full_shape] * len(bboxes),
+            )
+            yield from detection_model.object_prediction_list_per_image
+
+
 def get_sliced_prediction(
     image,
     detection_model=None,
@@ -153,6 +227,7 @@ def get_sliced_prediction(
     verbose: int = 1,
     merge_buffer_length: int = None,
     auto_slice_resolution: bool = True,
+    num_batch: int = None,
 ) -> PredictionResult:
     """
     Function for slice image + get predicion for each slice + combine predictions in full image.
@@ -198,6 +273,10 @@ def get_sliced_prediction(
         auto_slice_resolution: bool
             if slice parameters (slice_height, slice_width) are not given,
             it enables automatically calculate these params from image resolution and orientation.
+        num_batch: int
+            Number of slices inferred together by models that support batch inference.
+            Defaults to the ``batch_size`` of the model. The next batch is preprocessed
+            while the current one is inferred.
 
     Returns:
         A Dict with fields:
@@ -208,20 +287,23 @@ def get_sliced_prediction(
     # for profiling
     durations_in_seconds = dict()
 
-    # currently only 1 batch supported
-    num_batch = 1
-
-    # create slices from full image
+    # create slice windows, the slices are views of the full image
     time_start = time.time()
-    slice_image_result = slice_image(
-        image=image,
+    if isinstance(image, np.ndarray):
+        image_arr = image
+    else:
+        image_arr = np.asarray(read_image_as_pil(image))
+    image_height, image_width = image_arr.shape[:2]
+    slice_bboxes = get_slice_bboxes(
+        image_height=image_height,
+        image_width=image_width,
         slice_height=slice_height,
         slice_width=slice_width,
         overlap_height_ratio=overlap_height_ratio,
         overlap_width_ratio=overlap_width_ratio,
         auto_slice_resolution=auto_slice_resolution,
     )
-    num_slices = len(slice_image_result)
+    num_slices = len(slice_bboxes)
     time_end = time.time() - time_start
     durations_in_seconds["slice"] = time_end
 
@@ -242,42 +324,20 @@ def get_sliced_prediction(
         class_agnostic=postprocess_class_agnostic,
     )
 
-    # create prediction input
-    num_group = int(num_slices / num_batch)
     if verbose == 1 or verbose == 2:
         tqdm.write(f"Performing prediction on {num_slices} number of slices.")
     object_prediction_list = []
+
     # perform sliced prediction
-    for group_ind in range(num_group):
-        # prepare batch (currently supports only 1 batch)
-        image_list = []
-        shift_amount_list = []
-        for image_ind in range(num_batch):
-            image_list.append(
-                slice_image_result.images[group_ind * num_batch + image_ind]
-            )
-            shift_amount_list.append(
-                slice_image_result.starting_pixels[
-                    group_ind * num_batch + image_ind
-                ]
-            )
-        # perform batch prediction
-        prediction_result = get_prediction(
-            image=image_list[0],
-            detection_model=detection_model,
-            shift_amount=shift_amount_list[0],
-            full_shape=[
-                slice_image_result.original_image_height,
-                slice_image_result.original_image_width,
-            ],
-        )
+    for predictions in iter_slice_predictions(
+        image_arr, slice_bboxes, detection_model, num_batch
+    ):
         # convert sliced predictions to full predictions
-        for object_prediction in prediction_result.object_prediction_list:
+        for object_prediction in predictions:
             if object_prediction:  # if not empty
                 object_prediction_list.append(
                     object_prediction.get_shifted_object_prediction()
                 )
-
         # merge matching predictions during sliced prediction
         if (
             merge_buffer_length is not None
@@ -288,7 +348,7 @@ def get_sliced_prediction(
     # perform standard prediction
     if num_slices > 1 and perform_standard_pred:
         prediction_result = get_prediction(
-            image=image,
+            image=image_arr,
             detection_model=detection_model,
             shift_amount=[0, 0],
             full_shape=None,
@@ -112,6 +112,18 @@ def get_slice_bboxes(
     return slice_bboxes
 
 
+def iter_image_slices(image: np.ndarray, slice_bboxes: List[List[int]]):
+    """Yields (slice, starting_pixel) for each slice bbox, where the slice is a
+    view of `image`, so no pixels are copied.
+
+    Args:
+        image (np.ndarray): Image of shape [height, width, channels].
+        slice_bboxes (List[List[int]]): Slices as returned by get_slice_bboxes.
+    """
+    for tlx, tly, brx, bry in slice_bboxes:
+        yield image[tly:bry, tlx:brx], [tlx, tly]
+
+
 def annotation_inside_slice(annotation: Dict, slice_bbox: List[int]) -> bool:
     """Check whether annotation coordinates lie inside slice coordinates.
 
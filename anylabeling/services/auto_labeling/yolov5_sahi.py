@@ -63,6 +63,8 @@ class YOLOv5_SAHI(Model):
         self.slice_width = self.config["slice_width"]
         self.overlap_height_ratio = self.config["overlap_height_ratio"]
         self.overlap_width_ratio = self.config["overlap_width_ratio"]
+        self.net.batch_size = self.config.get("batch_size", 8)
+        self.merge_buffer_length = self.config.get("merge_buffer_length")
 
     def predict_shapes(self, image, image_path=None):
         """
@@ -86,6 +88,7 @@ class YOLOv5_SAHI(Model):
             slice_width=self.slice_width,
             overlap_height_ratio=self.overlap_height_ratio,
             overlap_width_ratio=self.overlap_width_ratio,
+            merge_buffer_length=self.merge_buffer_length,
             verbose=0,
         )
         shapes = []
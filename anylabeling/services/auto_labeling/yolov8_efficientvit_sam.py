@@ -16,6 +16,7 @@ from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
 from .types import AutoLabelingResult
 from .__base__.yolo import YOLO
 from .engines.build_onnx_engine import OnnxBaseModel
+from .engines.ort_session import create_session
 
 
 class SamEncoder:
@@ -35,7 +36,7 @@ class SamEncoder:
         # TODO: Add back when TensorRT backend is stable
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
-        self.session = ort.InferenceSession(model_path, providers=providers)
+        self.session = create_session(model_path, providers=providers)
 
         self.input_name = self.session.get_inputs()[0].name
         self.input_shape = self.session.get_inputs()[0].shape
@@ -85,7 +86,7 @@ class SamDecoder:
         providers = [p for p in providers if p != "TensorrtExecutionProvider"]
 
         self.target_size = target_size
-        self.session = ort.InferenceSession(model_path, providers=providers)
+        self.session = create_session(model_path, providers=providers)
 
     @staticmethod
     def get_preprocess_shape(
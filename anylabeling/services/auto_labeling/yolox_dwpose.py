@@ -1,7 +1,6 @@
 import os
 import cv2
 import numpy as np
-import onnxruntime as ort
 from PyQt5 import QtCore
 from PyQt5.QtCore import QCoreApplication
 
@@ -10,6 +9,7 @@ from anylabeling.views.labeling.shape import Shape
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.opencv import qt_img_to_rgb_cv_img
 from .model import Model
+from .engines.ort_session import create_session
 from .types import AutoLabelingResult
 from .pose.dwpose_onnx import inference_pose
 
@@ -66,10 +66,6 @@ class YOLOX_DWPose(Model):
                 )
             )
 
-        sess_opts = ort.SessionOptions()
-        if "OMP_NUM_THREADS" in os.environ:
-            sess_opts.inter_op_num_threads = int(os.environ["OMP_NUM_THREADS"])
-
         if __preferred_device__ == "GPU":
             ox_providers = ["CUDAExecutionProvider"]
             backend = cv2.dnn.DNN_BACKEND_CUDA
@@ -79,10 +75,8 @@ class YOLOX_DWPose(Model):
             backend = cv2.dnn.DNN_BACKEND_OPENCV
             cv_providers = cv2.dnn.DNN_TARGET_CPU
 
-        self.det_net = ort.InferenceSession(
-            det_model_abs_path,
-            providers=ox_providers,
-            sess_options=sess_opts,
+        self.det_net = create_session(
+            det_model_abs_path, providers=ox_providers
         )
         self.pose_net = cv2.dnn.readNetFromONNX(pose_model_abs_path)
         self.pose_net.setPreferableBackend(backend)
@@ -16,6 +16,7 @@ from datetime import date
 from itertools import chain
 
 from anylabeling.app_info import __version__
+from anylabeling.views.labeling.label_index import get_label_index
 from anylabeling.views.labeling.logger import logger
 from anylabeling.views.labeling.utils.shape import rectangle_from_diagonal
 from anylabeling.views.labeling.utils.general import is_possible_rectangle
@@ -38,6 +39,17 @@ class LabelConverter:
                 self.classes = list(self.pose_classes.keys())
             logger.info(f"Loading pose classes: {self.pose_classes}")
 
+    @staticmethod
+    def load_label_data(label_file):
+        """Read a label file through the shared label index.
+
+        ``imageData`` is not included in the result.
+        """
+        data = get_label_index().load(label_file)
+        if data is None:
+            raise FileNotFoundError(label_file)
+        return data
+
     def reset(self):
         self.custom_data = dict(
             version=__version__,
@@ -885,8 +897,7 @@ class LabelConverter:
     ):
         is_empty_file = True
         if osp.exists(input_file):
-            with open(input_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(input_file)
         else:
             if not skip_empty_files:
                 pathlib.Path(output_file).touch()
@@ -1063,8 +1074,7 @@ class LabelConverter:
         image = cv2.imread(image_file)
         image_height, image_width, image_depth = image.shape
         if osp.exists(input_file):
-            with open(input_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(input_file)
             shapes = data["shapes"]
         else:
             if not skip_empty_files:
@@ -1169,8 +1179,7 @@ class LabelConverter:
             if not osp.exists(label_file):
                 continue
             image_id += 1
-            with open(label_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(label_file)
             coco_data["images"].append(
                 {
                     "id": image_id,
@@ -1314,8 +1323,7 @@ class LabelConverter:
             json.dump(coco_data, f, indent=4, ensure_ascii=False)
 
     def custom_to_dota(self, input_file, output_file):
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self.load_label_data(input_file)
         w, h = data["imageWidth"], data["imageHeight"]
         with open(output_file, "w", encoding="utf-8") as f:
             for shape in data["shapes"]:
@@ -1343,8 +1351,7 @@ class LabelConverter:
                 )
 
     def custom_to_mask(self, input_file, output_file, mapping_table):
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self.load_label_data(input_file)
 
         image_width = data["imageWidth"]
         image_height = data["imageHeight"]
@@ -1439,8 +1446,7 @@ class LabelConverter:
             if not label_file_name.endswith("json"):
                 continue
             label_file = os.path.join(input_path, label_file_name)
-            with open(label_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(label_file)
 
             seg_len += 1
             if im_widht is None:
@@ -1532,8 +1538,7 @@ class LabelConverter:
             if not label_file_name.endswith("json"):
                 continue
             label_file = os.path.join(input_path, label_file_name)
-            with open(label_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(label_file)
 
             seg_len += 1
             if im_widht is None:
@@ -1593,8 +1598,7 @@ class LabelConverter:
             label_file = osp.join(label_path, label_name)
             img = cv2.imdecode(np.fromfile(image_file, dtype=np.uint8), 1)
             height, width = img.shape[:2]
-            with open(label_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.load_label_data(label_file)
             instances = []
             for shape in data["shapes"]:
                 if (
@@ -1634,8 +1638,7 @@ class LabelConverter:
 
         avaliable_shape_types = ["rectangle", "rotation", "polygon"]
         img = cv2.imdecode(np.fromfile(image_file, dtype=np.uint8), 1)
-        with open(label_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self.load_label_data(label_file)
 
         if mode == "rec":
             crop_img_count, rec_gt, annotations = 0, [], []
@@ -15,6 +15,7 @@ from . import utils
 from .shape import Shape
 from .logger import logger
 from .label_converter import LabelConverter
+from .label_index import get_label_index
 
 PIL.Image.MAX_IMAGE_PIXELS = None
 
@@ -33,25 +34,35 @@ class LabelFileError(Exception):
 class LabelFile:
     suffix = ".json"
 
-    def __init__(self, filename=None, image_dir=None):
+    def __init__(self, filename=None, image_dir=None, load_image=True):
         self.shapes = []
         self.image_path = None
         self.image_data = None
         self.image_dir = image_dir
         if filename is not None:
-            self.load(filename)
+            self.load(filename, load_image=load_image)
         self.filename = filename
 
     @staticmethod
     def load_image_file(filename, default=None):
+        frame_data = utils.read_video_frame_data(filename)
+        if frame_data is not None:
+            return frame_data
         try:
+            utils.process_image_exif_once(filename)
             with open(filename, "rb") as f:
                 return f.read()
         except Exception:
             logger.error(f"Failed opening image file: {filename}")
             return default
 
-    def load(self, filename):
+    def load(self, filename, load_image=True):
+        """Load a label file.
+
+        With `load_image` False only the annotations are read: the image
+        is neither read nor checked and `image_data` stays None, which is
+        all exporters and statistics need.
+        """
         keys = [
             "version",
             "imageData",
@@ -85,7 +96,9 @@ class LabelFile:
                         ] = utils.rectangle_from_diagonal(shape_points)
 
             data["imagePath"] = osp.basename(data["imagePath"])
-            if data["imageData"] is not None:
+            if not load_image:
+                image_data = None
+            elif data["imageData"] is not None:
                 image_data = base64.b64decode(data["imageData"])
             else:
                 # relative path from label file to relative path from cwd
@@ -98,11 +111,12 @@ class LabelFile:
                 image_data = self.load_image_file(image_path)
             flags = data.get("flags") or {}
             image_path = data["imagePath"]
-            self._check_image_height_and_width(
-                base64.b64encode(image_data).decode("utf-8"),
-                data.get("imageHeight"),
-                data.get("imageWidth"),
-            )
+            if load_image:
+                self._check_image_height_and_width(
+                    image_data,
+                    data.get("imageHeight"),
+                    data.get("imageWidth"),
+                )
             shapes = [Shape().load_from_dict(s) for s in data["shapes"]]
         except Exception as e:  # noqa
             raise LabelFileError(e) from e
@@ -125,19 +139,20 @@ class LabelFile:
 
     @staticmethod
     def _check_image_height_and_width(image_data, image_height, image_width):
-        img_arr = utils.img_b64_to_arr(image_data)
-        if image_height is not None and img_arr.shape[0] != image_height:
+        # Only the image header is parsed, the pixels are not decoded
+        actual_height, actual_width = utils.get_image_size(image_data)
+        if image_height is not None and actual_height != image_height:
             logger.error(
                 "image_height does not match with image_data or image_path, "
                 "so getting image_height from actual image."
             )
-            image_height = img_arr.shape[0]
-        if image_width is not None and img_arr.shape[1] != image_width:
+            image_height = actual_height
+        if image_width is not None and actual_width != image_width:
             logger.error(
                 "image_width does not match with image_data or image_path, "
                 "so getting image_width from actual image."
             )
-            image_width = img_arr.shape[1]
+            image_width = actual_width
         return image_height, image_width
 
     def save(
@@ -152,10 +167,10 @@ class LabelFile:
         flags=None,
     ):
         if image_data is not None:
-            image_data = base64.b64encode(image_data).decode("utf-8")
             image_height, image_width = self._check_image_height_and_width(
                 image_data, image_height, image_width
             )
+            image_data = base64.b64encode(image_data).decode("utf-8")
 
         if other_data is None:
             other_data = {}
@@ -191,6 +206,7 @@ class LabelFile:
             with io_open(filename, "w") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
             self.filename = filename
+            get_label_index().update(filename, data)
         except Exception as e:  # noqa
             raise LabelFileError(e) from e
 
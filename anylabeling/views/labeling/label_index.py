@@ -0,0 +1,191 @@
+import json
+import os
+import os.path as osp
+import sqlite3
+import threading
+
+from .logger import logger
+
+
+def get_label_index_file():
+    """Return the path of the shared label index database."""
+    home_dir = osp.expanduser("~")
+    return osp.join(home_dir, "xanylabeling_data", "label_index.sqlite")
+
+
+class LabelIndex:
+    """SQLite cache of parsed label files.
+
+    Every label file is stored once as compact JSON without ``imageData``,
+    together with the mtime and size it had when it was parsed. Lookups
+    only ``stat`` the file; it is parsed again only if it changed, so
+    exporters and statistics can read thousands of label files without
+    re-parsing them. Saving through `LabelFile.save` refreshes the entry
+    right away.
+
+    Args:
+        db_file (str, optional): Database path. If it cannot be opened,
+            the index falls back to reading the JSON files directly.
+    """
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or get_label_index_file()
+        self.lock = threading.Lock()
+        self.connection = None
+        try:
+            os.makedirs(osp.dirname(self.db_file), exist_ok=True)
+            self.connection = sqlite3.connect(
+                self.db_file, check_same_thread=False
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS labels ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, "
+                "size INTEGER, data TEXT)"
+            )
+            self.connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Label index disabled: {e}")
+            self.connection = None
+
+    @staticmethod
+    def _key(label_file):
+        return osp.abspath(label_file)
+
+    @staticmethod
+    def _stat(label_file):
+        try:
+            stat = os.stat(label_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _read(label_file):
+        with open(label_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _dumps(data):
+        data = dict(data)
+        data["imageData"] = None
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    def load(self, label_file):
+        """Return the content of a label file, or None if it is missing.
+
+        ``imageData`` is always None in the result.
+        """
+        return self.load_many([label_file]).get(label_file)
+
+    def load_many(self, label_files):
+        """Load several label files at once.
+
+        Returns a dict from label file to content; missing files are left
+        out. Raises the JSON error of a file that cannot be parsed.
+        """
+        stats = {}
+        for label_file in label_files:
+            stat = self._stat(label_file)
+            if stat is not None:
+                stats[label_file] = stat
+        rows = self._select([self._key(f) for f in stats])
+        results, stale = {}, []
+        for label_file, stat in stats.items():
+            row = rows.get(self._key(label_file))
+            if row is not None and row[0] == stat:
+                results[label_file] = json.loads(row[1])
+                continue
+            data = self._read(label_file)
+            data["imageData"] = None
+            results[label_file] = data
+            stale.append((label_file, stat, data))
+        if stale:
+            self._write(
+                [(f, stat, self._dumps(data)) for f, stat, data in stale]
+            )
+        return results
+
+    def update(self, label_file, data=None):
+        """Refresh the entry of a label file that has just been written."""
+        if self.connection is None:
+            return
+        stat = self._stat(label_file)
+        if stat is None:
+            self.remove(label_file)
+            return
+        try:
+            if data is None:
+                data = self._read(label_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not index {label_file}: {e}")
+            return
+        self._write([(label_file, stat, self._dumps(data))])
+
+    def remove(self, label_file):
+        if self.connection is None:
+            return
+        with self.lock:
+            try:
+                self.connection.execute(
+                    "DELETE FROM labels WHERE path = ?",
+                    (self._key(label_file),),
+                )
+                self.connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Label index update failed: {e}")
+
+    def _select(self, keys):
+        rows = {}
+        if self.connection is None or not keys:
+            return rows
+        with self.lock:
+            try:
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i : i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = self.connection.execute(
+                        "SELECT path, mtime_ns, size, data FROM labels "
+                        f"WHERE path IN ({placeholders})",
+                        chunk,
+                    )
+                    for path, mtime_ns, size, data in cursor:
+                        rows[path] = ((mtime_ns, size), data)
+            except sqlite3.Error as e:
+                logger.warning(f"Label index lookup failed: {e}")
+        return rows
+
+    def _write(self, entries):
+        if self.connection is None:
+            return
+        with self.lock:
+            try:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?)",
+                    [
+                        (self._key(f), stat[0], stat[1], data)
+                        for f, stat, data in entries
+                    ],
+                )
+                self.connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Label index update failed: {e}")
+
+    def close(self):
+        if self.connection is not None:
+            with self.lock:
+                self.connection.close()
+                self.connection = None
+
+
+_label_index = None
+_label_index_lock = threading.Lock()
+
+
+def get_label_index():
+    """Return the label index shared by the application."""
+    global _label_index
+    with _label_index_lock:
+        if _label_index is None:
+            _label_index = LabelIndex()
+        return _label_index
@@ -6,10 +6,12 @@ import os
 import os.path as osp
 import shutil
 import pathlib
+import threading
 import cv2
 import re
 import yaml
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 
 import imgviz
@@ -33,6 +35,11 @@ from PyQt5.QtWidgets import (
 )
 
 from anylabeling.services.auto_labeling.types import AutoLabelingMode
+from anylabeling.services.auto_labeling.batch_engine import (
+    BatchLabelingEngine,
+    get_label_file_path,
+)
+from anylabeling.utils import GenericWorker
 
 from ...app_info import (
     __appname__,
@@ -51,6 +58,7 @@ from .widgets import (
     Canvas,
     CrosshairSettingsDialog,
     FileDialogPreview,
+    FileListWidget,
     TextInputDialog,
     ImageCropperDialog,
     LabelDialog,
@@ -78,6 +86,8 @@ class LabelingWidget(LabelDialog):
 
     FIT_WINDOW, FIT_WIDTH, MANUAL_ZOOM = 0, 1, 2
     next_files_changed = QtCore.pyqtSignal(list)
+    batch_labeling_progress = QtCore.pyqtSignal(int, int)
+    image_files_scanned = QtCore.pyqtSignal(int, list, list, bool)
 
     def __init__(  # noqa: C901
         self,
@@ -108,7 +118,17 @@ class LabelingWidget(LabelDialog):
         self.supported_shape = Shape.get_supported_shape()
         self.label_info = {}
         self.image_flags = []
-        self.fn_to_index = {}
+        self.last_file_index = 0
+        self.scan_id = 0
+        self.scan_load = True
+        # File to open once the running folder scan has listed it
+        self.pending_filename = None
+        self.image_scanner = utils.ImageFolderScanner(
+            [
+                f".{fmt.data().decode().lower()}"
+                for fmt in QtGui.QImageReader.supportedImageFormats()
+            ]
+        )
         self.cache_auto_label = None
         self.cache_auto_label_group_id = None
         # see configs/anylabeling_config.yaml for valid configuration
@@ -120,25 +140,29 @@ class LabelingWidget(LabelDialog):
         self.label_loop_count = -1
 
         # set default shape colors
-        Shape.line_color = QtGui.QColor(*self._config["shape"]["line_color"])
-        Shape.fill_color = QtGui.QColor(*self._config["shape"]["fill_color"])
-        Shape.select_line_color = QtGui.QColor(
+        Shape.default_line_color = QtGui.QColor(
+            *self._config["shape"]["line_color"]
+        )
+        Shape.default_fill_color = QtGui.QColor(
+            *self._config["shape"]["fill_color"]
+        )
+        Shape.default_select_line_color = QtGui.QColor(
             *self._config["shape"]["select_line_color"]
         )
-        Shape.select_fill_color = QtGui.QColor(
+        Shape.default_select_fill_color = QtGui.QColor(
             *self._config["shape"]["select_fill_color"]
         )
-        Shape.vertex_fill_color = QtGui.QColor(
+        Shape.default_vertex_fill_color = QtGui.QColor(
             *self._config["shape"]["vertex_fill_color"]
         )
-        Shape.hvertex_fill_color = QtGui.QColor(
+        Shape.default_hvertex_fill_color = QtGui.QColor(
             *self._config["shape"]["hvertex_fill_color"]
         )
 
         # Set point size from config file
         Shape.point_size = self._config["shape"]["point_size"]
         # Set line width from config file
-        Shape.line_width = self._config["shape"]["line_width"]
+        Shape.default_line_width = self._config["shape"]["line_width"]
 
         super(LabelDialog, self).__init__()
 
@@ -230,10 +254,11 @@ class LabelingWidget(LabelDialog):
         self.file_search = QtWidgets.QLineEdit()
         self.file_search.setPlaceholderText(self.tr("Search Filename"))
         self.file_search.textChanged.connect(self.file_search_changed)
-        self.file_list_widget = QtWidgets.QListWidget()
-        self.file_list_widget.itemSelectionChanged.connect(
+        self.file_list_widget = FileListWidget()
+        self.file_list_widget.selection_changed.connect(
             self.file_selection_changed
         )
+        self.image_files_scanned.connect(self.add_scanned_image_files)
         file_list_layout = QtWidgets.QVBoxLayout()
         file_list_layout.setContentsMargins(0, 0, 0, 0)
         file_list_layout.setSpacing(0)
@@ -1722,7 +1747,7 @@ class LabelingWidget(LabelDialog):
         }  # key=filename, value=scroll_value
 
         if filename is not None and osp.isdir(filename):
-            self.import_image_folder(filename, load=False)
+            self.import_image_folder(filename)
         else:
             self.filename = filename
 
@@ -2001,14 +2026,12 @@ class LabelingWidget(LabelDialog):
 
         # Create a new rectangle shape representing the union
         union_shape = shape.copy()
-        union_shape.points[0].setX(min_x)
-        union_shape.points[0].setY(min_y)
-        union_shape.points[1].setX(max_x)
-        union_shape.points[1].setY(min_y)
-        union_shape.points[2].setX(max_x)
-        union_shape.points[2].setY(max_y)
-        union_shape.points[3].setX(min_x)
-        union_shape.points[3].setY(max_y)
+        union_shape.coords = [
+            (min_x, min_y),
+            (max_x, min_y),
+            (max_x, max_y),
+            (min_x, max_y),
+        ]
         self.add_label(union_shape)
 
         # clear selected shapes
@@ -2712,30 +2735,25 @@ class LabelingWidget(LabelDialog):
         )
 
     def file_selection_changed(self):
-        items = self.file_list_widget.selectedItems()
-        if not items:
+        filename = self.file_list_widget.selected_file()
+        if not filename:
             return
-        item = items[0]
 
         if not self.may_continue():
             return
 
-        current_index = self.fn_to_index[str(item.text())]
-        if current_index < len(self.image_list):
-            filename = self.image_list[current_index]
-            if filename:
-                self.load_file(filename)
-                if self.attributes:
-                    # Clear the history widgets from the QGridLayout
-                    self.grid_layout = QGridLayout()
-                    self.grid_layout_container = QWidget()
-                    self.grid_layout_container.setLayout(self.grid_layout)
-                    self.scroll_area.setWidget(self.grid_layout_container)
-                    self.scroll_area.setWidgetResizable(True)
-                    # Create a container widget for the grid layout
-                    self.grid_layout_container = QWidget()
-                    self.grid_layout_container.setLayout(self.grid_layout)
-                    self.scroll_area.setWidget(self.grid_layout_container)
+        self.load_file(filename)
+        if self.attributes:
+            # Clear the history widgets from the QGridLayout
+            self.grid_layout = QGridLayout()
+            self.grid_layout_container = QWidget()
+            self.grid_layout_container.setLayout(self.grid_layout)
+            self.scroll_area.setWidget(self.grid_layout_container)
+            self.scroll_area.setWidgetResizable(True)
+            # Create a container widget for the grid layout
+            self.grid_layout_container = QWidget()
+            self.grid_layout_container.setLayout(self.grid_layout)
+            self.scroll_area.setWidget(self.grid_layout_container)
 
     def attribute_selection_changed(self, i, property, combo):
         # This function is called when the user changes the value in a QComboBox
@@ -2815,7 +2833,7 @@ class LabelingWidget(LabelDialog):
             data = s.other_data.copy()
             info = {
                 "label": s.label,
-                "points": [(p.x(), p.y()) for p in s.points],
+                "points": list(map(tuple, s.coords.tolist())),
                 "group_id": s.group_id,
                 "description": s.description,
                 "difficult": s.difficult,
@@ -2866,13 +2884,7 @@ class LabelingWidget(LabelDialog):
                 flags=flags,
             )
             self.label_file = label_file
-            items = self.file_list_widget.findItems(
-                self.image_path, Qt.MatchExactly
-            )
-            if len(items) > 0:
-                if len(items) != 1:
-                    raise RuntimeError("There are duplicate files.")
-                items[0].setCheckState(Qt.Checked)
+            self.file_list_widget.set_checked(self.image_path, True)
             # disable allows next and previous image to proceed
             # self.filename = filename
             return True
@@ -3063,13 +3075,7 @@ class LabelingWidget(LabelDialog):
                 flags=flags,
             )
             self.label_file = label_file
-            items = self.file_list_widget.findItems(
-                self.image_path, Qt.MatchExactly
-            )
-            if len(items) > 0:
-                if len(items) != 1:
-                    raise RuntimeError("There are duplicate files.")
-                items[0].setCheckState(Qt.Checked)
+            self.file_list_widget.set_checked(self.image_path, True)
             # disable allows next and previous image to proceed
             # self.filename = filename
             return True
@@ -3225,7 +3231,7 @@ class LabelingWidget(LabelDialog):
             self.set_dirty()
         else:
             self.canvas.undo_last_line()
-            self.canvas.shapes_backups.pop()
+            self.canvas.shape_history.pop()
 
     def show_shape(self, shape_height, shape_width, pos):
         """Display annotation width and height while hovering inside.
@@ -3238,8 +3244,10 @@ class LabelingWidget(LabelDialog):
         num_images = len(self.image_list)
         basename = osp.basename(str(self.filename))
         if shape_height > 0 and shape_width > 0:
-            if num_images and self.filename in self.image_list:
-                current_index = self.fn_to_index[str(self.filename)] + 1
+            if num_images and self.filename in self.file_list_widget:
+                current_index = (
+                    self.file_list_widget.index_of(self.filename) + 1
+                )
                 self.status(
                     str(self.tr("X: %d, Y: %d | H: %d, W: %d [%s: %d/%d]"))
                     % (
@@ -3258,8 +3266,10 @@ class LabelingWidget(LabelDialog):
                     % (int(pos.x()), int(pos.y()), shape_height, shape_width)
                 )
         elif self.image_path:
-            if num_images and self.filename in self.image_list:
-                current_index = self.fn_to_index[str(self.filename)] + 1
+            if num_images and self.filename in self.file_list_widget:
+                current_index = (
+                    self.file_list_widget.index_of(self.filename) + 1
+                )
                 self.status(
                     str(self.tr("X: %d, Y: %d [%s: %d/%d]"))
                     % (
@@ -3358,6 +3368,8 @@ class LabelingWidget(LabelDialog):
         )
 
     def brightness_contrast(self, _):
+        if isinstance(self.image, utils.TiledImage):
+            return
         dialog = BrightnessContrastDialog(
             utils.img_data_to_pil(self.image_data),
             self.on_new_brightness_contrast,
@@ -3391,24 +3403,31 @@ class LabelingWidget(LabelDialog):
             self.label_list[index].shape().visible = True
 
     def get_next_files(self, filename, num_files):
-        """Get the next files in the list."""
-        if not self.image_list:
+        """Get the files to preload, in priority order.
+
+        The current file comes first, then `num_files` files in the
+        direction the user is browsing and finally the nearest file
+        in the opposite direction.
+        """
+        num_images = self.file_list_widget.count()
+        if not num_images:
             return []
         filenames = []
         current_index = 0
+        step = 1
         if filename is not None:
-            try:
-                current_index = self.fn_to_index[str(filename)]
-            except ValueError:
+            current_index = self.file_list_widget.index_of(filename)
+            if current_index is None:
                 return []
+            if current_index < self.last_file_index:
+                step = -1
+            self.last_file_index = current_index
             filenames.append(filename)
-        for _ in range(num_files):
-            if current_index + 1 < len(self.image_list):
-                filenames.append(self.image_list[current_index + 1])
-                current_index += 1
-            else:
-                filenames.append(self.image_list[-1])
-                break
+        offsets = [step * i for i in range(1, num_files + 1)] + [-step]
+        for offset in offsets:
+            index = current_index + offset
+            if 0 <= index < num_images:
+                filenames.append(self.file_list_widget.filename(index))
         return filenames
 
     def inform_next_files(self, filename):
@@ -3430,12 +3449,12 @@ class LabelingWidget(LabelDialog):
         self.inform_next_files(filename)
 
         # Changing file_list_widget loads file
-        if filename in self.image_list and (
-            self.file_list_widget.currentRow()
-            != self.fn_to_index[str(filename)]
+        if filename in self.file_list_widget and (
+            self.file_list_widget.current_row()
+            != self.file_list_widget.index_of(filename)
         ):
-            self.file_list_widget.setCurrentRow(
-                self.fn_to_index[str(filename)]
+            self.file_list_widget.set_current_row(
+                self.file_list_widget.index_of(filename)
             )
             self.file_list_widget.repaint()
             return False
@@ -3445,12 +3464,17 @@ class LabelingWidget(LabelDialog):
         if filename is None:
             filename = self.settings.value("filename", "")
         filename = str(filename)
-        if not QtCore.QFile.exists(filename):
+        if not QtCore.QFile.exists(filename) and not utils.is_video_frame(
+            filename
+        ):
             self.error_message(
                 self.tr("Error opening file"),
                 self.tr("No such file: <b>%s</b>") % filename,
             )
             return False
+        tiled = utils.should_tile_image(
+            filename, self._config.get("tiled_image_pixels", 100000000)
+        )
 
         # assumes same name, but json extension
         self.status(
@@ -3466,7 +3490,9 @@ class LabelingWidget(LabelDialog):
             label_file
         ):
             try:
-                self.label_file = LabelFile(label_file, image_dir)
+                self.label_file = LabelFile(
+                    label_file, image_dir, load_image=not tiled
+                )
             except LabelFileError as e:
                 self.error_message(
                     self.tr("Error opening file"),
@@ -3489,6 +3515,10 @@ class LabelingWidget(LabelDialog):
                 self.other_data.get("description", "")
             )
             self.shape_text_edit.textChanged.connect(self.shape_text_changed)
+        elif tiled:
+            self.image_data = None
+            self.image_path = filename
+            self.label_file = None
         else:
             self.image_data = LabelFile.load_image_file(filename)
             if self.image_data:
@@ -3498,7 +3528,10 @@ class LabelingWidget(LabelDialog):
         # Reset the label loop count
         self.label_loop_count = -1
 
-        image = QtGui.QImage.fromData(self.image_data)
+        if tiled:
+            image = self.load_tiled_image(filename)
+        else:
+            image = QtGui.QImage.fromData(self.image_data)
 
         if image.isNull():
             formats = [
@@ -3518,7 +3551,10 @@ class LabelingWidget(LabelDialog):
         self.filename = filename
         if self._config["keep_prev"]:
             prev_shapes = self.canvas.shapes
-        self.canvas.load_pixmap(QtGui.QPixmap.fromImage(image))
+        if tiled:
+            self.canvas.load_pixmap(image)
+        else:
+            self.canvas.load_pixmap(QtGui.QPixmap.fromImage(image))
         flags = {k: False for k in self.image_flags or []}
         if self.label_file:
             for shape in self.label_file.shapes:
@@ -3559,37 +3595,41 @@ class LabelingWidget(LabelDialog):
                     orientation, self.scroll_values[orientation][self.filename]
                 )
         # set brightness contrast values
-        dialog = BrightnessContrastDialog(
-            utils.img_data_to_pil(self.image_data),
-            self.on_new_brightness_contrast,
-            parent=self,
-        )
-        brightness, contrast = self.brightness_contrast_values.get(
-            self.filename, (None, None)
-        )
-        if self._config["keep_prev_brightness"] and self.recent_files:
-            brightness, _ = self.brightness_contrast_values.get(
-                self.recent_files[0], (None, None)
-            )
-        if self._config["keep_prev_contrast"] and self.recent_files:
-            _, contrast = self.brightness_contrast_values.get(
-                self.recent_files[0], (None, None)
-            )
-        if brightness is not None:
-            dialog.slider_brightness.setValue(brightness)
-        if contrast is not None:
-            dialog.slider_contrast.setValue(contrast)
-        self.brightness_contrast_values[self.filename] = (brightness, contrast)
-        if brightness is not None or contrast is not None:
-            dialog.on_new_value()
+        if not tiled:
+            dialog = BrightnessContrastDialog(
+                utils.img_data_to_pil(self.image_data),
+                self.on_new_brightness_contrast,
+                parent=self,
+            )
+            brightness, contrast = self.brightness_contrast_values.get(
+                self.filename, (None, None)
+            )
+            if self._config["keep_prev_brightness"] and self.recent_files:
+                brightness, _ = self.brightness_contrast_values.get(
+                    self.recent_files[0], (None, None)
+                )
+            if self._config["keep_prev_contrast"] and self.recent_files:
+                _, contrast = self.brightness_contrast_values.get(
+                    self.recent_files[0], (None, None)
+                )
+            if brightness is not None:
+                dialog.slider_brightness.setValue(brightness)
+            if contrast is not None:
+                dialog.slider_contrast.setValue(contrast)
+            self.brightness_contrast_values[self.filename] = (
+                brightness,
+                contrast,
+            )
+            if brightness is not None or contrast is not None:
+                dialog.on_new_value()
         self.paint_canvas()
         self.add_recent_file(self.filename)
         self.toggle_actions(True)
         self.canvas.setFocus()
         basename = osp.basename(str(filename))
-        if self.image_list and filename in self.image_list:
+        if self.image_list and filename in self.file_list_widget:
             num_images = len(self.image_list)
-            current_index = self.fn_to_index[str(filename)] + 1
+            current_index = self.file_list_widget.index_of(filename) + 1
             msg = str(self.tr("Loaded %s [%d/%d]")) % (
                 basename,
                 current_index,
@@ -3600,6 +3640,25 @@ class LabelingWidget(LabelDialog):
         self.status(msg)
         return True
 
+    def load_tiled_image(self, filename):
+        """Open a large image as a tiled pyramid, built in the background
+        the first time the image is opened"""
+        max_mb = self._config.get("tile_cache_size", 4096)
+        try:
+            image = utils.TiledImage(
+                filename, max_disk_bytes=int(max_mb) * 1024**2
+            )
+        except OSError as e:
+            logger.error(f"Could not open {filename}: {e}")
+            return QtGui.QImage()
+        if not image.is_built():
+            threading.Thread(
+                target=image.build,
+                args=(self.canvas.image_tiles_updated.emit,),
+                daemon=True,
+            ).start()
+        return image
+
     # QT Overload
     def resizeEvent(self, _):
         if (
@@ -3681,9 +3740,12 @@ class LabelingWidget(LabelDialog):
     def open_checked_image(self, end_index, step, load=True):
         if not self.may_continue():
             return
-        current_index = self.fn_to_index[str(self.filename)]
+        current_index = self.file_list_widget.index_of(self.filename)
+        if current_index is None:
+            # Not listed yet, the folder is still being scanned
+            return
         for i in range(current_index + step, end_index, step):
-            if self.file_list_widget.item(i).checkState() == Qt.Checked:
+            if self.file_list_widget.is_checked(i):
                 self.filename = self.image_list[i]
                 if self.filename and load:
                     self.load_file(self.filename)
@@ -3701,9 +3763,11 @@ class LabelingWidget(LabelDialog):
         ):
             return
 
-        current_index = self.fn_to_index[str(self.filename)]
+        current_index = self.file_list_widget.index_of(self.filename)
+        if current_index is None:
+            return
         for i in range(current_index - 1, -1, -1):
-            if self.file_list_widget.item(i).checkState() == Qt.Unchecked:
+            if not self.file_list_widget.is_checked(i):
                 filename = self.image_list[i]
                 if filename:
                     self.load_file(filename)
@@ -3721,9 +3785,11 @@ class LabelingWidget(LabelDialog):
         ):
             return
 
-        current_index = self.fn_to_index[str(self.filename)]
+        current_index = self.file_list_widget.index_of(self.filename)
+        if current_index is None:
+            return
         for i in range(current_index + 1, len(self.image_list)):
-            if self.file_list_widget.item(i).checkState() == Qt.Unchecked:
+            if not self.file_list_widget.is_checked(i):
                 filename = self.image_list[i]
                 if filename:
                     self.load_file(filename)
@@ -3739,7 +3805,9 @@ class LabelingWidget(LabelDialog):
         if self.filename is None:
             return
 
-        current_index = self.fn_to_index[str(self.filename)]
+        current_index = self.file_list_widget.index_of(self.filename)
+        if current_index is None:
+            return
         if current_index - 1 >= 0:
             filename = self.image_list[current_index - 1]
             if filename:
@@ -3756,7 +3824,9 @@ class LabelingWidget(LabelDialog):
         if self.filename is None:
             filename = self.image_list[0]
         else:
-            current_index = self.fn_to_index[str(self.filename)]
+            current_index = self.file_list_widget.index_of(self.filename)
+            if current_index is None:
+                return
             if current_index + 1 < len(self.image_list):
                 filename = self.image_list[current_index + 1]
             else:
@@ -4668,9 +4738,15 @@ class LabelingWidget(LabelDialog):
             error_dialog.exec_()
 
     # Export
-    def export_yolo_annotation(self, mode, _value=False, dirpath=None):
+    def may_export(self):
+        """Check that labels can be exported and write video frames.
+
+        Frames of a video opened without extraction only exist virtually,
+        so they are written to disk before any export reads the images.
+        Returns False if there is nothing to export or the user canceled.
+        """
         if not self.may_continue():
-            return
+            return False
 
         if not self.filename:
             QtWidgets.QMessageBox.warning(
@@ -4679,6 +4755,43 @@ class LabelingWidget(LabelDialog):
                 self.tr("Please load an image folder before proceeding!"),
                 QtWidgets.QMessageBox.Ok,
             )
+            return False
+
+        return utils.materialize_video_frames(
+            self, osp.dirname(self.filename)
+        )
+
+    def prepare_export_dir(self, save_path):
+        """Create the export folder, asking what to do if it exists.
+
+        Returns False if the user aborted the export.
+        """
+        if not osp.exists(save_path):
+            os.makedirs(save_path)
+            return True
+
+        response = QtWidgets.QMessageBox.warning(
+            self,
+            self.tr("Output Directory Exists!"),
+            self.tr(
+                "Directory already exists. Choose an action:\n"
+                "Yes - Merge with existing files\n"
+                "No - Delete existing directory\n"
+                "Cancel - Abort export"
+            ),
+            QtWidgets.QMessageBox.Yes
+            | QtWidgets.QMessageBox.No
+            | QtWidgets.QMessageBox.Cancel,
+        )
+        if response == QtWidgets.QMessageBox.Cancel:
+            return False
+        if response == QtWidgets.QMessageBox.No:
+            shutil.rmtree(save_path)
+            os.makedirs(save_path)
+        return True
+
+    def export_yolo_annotation(self, mode, _value=False, dirpath=None):
+        if not self.may_export():
             return
 
         # Handle config/classes file selection based on mode
@@ -4773,27 +4886,8 @@ class LabelingWidget(LabelDialog):
         skip_empty_files = skip_empty_files_checkbox.isChecked()
         save_path = path_edit.text()
 
-        # Check if export directory exists and handle overwrite
-        if osp.exists(save_path):
-            response = QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Output Directory Exists!"),
-                self.tr(
-                    "Directory already exists. Choose an action:\n"
-                    "Yes - Merge with existing files\n"
-                    "No - Delete existing directory\n"
-                    "Cancel - Abort export"
-                ),
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No | QtWidgets.QMessageBox.Cancel,
-            )
-
-            if response == QtWidgets.QMessageBox.Cancel:
-                return
-            elif response == QtWidgets.QMessageBox.No:
-                shutil.rmtree(save_path)
-                os.makedirs(save_path)
-        else:
-            os.makedirs(save_path)
+        if not self.prepare_export_dir(save_path):
+            return
 
         # Setup progress dialog
         image_list = self.image_list if self.image_list else [self.filename]
@@ -4867,16 +4961,7 @@ class LabelingWidget(LabelDialog):
             error_dialog.exec_()
 
     def export_voc_annotation(self, mode, _value=False, dirpath=None):
-        if not self.may_continue():
-            return
-
-        if not self.filename:
-            QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Please load an image folder before proceeding!"),
-                QtWidgets.QMessageBox.Ok,
-            )
+        if not self.may_export():
             return
 
         dialog = QtWidgets.QDialog()
@@ -4997,16 +5082,7 @@ class LabelingWidget(LabelDialog):
             error_dialog.exec_()
 
     def export_coco_annotation(self, mode, _value=False, dirpath=None):
-        if not self.may_continue():
-            return
-
-        if not self.filename:
-            QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Please load an image folder before proceeding!"),
-                QtWidgets.QMessageBox.Ok,
-            )
+        if not self.may_export():
             return
 
         if mode == "pose":
@@ -5075,16 +5151,7 @@ class LabelingWidget(LabelDialog):
             return
 
     def export_dota_annotation(self, _value=False, dirpath=None):
-        if not self.may_continue():
-            return
-
-        if not self.filename:
-            QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Please load an image folder before proceeding!"),
-                QtWidgets.QMessageBox.Ok,
-            )
+        if not self.may_export():
             return
 
         label_dir_path = osp.dirname(self.filename)
@@ -5388,16 +5455,7 @@ class LabelingWidget(LabelDialog):
             return
 
     def export_odvg_annotation(self, _value=False, dirpath=None):
-        if not self.may_continue():
-            return
-
-        if not self.filename:
-            QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Please load an image folder before proceeding!"),
-                QtWidgets.QMessageBox.Ok,
-            )
+        if not self.may_export():
             return
 
         if not self.classes_file:
@@ -5452,16 +5510,7 @@ class LabelingWidget(LabelDialog):
             return
 
     def export_pporc_annotation(self, mode, _value=False, dirpath=None):
-        if not self.may_continue():
-            return
-
-        if not self.filename:
-            QtWidgets.QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Please load an image folder before proceeding!"),
-                QtWidgets.QMessageBox.Ok,
-            )
+        if not self.may_export():
             return
 
         converter = LabelConverter(classes_file=self.classes_file)
@@ -5623,15 +5672,13 @@ class LabelingWidget(LabelDialog):
         )
         self.statusBar().show()
 
+        # Retain the current file, it is reloaded once the rescan lists it
         current_filename = self.filename
-        self.import_image_folder(self.last_open_dir, load=False)
-
-        if current_filename in self.image_list:
-            # retain currently selected file
-            self.file_list_widget.setCurrentRow(
-                self.fn_to_index[str(current_filename)]
-            )
-            self.file_list_widget.repaint()
+        self.import_image_folder(
+            self.last_open_dir,
+            load=current_filename is not None,
+            filename=current_filename,
+        )
 
     def save_file(self, _value=False):
         assert not self.image.isNull(), "cannot save empty image"
@@ -5729,8 +5776,7 @@ class LabelingWidget(LabelDialog):
             os.remove(label_file)
             logger.info(f"Label file is removed: {label_file}")
 
-            item = self.file_list_widget.currentItem()
-            item.setCheckState(Qt.Unchecked)
+            self.file_list_widget.set_checked(self.filename, False)
 
             filename = self.filename
             self.reset_state()
@@ -5769,11 +5815,10 @@ class LabelingWidget(LabelDialog):
                 os.remove(label_file)
                 logger.info(f"Label file is removed: {image_file}")
 
+            # Without a listed current file the rescan opens the first one
             filename = None
-            if self.filename is None:
-                filename = self.image_list[0]
-            else:
-                current_index = self.fn_to_index[str(self.filename)]
+            current_index = self.file_list_widget.index_of(self.filename)
+            if current_index is not None:
                 if current_index + 1 < len(self.image_list):
                     filename = self.image_list[current_index + 1]
                 else:
@@ -5782,11 +5827,8 @@ class LabelingWidget(LabelDialog):
             self.reset_state()
             if osp.isfile(image_path):
                 image_path = osp.dirname(image_path)
-            self.import_image_folder(image_path)
-
-            self.filename = filename
-            if self.filename:
-                self.load_file(self.filename)
+            # The next file is loaded once the rescan lists it
+            self.import_image_folder(image_path, filename=filename)
 
     # Message Dialogs. #
     def has_labels(self):
@@ -5883,8 +5925,11 @@ class LabelingWidget(LabelDialog):
             QMessageBox.Yes | QMessageBox.No,
         )
         if reply == QMessageBox.Yes:
+            self.current_index = self.file_list_widget.index_of(self.filename)
+            if self.current_index is None:
+                # Not listed yet, the folder is still being scanned
+                return
             logger.info("Start running all images...")
-            self.current_index = self.fn_to_index[str(self.filename)]
             self.image_index = self.current_index
             self.text_prompt = ""
             self.run_tracker = False
@@ -5911,11 +5956,12 @@ class LabelingWidget(LabelDialog):
 
     def show_progress_dialog_and_process(self):
         self.cancel_processing = False
+        image_files = self.image_list[self.image_index :]
         progress_dialog = QProgressDialog(
             self.tr("Inferencing..."),
             self.tr("Cancel"),
-            self.image_index,
-            len(self.image_list),
+            0,
+            len(image_files),
             self,
         )
         progress_dialog.setWindowModality(Qt.WindowModal)
@@ -5933,52 +5979,61 @@ class LabelingWidget(LabelDialog):
         """
         )
         progress_dialog.canceled.connect(self.cancel_operation)
-        self.process_next_image(progress_dialog)
-
-    def process_next_image(self, progress_dialog):
-        if self.image_index < len(self.image_list):
-            filename = self.image_list[self.image_index]
-            self.filename = filename
-            self.load_file(self.filename)
-            if self.text_prompt:
-                self.auto_labeling_widget.model_manager.predict_shapes(
-                    self.image, self.filename, text_prompt=self.text_prompt
-                )
-            elif self.run_tracker:
-                self.auto_labeling_widget.model_manager.predict_shapes(
-                    self.image, self.filename, run_tracker=self.run_tracker
-                )
-            else:
-                self.auto_labeling_widget.model_manager.predict_shapes(
-                    self.image, self.filename
-                )
-
-            # Update the progress dialog
-            progress_dialog.setValue(self.image_index)
-
-            self.image_index += 1
-            if not self.cancel_processing:
-                delay_ms = 1
-                QtCore.QTimer.singleShot(
-                    delay_ms, lambda: self.process_next_image(progress_dialog)
-                )
-            else:
-                self.cancel_operation()
-        else:
-            self.finish_processing(progress_dialog)
+        self.batch_labeling_progress.connect(
+            lambda num_done, _num_total: progress_dialog.setValue(num_done)
+        )
+
+        predict_kwargs = {}
+        if self.text_prompt:
+            predict_kwargs["text_prompt"] = self.text_prompt
+        elif self.run_tracker:
+            predict_kwargs["run_tracker"] = self.run_tracker
+        model_manager = self.auto_labeling_widget.model_manager
+        self.batch_engine = BatchLabelingEngine(
+            model_manager.loaded_model_config["model"],
+            image_files,
+            output_dir=self.output_dir,
+            predict_kwargs=predict_kwargs,
+            batch_size=model_manager.loaded_model_config.get("batch_size", 1),
+            store_data=self._config["store_data"],
+            on_progress=lambda num_done, num_total, _: (
+                self.batch_labeling_progress.emit(num_done, num_total)
+            ),
+        )
+        self.batch_thread = QtCore.QThread()
+        self.batch_worker = GenericWorker(self.batch_engine.run)
+        self.batch_worker.finished.connect(self.batch_thread.quit)
+        self.batch_worker.finished.connect(
+            lambda: self.finish_processing(progress_dialog)
+        )
+        self.batch_worker.moveToThread(self.batch_thread)
+        self.batch_thread.started.connect(self.batch_worker.run)
+        self.batch_thread.start()
 
     def cancel_operation(self):
         self.cancel_processing = True
+        if getattr(self, "batch_engine", None) is not None:
+            self.batch_engine.cancel()
 
     def finish_processing(self, progress_dialog):
+        self.batch_labeling_progress.disconnect()
+        self.batch_engine = None
         self.filename = self.image_list[self.current_index]
         self.load_file(self.filename)
+        self.refresh_label_checkstate()
         del self.text_prompt
         del self.run_tracker
         del self.image_index
         del self.current_index
         progress_dialog.close()
 
+    def refresh_label_checkstate(self):
+        """Sync the check state of the file list with the label files."""
+        for filename in self.image_list:
+            label_file = get_label_file_path(filename, self.output_dir)
+            if QtCore.QFile.exists(label_file):
+                self.file_list_widget.set_checked(filename, True)
+
     def remove_selected_point(self):
         self.canvas.remove_selected_point()
         self.canvas.update()
@@ -6037,12 +6092,18 @@ class LabelingWidget(LabelDialog):
             return
 
         if osp.exists(source_video_path):
-            target_dir_path = utils.extract_frames_from_video(
-                self, source_video_path
-            )
-            logger.info(
-                f"🔍 Frames have been successfully extracted to {target_dir_path}"
-            )
+            if self._config.get("video_streaming", True):
+                target_dir_path = utils.open_video_source(
+                    self, source_video_path
+                )
+                logger.info(f"🔍 Streaming frames of {source_video_path}")
+            else:
+                target_dir_path = utils.extract_frames_from_video(
+                    self, source_video_path
+                )
+                logger.info(
+                    f"🔍 Frames have been successfully extracted to {target_dir_path}"
+                )
             self.import_image_folder(target_dir_path)
 
     def open_folder_dialog(self, _value=False, dirpath=None):
@@ -6070,11 +6131,17 @@ class LabelingWidget(LabelDialog):
 
     @property
     def image_list(self):
-        lst = []
-        for i in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(i)
-            lst.append(item.text())
-        return lst
+        """Files of the file list in display order; do not modify."""
+        return self.file_list_widget.files()
+
+    def is_labeled_image(self, filename):
+        label_file = osp.splitext(filename)[0] + ".json"
+        if self.output_dir:
+            label_file_without_path = osp.basename(label_file)
+            label_file = self.output_dir + "/" + label_file_without_path
+        return QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
+            label_file
+        )
 
     def import_dropped_image_files(self, image_files):
         extensions = [
@@ -6083,24 +6150,16 @@ class LabelingWidget(LabelDialog):
         ]
 
         self.filename = None
+        files = []
         for file in image_files:
-            if file in self.image_list or not file.lower().endswith(
+            if file in self.file_list_widget or not file.lower().endswith(
                 tuple(extensions)
             ):
                 continue
-            label_file = osp.splitext(file)[0] + ".json"
-            if self.output_dir:
-                label_file_without_path = osp.basename(label_file)
-                label_file = self.output_dir + "/" + label_file_without_path
-            item = QtWidgets.QListWidgetItem(file)
-            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            if QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
-                label_file
-            ):
-                item.setCheckState(Qt.Checked)
-            else:
-                item.setCheckState(Qt.Unchecked)
-            self.file_list_widget.addItem(item)
+            files.append(file)
+        self.file_list_widget.add_files(
+            files, [self.is_labeled_image(file) for file in files]
+        )
 
         if len(self.image_list) > 1:
             self.actions.open_next_image.setEnabled(True)
@@ -6110,7 +6169,15 @@ class LabelingWidget(LabelDialog):
 
         self.open_next_image()
 
-    def import_image_folder(self, dirpath, pattern=None, load=True):
+    def import_image_folder(
+        self, dirpath, pattern=None, load=True, filename=None
+    ):
+        """List the images of `dirpath` in the background.
+
+        The first image, or `filename` if given, is opened as soon as a
+        batch of the scan lists it; with `load` False it is only made the
+        current file.
+        """
         self.actions.open_next_image.setEnabled(True)
         self.actions.open_prev_image.setEnabled(True)
         self.actions.open_next_unchecked_image.setEnabled(True)
@@ -6121,41 +6188,92 @@ class LabelingWidget(LabelDialog):
 
         self.last_open_dir = dirpath
         self.filename = None
+        self.pending_filename = filename
         self.file_list_widget.clear()
-        for filename in self.scan_all_images(dirpath):
-            if pattern and pattern not in filename:
-                continue
-            label_file = osp.splitext(filename)[0] + ".json"
-            if self.output_dir:
-                label_file_without_path = osp.basename(label_file)
-                label_file = self.output_dir + "/" + label_file_without_path
-            item = QtWidgets.QListWidgetItem(filename)
-            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            if QtCore.QFile.exists(label_file) and LabelFile.is_label_file(
-                label_file
-            ):
-                item.setCheckState(Qt.Checked)
+        # Results of a scan that is still running are dropped
+        self.scan_id += 1
+        self.scan_load = load
+        threading.Thread(
+            target=self.scan_image_folder,
+            args=(self.scan_id, dirpath, pattern),
+            daemon=True,
+        ).start()
+
+    def scan_image_folder(self, scan_id, dirpath, pattern=None):
+        """List `dirpath` in the background and stream the images found.
+
+        Runs in a worker thread; batches are delivered to the UI thread
+        through `image_files_scanned` together with their label state.
+        """
+        checked = {}
+
+        def is_canceled():
+            return scan_id != self.scan_id
+
+        def on_batch(files):
+            if pattern:
+                files = [f for f in files if pattern in f]
+            for i in range(0, len(files), 2000):
+                if is_canceled():
+                    return
+                chunk = files[i : i + 2000]
+                states = list(executor.map(self.is_labeled_image, chunk))
+                checked.update(zip(chunk, states))
+                self.image_files_scanned.emit(scan_id, chunk, states, False)
+
+        video_source = utils.get_video_source(dirpath)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            if video_source is not None:
+                # Virtual frames of a video opened in streaming mode
+                files = video_source.files
+                on_batch(files)
             else:
-                item.setCheckState(Qt.Unchecked)
-            self.file_list_widget.addItem(item)
-            self.fn_to_index[filename] = self.file_list_widget.count() - 1
-            utils.process_image_exif(filename)
-        self.open_next_image(load=load)
+                files = self.image_scanner.scan(
+                    dirpath, on_batch, is_canceled
+                )
+        if files is None or is_canceled():
+            return
+        if pattern:
+            files = [f for f in files if pattern in f]
+        states = [checked[f] for f in files]
+        self.image_files_scanned.emit(scan_id, files, states, True)
 
-    def scan_all_images(self, folder_path):
-        extensions = [
-            f".{fmt.data().decode().lower()}"
-            for fmt in QtGui.QImageReader.supportedImageFormats()
-        ]
+    def add_scanned_image_files(self, scan_id, files, checked, finished):
+        if scan_id != self.scan_id:
+            return
+        if not finished:
+            self.file_list_widget.add_files(files, checked)
+        elif files != self.image_list:
+            # Show the final natural order
+            self.file_list_widget.blockSignals(True)
+            self.file_list_widget.set_files(files, checked)
+            self.file_list_widget.blockSignals(False)
+
+        if self.pending_filename in self.file_list_widget:
+            self.filename, self.pending_filename = self.pending_filename, None
+            if self.scan_load:
+                self.load_file(self.filename)
+        elif finished:
+            # The pending file is gone, fall back to the first image
+            self.pending_filename = None
 
-        images = []
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith(tuple(extensions)):
-                    relative_path = osp.join(root, file)
-                    images.append(relative_path)
-        images = natsort.os_sorted(images)
-        return images
+        if self.filename is None:
+            # Batches are only sorted per directory, so the first image
+            # is known once the scan has finished
+            if finished and self.pending_filename is None and files:
+                self.open_next_image(load=self.scan_load)
+        elif (
+            self.scan_load
+            and self.filename in self.file_list_widget
+            and (finished or self.filename in files)
+        ):
+            # Highlight the open file in the batch that lists it, and
+            # again once the final order is shown
+            self.file_list_widget.blockSignals(True)
+            self.file_list_widget.set_current_row(
+                self.file_list_widget.index_of(self.filename)
+            )
+            self.file_list_widget.blockSignals(False)
 
     def toggle_auto_labeling_widget(self):
         """Toggle auto labeling widget visibility."""
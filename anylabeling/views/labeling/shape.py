@@ -1,15 +1,12 @@
 import copy
 import math
 
+import numpy as np
 from PyQt5 import QtCore, QtGui
 
 from . import utils
 from ..labeling.logger import logger
 
-# TODO(unknown):
-# - [opt] Store paths instead of creating new ones at each paint.
-
-
 DEFAULT_LINE_COLOR = QtGui.QColor(0, 255, 0, 128)  # bf hovering
 DEFAULT_FILL_COLOR = QtGui.QColor(100, 100, 100, 100)  # hovering
 DEFAULT_SELECT_LINE_COLOR = QtGui.QColor(255, 255, 255)  # selected
@@ -18,8 +15,72 @@ DEFAULT_VERTEX_FILL_COLOR = QtGui.QColor(0, 255, 0, 255)  # hovering
 DEFAULT_HVERTEX_FILL_COLOR = QtGui.QColor(255, 255, 255, 255)  # hovering
 
 
+def points_to_coords(points):
+    """Convert a sequence of QPointF or (x, y, ...) items to an (N, 2)
+    float64 array"""
+    if len(points) == 0:
+        return np.zeros((0, 2))
+    if isinstance(points[0], QtCore.QPointF):
+        return np.array([(p.x(), p.y()) for p in points], dtype=np.float64)
+    try:
+        coords = np.asarray(points, dtype=np.float64)
+    except (TypeError, ValueError):
+        coords = None
+    if coords is None or coords.ndim != 2 or coords.shape[1] < 2:
+        coords = np.array([(p[0], p[1]) for p in points], dtype=np.float64)
+    return coords[:, :2]
+
+
 class Shape:
-    """Shape data type"""
+    """Shape data type
+
+    The vertices are kept in an (N, 2) float64 array, `coords`; the list
+    of QPointF returned by `points` is only built when it is asked for,
+    e.g. to draw a selected shape or to edit single vertices. Loading,
+    moving, copying, hit-testing and saving work on the array, and the
+    bounding box is cached until the geometry changes.
+    """
+
+    __slots__ = (
+        "label",
+        "score",
+        "group_id",
+        "description",
+        "difficult",
+        "kie_linking",
+        "_path",
+        "_lod_points",
+        "_bbox",
+        "geometry_version",
+        "_points",
+        "_coords",
+        "fill",
+        "selected",
+        "_shape_type",
+        "flags",
+        "other_data",
+        "attributes",
+        "cache_label",
+        "visible",
+        "direction",
+        "center",
+        "show_degrees",
+        "_highlight_index",
+        "_highlight_mode",
+        "_highlight_settings",
+        "_vertex_fill_color",
+        "_closed",
+        # Per-shape overrides of the drawing defaults below, left unset
+        # unless a shape is drawn differently
+        "line_color",
+        "fill_color",
+        "select_line_color",
+        "select_fill_color",
+        "vertex_fill_color",
+        "hvertex_fill_color",
+        "line_width",
+        "__weakref__",
+    )
 
     # Render handles as squares
     P_SQUARE = 0
@@ -46,16 +107,37 @@ class Shape:
     ]
 
     # The following class variables influence the drawing of all shape objects.
-    line_color = DEFAULT_LINE_COLOR
-    fill_color = DEFAULT_FILL_COLOR
-    select_line_color = DEFAULT_SELECT_LINE_COLOR
-    select_fill_color = DEFAULT_SELECT_FILL_COLOR
-    vertex_fill_color = DEFAULT_VERTEX_FILL_COLOR
-    hvertex_fill_color = DEFAULT_HVERTEX_FILL_COLOR
+    # A shape that does not set its own `line_color`, ... uses the default.
+    default_line_color = DEFAULT_LINE_COLOR
+    default_fill_color = DEFAULT_FILL_COLOR
+    default_select_line_color = DEFAULT_SELECT_LINE_COLOR
+    default_select_fill_color = DEFAULT_SELECT_FILL_COLOR
+    default_vertex_fill_color = DEFAULT_VERTEX_FILL_COLOR
+    default_hvertex_fill_color = DEFAULT_HVERTEX_FILL_COLOR
+    default_line_width = 2.0
     point_type = P_ROUND
     point_size = 4
     scale = 1.5
-    line_width = 2.0
+
+    DRAWING_ATTRIBUTES = frozenset(
+        [
+            "line_color",
+            "fill_color",
+            "select_line_color",
+            "select_fill_color",
+            "vertex_fill_color",
+            "hvertex_fill_color",
+            "line_width",
+        ]
+    )
+
+    # Bumped whenever the geometry of any shape changes, so spatial
+    # indexes over shapes know when they are stale
+    geometry_generation = 0
+
+    # Unselected polygons and line strips are drawn without vertices that
+    # are closer than this many screen pixels to the previous one
+    lod_tolerance = 1.0
 
     def __init__(
         self,
@@ -77,6 +159,11 @@ class Shape:
         self.description = description
         self.difficult = difficult
         self.kie_linking = kie_linking
+        self._path = None
+        self._lod_points = None
+        self._bbox = None
+        self.geometry_version = 0
+        self._coords = None
         self.points = []
         self.fill = False
         self.selected = False
@@ -114,7 +201,7 @@ class Shape:
         dictData = {
             "label": self.label,
             "score": self.score,
-            "points": [(p.x(), p.y()) for p in self.points],
+            "points": list(map(tuple, self.coords.tolist())),
             "group_id": self.group_id,
             "description": self.description,
             "difficult": self.difficult,
@@ -134,7 +221,7 @@ class Shape:
     def load_from_dict(self, data: dict, close=True):
         self.label = data["label"]
         self.score = data.get("score")
-        self.points = [QtCore.QPointF(p[0], p[1]) for p in data["points"]]
+        self.coords = points_to_coords(data["points"])
         self.group_id = data.get("group_id")
         self.description = data.get("description", "")
         self.difficult = data.get("difficult", False)
@@ -149,6 +236,113 @@ class Shape:
             self.close()
         return self
 
+    @property
+    def points(self):
+        """Vertices of the shape as a list of QPointF.
+
+        Assign a new list (or use the mutating methods) rather than
+        changing the list or its points in place, so cached geometry
+        stays valid.
+        """
+        if self._points is None:
+            self._points = [
+                QtCore.QPointF(x, y) for x, y in self._coords.tolist()
+            ]
+        return self._points
+
+    @points.setter
+    def points(self, value):
+        self._points = value
+        self._coords = None
+        self._geometry_changed()
+
+    @property
+    def coords(self):
+        """Vertices of the shape as an (N, 2) float64 array.
+
+        Assign a new array rather than changing it in place.
+        """
+        if self._coords is None:
+            self._coords = points_to_coords(self._points)
+        return self._coords
+
+    @coords.setter
+    def coords(self, value):
+        self._coords = np.asarray(value, dtype=np.float64).reshape(-1, 2)
+        self._points = None
+        self._geometry_changed()
+
+    def _points_changed(self):
+        """Drop the array after the list of points was changed in place"""
+        self._coords = None
+        self._geometry_changed()
+
+    def _geometry_changed(self):
+        self._path = None
+        self._lod_points = None
+        self._bbox = None
+        Shape.geometry_generation += 1
+        self.geometry_version = Shape.geometry_generation
+
+    def __getattr__(self, name):
+        # Only called for unset slots: drawing settings the shape does not
+        # override follow the class defaults
+        if name in Shape.DRAWING_ATTRIBUTES:
+            return getattr(type(self), f"default_{name}")
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __getstate__(self):
+        # QPainterPath cannot be pickled or deep-copied, and the QPointF
+        # list is rebuilt from the array when needed. Unset drawing
+        # overrides are left out so the copy keeps following the defaults
+        state = {}
+        for key in self.__slots__:
+            try:
+                state[key] = object.__getattribute__(self, key)
+            except AttributeError:
+                pass
+        state.pop("__weakref__", None)
+        state["_path"] = None
+        state["_lod_points"] = None
+        if state.get("_coords") is not None:
+            state["_points"] = None
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def simplified_coords(self, tolerance):
+        """Return the vertices without those closer than `tolerance` to
+        the previously kept one; the first and last ones are always kept"""
+        if self._lod_points is not None and self._lod_points[0] == tolerance:
+            return self._lod_points[1]
+        coords = self.coords
+        kept = coords
+        if len(coords) > 2:
+            xy = coords.tolist()
+            keep = [0]
+            last_x, last_y = xy[0]
+            min_dist = tolerance * tolerance
+            for i in range(1, len(xy) - 1):
+                x, y = xy[i]
+                if (x - last_x) ** 2 + (y - last_y) ** 2 >= min_dist:
+                    keep.append(i)
+                    last_x, last_y = x, y
+            keep.append(len(xy) - 1)
+            kept = coords[keep]
+        self._lod_points = (tolerance, kept)
+        return kept
+
+    def simplified_points(self, tolerance):
+        """Return `simplified_coords` as a list of QPointF"""
+        return [
+            QtCore.QPointF(x, y)
+            for x, y in self.simplified_coords(tolerance).tolist()
+        ]
+
     @property
     def shape_type(self):
         """Get shape type (polygon, rectangle, rotation, point, line, ...)"""
@@ -162,6 +356,7 @@ class Shape:
         if value not in self.get_supported_shape():
             raise ValueError(f"Unexpected shape_type: {value}")
         self._shape_type = value
+        self._geometry_changed()
 
     @staticmethod
     def get_supported_shape():
@@ -184,7 +379,7 @@ class Shape:
         self._closed = True
 
     def reach_max_points(self):
-        if len(self.points) >= 4:
+        if len(self) >= 4:
             return True
         return False
 
@@ -193,11 +388,13 @@ class Shape:
         if self.shape_type == "rectangle":
             if not self.reach_max_points():
                 self.points.append(point)
+                self._points_changed()
         else:
             if self.points and point == self.points[0]:
                 self.close()
             else:
                 self.points.append(point)
+                self._points_changed()
 
     def can_add_point(self):
         """Check if shape supports more points"""
@@ -206,16 +403,20 @@ class Shape:
     def pop_point(self):
         """Remove and return the last point of the shape"""
         if self.points:
-            return self.points.pop()
+            point = self.points.pop()
+            self._points_changed()
+            return point
         return None
 
     def insert_point(self, i, point):
         """Insert a point to a specific index"""
         self.points.insert(i, point)
+        self._points_changed()
 
     def remove_point(self, i):
         """Remove point from a specific index"""
         self.points.pop(i)
+        self._points_changed()
 
     def is_closed(self):
         """Check if the shape is closed"""
@@ -225,6 +426,15 @@ class Shape:
         """Set shape to open - (_close=False)"""
         self._closed = False
 
+    @property
+    def closed(self):
+        """Whether the shape is closed, as set by auto-labeling models"""
+        return self._closed
+
+    @closed.setter
+    def closed(self, value):
+        self._closed = bool(value)
+
     def get_rect_from_line(self, pt1, pt2):
         """Get rectangle from diagonal line"""
         x1, y1 = pt1.x(), pt1.y()
@@ -233,7 +443,7 @@ class Shape:
 
     def paint(self, painter: QtGui.QPainter):  # noqa: max-complexity: 18
         """Paint shape using QPainter"""
-        if self.points:
+        if len(self):
             color = (
                 self.select_line_color if self.selected else self.line_color
             )
@@ -280,27 +490,40 @@ class Shape:
                     for i in range(len(self.points)):
                         self.draw_vertex(vrtx_path, i)
             elif self.shape_type == "linestrip":
-                line_path.moveTo(self.points[0])
-                for i, p in enumerate(self.points):
-                    line_path.lineTo(p)
-                    if self.selected:
+                line_path.moveTo(*self.coords[0].tolist())
+                if self.selected:
+                    for i, p in enumerate(self.points):
+                        line_path.lineTo(p)
                         self.draw_vertex(vrtx_path, i)
+                else:
+                    simplified = self.simplified_coords(
+                        self.lod_tolerance_px()
+                    )
+                    for x, y in simplified.tolist():
+                        line_path.lineTo(x, y)
             elif self.shape_type == "point":
                 assert len(self.points) == 1
                 self.draw_vertex(vrtx_path, 0)
             else:
-                line_path.moveTo(self.points[0])
+                first = self.coords[0].tolist()
+                line_path.moveTo(*first)
                 # Uncommenting the following line will draw 2 paths
                 # for the 1st vertex, and make it non-filled, which
                 # may be desirable.
                 self.draw_vertex(vrtx_path, 0)
 
-                for i, p in enumerate(self.points):
-                    line_path.lineTo(p)
-                    if self.selected:
+                if self.selected:
+                    for i, p in enumerate(self.points):
+                        line_path.lineTo(p)
                         self.draw_vertex(vrtx_path, i)
+                else:
+                    simplified = self.simplified_coords(
+                        self.lod_tolerance_px()
+                    )
+                    for x, y in simplified.tolist():
+                        line_path.lineTo(x, y)
                 if self.is_closed():
-                    line_path.lineTo(self.points[0])
+                    line_path.lineTo(*first)
 
             painter.drawPath(line_path)
             painter.drawPath(vrtx_path)
@@ -314,11 +537,28 @@ class Shape:
                 )
                 painter.fillPath(line_path, color)
 
+    def lod_tolerance_px(self):
+        """Simplification tolerance in image pixels at the current scale"""
+        return self.lod_tolerance / self.scale
+
+    def paint_key(self):
+        """Return what `paint` depends on besides selection, fill and
+        highlight, for caching rendered shapes"""
+        return (
+            id(self),
+            self.geometry_version,
+            self.line_color,
+            self.vertex_fill_color,
+            self.direction,
+            self.label is None,
+            self._closed,
+        )
+
     def draw_vertex(self, path, i):
         """Draw a vertex"""
         d = self.point_size / self.scale
         shape = self.point_type
-        point = self.points[i]
+        x, y = self.coords[i].tolist()
         if i == self._highlight_index:
             size, shape = self._highlight_settings[self._highlight_mode]
             d *= size
@@ -327,9 +567,9 @@ class Shape:
         else:
             self._vertex_fill_color = self.vertex_fill_color
         if shape == self.P_SQUARE:
-            path.addRect(point.x() - d / 2, point.y() - d / 2, d, d)
+            path.addRect(x - d / 2, y - d / 2, d, d)
         elif shape == self.P_ROUND:
-            path.addEllipse(point, d / 2.0, d / 2.0)
+            path.addEllipse(QtCore.QPointF(x, y), d / 2.0, d / 2.0)
         else:
             logger.error("Unsupported vertex shape")
 
@@ -337,14 +577,12 @@ class Shape:
         """Find the index of the nearest vertex to a point
         Only consider if the distance is smaller than epsilon
         """
-        min_distance = float("inf")
-        min_i = None
-        for i, p in enumerate(self.points):
-            dist = utils.distance(p - point)
-            if dist <= epsilon and dist < min_distance:
-                min_distance = dist
-                min_i = i
-        return min_i
+        coords = self.coords
+        if not len(coords):
+            return None
+        dist = np.hypot(coords[:, 0] - point.x(), coords[:, 1] - point.y())
+        i = int(np.argmin(dist))
+        return i if dist[i] <= epsilon else None
 
     def nearest_edge(self, point, epsilon):
         """Get nearest edge index"""
@@ -373,33 +611,57 @@ class Shape:
         return rectangle
 
     def make_path(self):
-        """Create a path from shape"""
-        if self.shape_type == "rectangle":
-            path = QtGui.QPainterPath(self.points[0])
-            for p in self.points[1:]:
-                path.lineTo(p)
-        elif self.shape_type == "circle":
+        """Return the path of the shape, cached until its points change"""
+        if self._path is None:
+            self._path = self._build_path()
+        return self._path
+
+    def bounding_box(self):
+        """Return the bounding box as a (x1, y1, x2, y2) tuple, cached
+        until the geometry changes"""
+        if self._bbox is None:
+            self._bbox = self._compute_bounding_box()
+        return self._bbox
+
+    def _compute_bounding_box(self):
+        coords = self.coords
+        if self.shape_type == "circle":
+            if len(coords) != 2:
+                return 0.0, 0.0, 0.0, 0.0
+            (cx, cy), (px, py) = coords.tolist()
+            d = math.hypot(cx - px, cy - py)
+            return cx - d, cy - d, cx + d, cy + d
+        if not len(coords):
+            return 0.0, 0.0, 0.0, 0.0
+        x1, y1 = coords.min(axis=0).tolist()
+        x2, y2 = coords.max(axis=0).tolist()
+        return x1, y1, x2, y2
+
+    def _build_path(self):
+        if self.shape_type == "circle":
             path = QtGui.QPainterPath()
-            if len(self.points) == 2:
-                rectangle = self.get_circle_rect_from_line(self.points)
-                path.addEllipse(rectangle)
+            if len(self) == 2:
+                path.addEllipse(self.bounding_rect())
         else:
-            path = QtGui.QPainterPath(self.points[0])
-            for p in self.points[1:]:
-                path.lineTo(p)
+            coords = self.coords.tolist()
+            path = QtGui.QPainterPath(QtCore.QPointF(*coords[0]))
+            for x, y in coords[1:]:
+                path.lineTo(x, y)
         return path
 
     def bounding_rect(self):
         """Return bounding rectangle of the shape"""
-        return self.make_path().boundingRect()
+        x1, y1, x2, y2 = self.bounding_box()
+        return QtCore.QRectF(x1, y1, x2 - x1, y2 - y1)
 
     def move_by(self, offset):
         """Move all points by an offset"""
-        self.points = [p + offset for p in self.points]
+        self.coords = self.coords + (offset.x(), offset.y())
 
     def move_vertex_by(self, i, offset):
         """Move a specific vertex by an offset"""
         self.points[i] = self.points[i] + offset
+        self._points_changed()
 
     def highlight_vertex(self, i, action):
         """Highlight a vertex appropriately based on the current action
@@ -421,10 +683,13 @@ class Shape:
         return copy.deepcopy(self)
 
     def __len__(self):
-        return len(self.points)
+        if self._points is not None:
+            return len(self._points)
+        return len(self._coords)
 
     def __getitem__(self, key):
         return self.points[key]
 
     def __setitem__(self, key, value):
         self.points[key] = value
+        self._points_changed()
@@ -0,0 +1,129 @@
+import weakref
+
+from .shape import Shape
+
+# Shape attributes that only reflect how a shape is drawn or hovered, or
+# caches derived from its points; changing them is not an undoable edit
+TRANSIENT_ATTRIBUTES = frozenset(
+    [
+        "_points",
+        "_coords",
+        "_path",
+        "_lod_points",
+        "_bbox",
+        "geometry_version",
+        "selected",
+        "fill",
+        "_highlight_index",
+        "_highlight_mode",
+        "_vertex_fill_color",
+    ]
+)
+STATE_ATTRIBUTES = tuple(
+    key
+    for key in Shape.__slots__
+    if key not in TRANSIENT_ATTRIBUTES and not key.startswith("__")
+)
+
+
+def values_equal(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        # e.g. numpy arrays kept in `other_data`
+        return False
+
+
+def shape_state_equal(shape, record):
+    """Check if the non-geometry attributes of a shape match a record."""
+    for key in STATE_ATTRIBUTES:
+        if not values_equal(
+            getattr(shape, key, None), getattr(record, key, None)
+        ):
+            return False
+    return True
+
+
+class ShapeHistory:
+    """Undo stack of canvas states with structural sharing.
+
+    A state is a tuple of shape records, frozen copies of shapes that are
+    never modified once taken. A record is reused by every later state as
+    long as its live shape keeps the same `geometry_version` and the same
+    other attributes, so storing a state after an edit only copies the
+    shapes that the edit touched, and unchanged shapes are held once no
+    matter how many states refer to them.
+
+    Like the list of full copies it replaces, the stack holds the state
+    AFTER each edit, so undoing needs the current and a previous state.
+
+    Args:
+        max_states (int): Number of undoable edits to keep.
+    """
+
+    def __init__(self, max_states=10):
+        self.max_states = max_states
+        self.states = []
+        # Live shape -> (geometry_version, record) of its latest copy
+        self.records = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self.states)
+
+    def record(self, shape):
+        """Return the record of the current state of a live shape."""
+        cached = self.records.get(shape)
+        if cached is not None:
+            version, record = cached
+            if version == shape.geometry_version and shape_state_equal(
+                shape, record
+            ):
+                return record
+        record = shape.copy()
+        self.records[shape] = (shape.geometry_version, record)
+        return record
+
+    def store(self, shapes):
+        """Push the state of `shapes` on the stack."""
+        if len(self.states) > self.max_states:
+            del self.states[: -self.max_states - 1]
+        self.states.append(tuple(self.record(shape) for shape in shapes))
+
+    def last(self):
+        """Return the records of the latest state."""
+        return self.states[-1]
+
+    def pop(self):
+        return self.states.pop()
+
+    def is_stored(self, shape):
+        """Check if the points of a live shape match the latest state."""
+        cached = self.records.get(shape)
+        if cached is None or not self.states:
+            return False
+        version, record = cached
+        if version == shape.geometry_version:
+            return True
+        return record.points == shape.points
+
+    @property
+    def can_restore(self):
+        return len(self.states) >= 2
+
+    def restore(self):
+        """Drop the latest state and return live copies of the previous
+        one, which is also removed; storing the restored shapes pushes it
+        back without copying them again."""
+        self.states.pop()
+        shapes = []
+        for record in self.states.pop():
+            shape = record.copy()
+            self.records[shape] = (shape.geometry_version, record)
+            shapes.append(shape)
+        return shapes
+
+    def clear(self):
+        self.states = []
+        self.records = weakref.WeakKeyDictionary()
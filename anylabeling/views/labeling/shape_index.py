@@ -0,0 +1,154 @@
+import math
+from collections import defaultdict
+
+from .shape import Shape
+
+
+class ShapeList(list):
+    """List of canvas shapes that counts its modifications.
+
+    Lets the canvas tell cheaply whether shapes were added, removed or
+    reordered since its spatial index was built.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def append(self, item):
+        super().append(item)
+        self._changed()
+
+    def extend(self, items):
+        super().extend(items)
+        self._changed()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._changed()
+
+    def remove(self, item):
+        super().remove(item)
+        self._changed()
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __iadd__(self, items):
+        result = super().__iadd__(items)
+        self._changed()
+        return result
+
+
+class ShapeGridIndex:
+    """Uniform grid over the bounding boxes of the canvas shapes.
+
+    `candidates` returns the shapes whose bounding box, grown by a
+    tolerance, contains a point, topmost first. The index is rebuilt
+    lazily when the shape list or any shape geometry changed since the
+    last build, which is detected through `ShapeList.version` and
+    `Shape.geometry_generation`.
+    """
+
+    # Shapes covering more cells than this are checked on every query
+    MAX_CELLS_PER_SHAPE = 256
+
+    def __init__(self):
+        self.cells = defaultdict(list)
+        self.large_shapes = []
+        self.boxes = {}
+        self.order = {}
+        self.cell_size = 1.0
+        self.stamp = None
+
+    def _ensure(self, shapes):
+        stamp = (
+            id(shapes),
+            getattr(shapes, "version", None),
+            len(shapes),
+            Shape.geometry_generation,
+        )
+        if stamp != self.stamp:
+            self.build(shapes)
+            self.stamp = stamp
+
+    def build(self, shapes):
+        self.cells = defaultdict(list)
+        self.large_shapes = []
+        self.boxes = {}
+        self.order = {}
+        sizes = []
+        for i, shape in enumerate(shapes):
+            if not shape.points:
+                continue
+            box = shape.bounding_box()
+            self.boxes[id(shape)] = (shape, box)
+            self.order[id(shape)] = i
+            sizes.append(max(box[2] - box[0], box[3] - box[1]))
+        if not sizes:
+            return
+        sizes.sort()
+        self.cell_size = max(sizes[len(sizes) // 2], 16.0)
+        for shape, box in self.boxes.values():
+            x0, y0, x1, y1 = self._cell_range(box, 0.0)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS_PER_SHAPE:
+                self.large_shapes.append(shape)
+                continue
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self.cells[(cx, cy)].append(shape)
+
+    def _cell_range(self, box, margin):
+        size = self.cell_size
+        return (
+            math.floor((box[0] - margin) / size),
+            math.floor((box[1] - margin) / size),
+            math.floor((box[2] + margin) / size),
+            math.floor((box[3] + margin) / size),
+        )
+
+    def candidates(self, shapes, point, margin=0.0):
+        """Return the shapes near `point` in reversed z-order."""
+        self._ensure(shapes)
+        x, y = point.x(), point.y()
+        x0, y0, x1, y1 = self._cell_range((x, y, x, y), margin)
+        found = {id(shape): shape for shape in self.large_shapes}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for shape in self.cells.get((cx, cy), ()):
+                    found[id(shape)] = shape
+        result = []
+        for key, shape in found.items():
+            box = self.boxes[key][1]
+            if (
+                box[0] - margin <= x <= box[2] + margin
+                and box[1] - margin <= y <= box[3] + margin
+            ):
+                result.append(shape)
+        result.sort(key=lambda s: self.order[id(s)], reverse=True)
+        return result
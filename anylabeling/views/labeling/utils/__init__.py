@@ -10,6 +10,7 @@ from ._io import (
 )
 from .image import (
     apply_exif_orientation,
+    get_image_size,
     img_arr_to_b64,
     img_b64_to_arr,
     img_data_to_arr,
@@ -17,6 +18,7 @@ from .image import (
     img_data_to_png_data,
     img_pil_to_data,
     process_image_exif,
+    process_image_exif_once,
 )
 from .qt import (
     Struct,
@@ -29,6 +31,8 @@ from .qt import (
     new_button,
     new_icon,
 )
+from .scanner import ImageFolderScanner
+from .tiled_image import TiledImage, should_tile_image
 from .shape import (
     masks_to_bboxes,
     polygons_to_mask,
@@ -36,4 +40,12 @@ from .shape import (
     shapes_to_label,
     rectangle_from_diagonal,
 )
-from .video import extract_frames_from_video
+from .video import (
+    VideoFrameSource,
+    extract_frames_from_video,
+    get_video_source,
+    is_video_frame,
+    materialize_video_frames,
+    open_video_source,
+    read_video_frame_data,
+)
@@ -3,6 +3,7 @@ import os.path as osp
 import base64
 import io
 import shutil
+import threading
 
 import numpy as np
 import PIL.ExifTags
@@ -33,6 +34,13 @@ def img_b64_to_arr(img_b64):
     return img_arr
 
 
+def get_image_size(img_data):
+    """Return (height, width) of encoded image data from its header."""
+    with PIL.Image.open(io.BytesIO(img_data)) as img:
+        width, height = img.size
+    return height, width
+
+
 def img_pil_to_data(img_pil):
     f = io.BytesIO()
     img_pil.save(f, format="PNG")
@@ -75,6 +83,22 @@ def img_data_to_png_data(img_data):
             return f.read()
 
 
+_exif_lock = threading.Lock()
+_exif_processed = set()
+
+
+def process_image_exif_once(filename):
+    """Run `process_image_exif` the first time an image is read."""
+    with _exif_lock:
+        if filename in _exif_processed:
+            return
+        _exif_processed.add(filename)
+        try:
+            process_image_exif(filename)
+        except Exception as e:  # noqa
+            logger.warning(f"Could not process EXIF of {filename}: {e}")
+
+
 def process_image_exif(filename):
     """Process image EXIF orientation and save if necessary."""
     with PIL.Image.open(filename) as img:
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import os.path as osp
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import natsort
+
+from ...labeling.logger import logger
+
+
+def get_scan_cache_dir():
+    """Return the folder that keeps directory snapshots."""
+    home_dir = osp.expanduser("~")
+    return osp.join(home_dir, "xanylabeling_data", "scan_cache")
+
+
+class ImageFolderScanner:
+    """Recursive image folder scanner with a snapshot cache.
+
+    Sub-directories are listed concurrently with ``os.scandir``, which
+    hides the per-call latency of network file systems. The result is
+    saved together with the mtime of every visited directory; as long as
+    none of them changed, re-opening the folder only costs one ``stat``
+    per directory.
+
+    Args:
+        extensions (list): Lower-case image suffixes, e.g. ``[".jpg"]``.
+        num_workers (int): Number of listing threads.
+        cache_dir (str, optional): Folder for snapshots; pass an empty
+            string to disable them.
+    """
+
+    def __init__(self, extensions, num_workers=8, cache_dir=None):
+        self.extensions = tuple(sorted(set(extensions)))
+        self.num_workers = max(1, num_workers)
+        if cache_dir is None:
+            cache_dir = get_scan_cache_dir()
+        self.cache_dir = cache_dir
+
+    def scan(self, folder, on_batch=None, is_canceled=None):
+        """List the images below `folder` in natural order.
+
+        `on_batch` is called with the images of each directory, in natural
+        order, as soon as it has been listed; directories arrive in the
+        order they finish, so only the returned list is globally sorted.
+        Returns None if `is_canceled` returned True before the scan
+        completed.
+        """
+        snapshot = self.load_snapshot(folder)
+        if snapshot is not None:
+            if on_batch is not None:
+                on_batch(snapshot["files"])
+            return snapshot["files"]
+
+        files, dirs = [], {}
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            pending = {executor.submit(self._scan_dir, folder)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if is_canceled is not None and is_canceled():
+                    for future in pending:
+                        future.cancel()
+                    return None
+                for future in done:
+                    path, mtime, dir_files, sub_dirs = future.result()
+                    if mtime is None:
+                        continue
+                    dirs[path] = mtime
+                    for sub_dir in sub_dirs:
+                        pending.add(executor.submit(self._scan_dir, sub_dir))
+                    if dir_files:
+                        dir_files = natsort.os_sorted(dir_files)
+                        files.extend(dir_files)
+                        if on_batch is not None:
+                            on_batch(dir_files)
+        files = natsort.os_sorted(files)
+        self.save_snapshot(folder, dirs, files)
+        return files
+
+    def _scan_dir(self, path):
+        files, sub_dirs = [], []
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir and not entry.is_symlink():
+                            sub_dirs.append(entry.path)
+                    except OSError:
+                        continue
+                    if not is_dir and entry.name.lower().endswith(
+                        self.extensions
+                    ):
+                        files.append(entry.path)
+        except OSError as e:
+            logger.warning(f"Could not list {path}: {e}")
+            return path, None, [], []
+        return path, mtime, files, sub_dirs
+
+    def snapshot_file(self, folder):
+        key = osp.abspath(folder).encode("utf-8")
+        digest = hashlib.sha1(key).hexdigest()
+        return osp.join(self.cache_dir, f"{digest}.json")
+
+    def load_snapshot(self, folder):
+        """Return the cached snapshot of `folder` if it is still valid."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self.snapshot_file(folder), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            snapshot.get("folder") != folder
+            or tuple(snapshot.get("extensions", [])) != self.extensions
+        ):
+            return None
+        dirs = snapshot.get("dirs", {})
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            mtimes = executor.map(self._get_mtime, dirs)
+            for mtime, expected in zip(mtimes, dirs.values()):
+                if mtime != expected:
+                    return None
+        return snapshot
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def save_snapshot(self, folder, dirs, files):
+        if not self.cache_dir:
+            return
+        snapshot = {
+            "folder": folder,
+            "extensions": list(self.extensions),
+            "dirs": dirs,
+            "files": files,
+        }
+        snapshot_file = self.snapshot_file(folder)
+        tmp_file = f"{snapshot_file}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_file, snapshot_file)
+        except OSError as e:
+            logger.warning(f"Could not save folder snapshot: {e}")
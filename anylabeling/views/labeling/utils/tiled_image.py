@@ -0,0 +1,379 @@
+import hashlib
+import json
+import math
+import os
+import os.path as osp
+import shutil
+import threading
+
+import cv2
+import numpy as np
+import PIL.Image
+from PyQt5 import QtCore, QtGui
+
+from anylabeling.services.auto_labeling.lru_cache import LRUCache
+
+from ...labeling.logger import logger
+from .image import process_image_exif_once
+
+TILE_SIZE = 512
+
+# Builds of the same pyramid are serialized across `TiledImage` objects
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def get_tile_cache_dir():
+    """Return the folder that keeps image pyramids."""
+    home_dir = osp.expanduser("~")
+    return osp.join(home_dir, "xanylabeling_data", "tile_cache")
+
+
+def get_build_lock(folder):
+    """Return the lock that guards building the pyramid in `folder`."""
+    with _build_locks_lock:
+        return _build_locks.setdefault(folder, threading.Lock())
+
+
+def prune_tile_cache(cache_dir, max_bytes, keep=None):
+    """Remove least recently used pyramids until `cache_dir` fits in
+    `max_bytes`. `keep` and pyramids that are being built are spared."""
+    entries, total_bytes = [], 0
+    try:
+        with os.scandir(cache_dir) as it:
+            folders = [entry.path for entry in it if entry.is_dir()]
+    except OSError:
+        return
+    for folder in folders:
+        size = 0
+        try:
+            for root, _, files in os.walk(folder):
+                size += sum(os.stat(osp.join(root, f)).st_size for f in files)
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            continue
+        total_bytes += size
+        entries.append((mtime, folder, size))
+    entries.sort()
+    for _, folder, size in entries:
+        if total_bytes <= max_bytes:
+            break
+        lock = _build_locks.get(folder)
+        if folder == keep or (lock is not None and lock.locked()):
+            continue
+        shutil.rmtree(folder, ignore_errors=True)
+        total_bytes -= size
+
+
+def get_image_file_size(filename):
+    """Return (width, height) of an image file from its header."""
+    with PIL.Image.open(filename) as img:
+        return img.size
+
+
+def should_tile_image(filename, max_pixels):
+    """Check if an image file is large enough to be displayed tiled."""
+    if not max_pixels:
+        return False
+    try:
+        width, height = get_image_file_size(filename)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return width * height > max_pixels
+
+
+class TileStore:
+    """Tiles of an image pyramid saved as PNG files, one folder per level.
+
+    Serves as the second tier of the in-memory tile cache of `TiledImage`.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def tile_file(self, key):
+        level, tx, ty = key
+        return osp.join(self.folder, str(level), f"{tx}_{ty}.png")
+
+    def contains(self, key):
+        return osp.exists(self.tile_file(key))
+
+    def get(self, key):
+        tile_file = self.tile_file(key)
+        if not osp.exists(tile_file):
+            return None
+        image = QtGui.QImage(tile_file)
+        return None if image.isNull() else image
+
+    def put(self, key, value):
+        # Tiles are written by the pyramid builder, never from memory
+        pass
+
+    def write(self, key, tile):
+        """Save a BGR tile array atomically."""
+        tile_file = self.tile_file(key)
+        os.makedirs(osp.dirname(tile_file), exist_ok=True)
+        ok, data = cv2.imencode(".png", tile, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise OSError(f"Could not encode tile {key}")
+        tmp_file = f"{tile_file}.{threading.get_ident()}.tmp"
+        data.tofile(tmp_file)
+        os.replace(tmp_file, tile_file)
+
+
+class TiledImage:
+    """Multi-resolution, tiled view of a large image file.
+
+    Level 0 is the full resolution image and every next level halves it,
+    up to a level that fits in one tile. The pyramid is built once by
+    `build` and cached on disk, keyed by the path, size and mtime of the
+    file; afterwards only the tiles that are drawn get decoded, and at
+    most `max_bytes` of them are kept in memory. Pyramids that have not
+    been opened recently are removed once the cache folder grows beyond
+    `max_disk_bytes`. The EXIF orientation is handled like the regular
+    image loader does.
+
+    The object mimics the size accessors of `QImage`/`QPixmap`, so it can
+    be used wherever only the image geometry is needed.
+
+    Args:
+        filename (str): Image file.
+        tile_size (int): Tile edge in pixels.
+        cache_dir (str, optional): Folder for pyramids.
+        max_bytes (int): Memory budget of decoded tiles.
+        max_disk_bytes (int): Disk budget of the cache folder.
+    """
+
+    def __init__(
+        self,
+        filename,
+        tile_size=TILE_SIZE,
+        cache_dir=None,
+        max_bytes=256 * 1024 * 1024,
+        max_disk_bytes=4 * 1024**3,
+    ):
+        self.filename = filename
+        self.tile_size = tile_size
+        # May rotate the file, so it comes before reading size and mtime
+        process_image_exif_once(filename)
+        self._width, self._height = get_image_file_size(filename)
+        self.num_levels = 1
+        while max(self.level_size(self.num_levels - 1)) > tile_size:
+            self.num_levels += 1
+
+        stat = os.stat(filename)
+        key = (
+            f"{osp.abspath(filename)}|{stat.st_size}|"
+            f"{stat.st_mtime_ns}|{tile_size}"
+        )
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        self.cache_dir = cache_dir or get_tile_cache_dir()
+        self.max_disk_bytes = max_disk_bytes
+        self.folder = osp.join(self.cache_dir, digest)
+        self.store = TileStore(self.folder)
+        self.tiles = LRUCache(
+            maxsize=None,
+            max_bytes=max_bytes,
+            second_tier=self.store,
+            sizeof=lambda image: image.sizeInBytes(),
+        )
+        self.closed = False
+        self.lock = get_build_lock(self.folder)
+        if self.is_built():
+            try:
+                # Marks the pyramid as recently used
+                os.utime(self.folder)
+            except OSError:
+                pass
+
+    # QImage/QPixmap compatible accessors
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def size(self):
+        return QtCore.QSize(self._width, self._height)
+
+    def rect(self):
+        return QtCore.QRect(0, 0, self._width, self._height)
+
+    def isNull(self):
+        return self._width == 0 or self._height == 0
+
+    def cacheKey(self):
+        return id(self)
+
+    def level_size(self, level):
+        factor = 2**level
+        return (
+            math.ceil(self._width / factor),
+            math.ceil(self._height / factor),
+        )
+
+    def level_for_scale(self, scale):
+        """Return the coarsest level that still has one pixel per screen
+        pixel at `scale`"""
+        if scale >= 1:
+            return 0
+        level = int(math.floor(math.log2(1 / scale)))
+        return min(level, self.num_levels - 1)
+
+    def is_built(self):
+        return osp.exists(osp.join(self.folder, "pyramid.json"))
+
+    def tile(self, level, tx, ty):
+        """Return a tile as a QImage, or None if it is not available."""
+        return self.tiles.get((level, tx, ty))
+
+    def visible_tiles(self, rect, level):
+        """Yield (target, tile, source) for the tiles of `level` that
+        intersect `rect`, where `target` is in image coordinates and
+        `source` in tile pixels.
+
+        Tiles that are not built yet are replaced by the matching part of
+        the finest coarser tile that is available.
+        """
+        factor = 2**level
+        span = self.tile_size * factor
+        left = max(0, int(rect.left() // span))
+        top = max(0, int(rect.top() // span))
+        level_width, level_height = self.level_size(level)
+        columns = math.ceil(level_width / self.tile_size)
+        rows = math.ceil(level_height / self.tile_size)
+        right = min(columns - 1, int(rect.right() // span))
+        bottom = min(rows - 1, int(rect.bottom() // span))
+        for ty in range(top, bottom + 1):
+            for tx in range(left, right + 1):
+                found = self._find_tile(level, tx, ty)
+                if found is None:
+                    continue
+                tile, source, ancestor = found
+                target = QtCore.QRectF(
+                    tx * span,
+                    ty * span,
+                    source.width() * 2**ancestor,
+                    source.height() * 2**ancestor,
+                )
+                yield target, tile, source
+
+    def _find_tile(self, level, tx, ty):
+        for ancestor in range(level, self.num_levels):
+            shift = ancestor - level
+            tile = self.tile(ancestor, tx >> shift, ty >> shift)
+            if tile is None:
+                continue
+            part = self.tile_size >> shift
+            x = (tx - ((tx >> shift) << shift)) * part
+            y = (ty - ((ty >> shift) << shift)) * part
+            source = QtCore.QRectF(
+                x,
+                y,
+                min(part, tile.width() - x),
+                min(part, tile.height() - y),
+            )
+            if source.width() <= 0 or source.height() <= 0:
+                return None
+            return tile, source, ancestor
+        return None
+
+    def read_region(self, x, y, width, height, level=0):
+        """Return an RGB array of a region given in level 0 coordinates,
+        sampled at `level`. Requires a built pyramid."""
+        factor = 2**level
+        level_width, level_height = self.level_size(level)
+        x0, y0 = max(0, x // factor), max(0, y // factor)
+        x1 = min(level_width, math.ceil((x + width) / factor))
+        y1 = min(level_height, math.ceil((y + height) / factor))
+        region = np.zeros((max(0, y1 - y0), max(0, x1 - x0), 3), np.uint8)
+        size = self.tile_size
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                tile_file = self.store.tile_file((level, tx, ty))
+                tile = cv2.imdecode(
+                    np.fromfile(tile_file, dtype=np.uint8), cv2.IMREAD_COLOR
+                )
+                if tile is None:
+                    raise FileNotFoundError(tile_file)
+                tile_x, tile_y = tx * size, ty * size
+                sx0, sy0 = max(x0, tile_x), max(y0, tile_y)
+                sx1 = min(x1, tile_x + tile.shape[1])
+                sy1 = min(y1, tile_y + tile.shape[0])
+                region[sy0 - y0 : sy1 - y0, sx0 - x0 : sx1 - x0] = tile[
+                    sy0 - tile_y : sy1 - tile_y, sx0 - tile_x : sx1 - tile_x
+                ]
+        return cv2.cvtColor(region, cv2.COLOR_BGR2RGB)
+
+    def build(self, on_progress=None):
+        """Build the pyramid if it is not cached yet.
+
+        The image is decoded once. The one-tile top level is written
+        first so the overview can be shown while the rest is saved; then
+        each level is written and halved into the next one, so at most
+        two levels are held in memory. `on_progress` is called after each
+        level. Returns False if the image was closed before the pyramid
+        was complete.
+        """
+        with self.lock:
+            if self.is_built():
+                return True
+            image = cv2.imdecode(
+                np.fromfile(self.filename, dtype=np.uint8),
+                cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION,
+            )
+            if image is None:
+                logger.warning(f"Could not decode {self.filename}")
+                return False
+            top = self.num_levels - 1
+            overview = self._resize(image, top) if top > 0 else image
+            if not self._write_level(top, overview):
+                return False
+            if on_progress is not None:
+                on_progress()
+            for level in range(top):
+                if level > 0:
+                    # The previous level is released once it is halved
+                    image = self._resize(image, level)
+                if not self._write_level(level, image):
+                    return False
+                if on_progress is not None:
+                    on_progress()
+            pyramid_file = osp.join(self.folder, "pyramid.json")
+            tmp_file = f"{pyramid_file}.{threading.get_ident()}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "filename": self.filename,
+                        "width": self._width,
+                        "height": self._height,
+                        "tile_size": self.tile_size,
+                        "num_levels": self.num_levels,
+                    },
+                    f,
+                )
+            os.replace(tmp_file, pyramid_file)
+        prune_tile_cache(self.cache_dir, self.max_disk_bytes, keep=self.folder)
+        return True
+
+    def _resize(self, image, level):
+        return cv2.resize(
+            image, self.level_size(level), interpolation=cv2.INTER_AREA
+        )
+
+    def _write_level(self, level, image):
+        size = self.tile_size
+        height, width = image.shape[:2]
+        for y in range(0, height, size):
+            for x in range(0, width, size):
+                if self.closed:
+                    return False
+                key = (level, x // size, y // size)
+                if not self.store.contains(key):
+                    self.store.write(key, image[y : y + size, x : x + size])
+        return True
+
+    def close(self):
+        """Stop a running build and drop the decoded tiles."""
+        self.closed = True
+        self.tiles.clear()
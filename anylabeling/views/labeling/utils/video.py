@@ -1,7 +1,10 @@
 import os
 import os.path as osp
 import cv2
+import json
 import shutil
+import threading
+from collections import OrderedDict
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
@@ -10,6 +13,8 @@ from PyQt5.QtWidgets import (
     QProgressDialog,
 )
 
+from ...labeling.logger import logger
+
 
 def get_output_directory(source_video_path):
     video_dir = os.path.dirname(source_video_path)
@@ -115,3 +120,268 @@ def extract_frames_from_video(parent, source_video_path):
     progress_dialog.close()
 
     return output_dir
+
+
+class VideoFrameSource:
+    """Frames of a video exposed as virtual image files.
+
+    Every kept frame (one out of `interval`) gets the path
+    ``<output_dir>/<NNNNN>.jpg``, the name `extract_frames_from_video`
+    would have written, so labels are stored per frame next to it as
+    usual. Frames are decoded on demand: short forward jumps are decoded
+    through sequentially, longer jumps and backward steps seek (FFmpeg
+    seeks to the preceding keyframe and decodes up to the frame), and the
+    last decoded frames are kept in a ring buffer. Frames are only
+    written to disk by `materialize`.
+
+    Args:
+        video_path (str): Source video file.
+        output_dir (str): Folder of the virtual frames and their labels.
+        interval (int): Keep one frame out of `interval`.
+        buffer_size (int): Number of decoded frames to keep.
+    """
+
+    INFO_FILE = ".xanylabeling_video"
+    MAX_FORWARD_DECODE = 64
+
+    def __init__(self, video_path, output_dir, interval=1, buffer_size=16):
+        self.video_path = video_path
+        self.output_dir = output_dir
+        self.interval = max(1, int(interval))
+        self.buffer_size = buffer_size
+        self.lock = threading.Lock()
+        self.buffer = OrderedDict()
+        self.capture = cv2.VideoCapture(video_path)
+        if not self.capture.isOpened():
+            raise IOError(f"Failed to open video file: {video_path}")
+        self.total_frames = self.count_frames()
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.position = 0
+        num_files = (self.total_frames + self.interval - 1) // self.interval
+        self.files = [
+            osp.join(output_dir, f"{i:05}.jpg") for i in range(num_files)
+        ]
+
+    def count_frames(self):
+        """Return the number of frames that can actually be decoded.
+
+        CAP_PROP_FRAME_COUNT is read from the container and is often a
+        few frames too high, so the reported last frame is decoded and,
+        if that fails, the tail is walked to find where the video ends.
+        """
+        reported = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        if reported <= 0:
+            return 0
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, reported - 1)
+        if self.capture.grab():
+            count = reported
+        else:
+            count = max(0, reported - self.MAX_FORWARD_DECODE)
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, count)
+            while count < reported and self.capture.grab():
+                count += 1
+            logger.warning(
+                f"{self.video_path} reports {reported} frames "
+                f"but only {count} can be decoded"
+            )
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return count
+
+    def save_info(self):
+        """Remember the video and interval so the folder can be reopened."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        info = {"video_path": self.video_path, "interval": self.interval}
+        with open(osp.join(self.output_dir, self.INFO_FILE), "w") as f:
+            json.dump(info, f)
+
+    @classmethod
+    def from_folder(cls, output_dir):
+        """Reopen the source saved in `output_dir`, or return None."""
+        try:
+            with open(osp.join(output_dir, cls.INFO_FILE), "r") as f:
+                info = json.load(f)
+            return cls(info["video_path"], output_dir, info["interval"])
+        except (OSError, ValueError, KeyError) as e:
+            if osp.exists(osp.join(output_dir, cls.INFO_FILE)):
+                logger.warning(f"Could not reopen video source: {e}")
+            return None
+
+    def index_of(self, filename):
+        """Return the position of a virtual frame file, or None."""
+        filename = osp.normpath(filename)
+        if osp.dirname(filename) != self.output_dir:
+            return None
+        try:
+            index = int(osp.splitext(osp.basename(filename))[0])
+        except ValueError:
+            return None
+        return index if 0 <= index < len(self.files) else None
+
+    def read_frame(self, index):
+        """Decode the `index`-th kept frame as a BGR array, or None."""
+        frame_number = index * self.interval
+        with self.lock:
+            frame = self.buffer.get(frame_number)
+            if frame is not None:
+                self.buffer.move_to_end(frame_number)
+                return frame
+            gap = frame_number - self.position
+            if gap < 0 or gap > self.MAX_FORWARD_DECODE:
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                self.position = frame_number
+            ret = True
+            while ret and self.position < frame_number:
+                ret = self.capture.grab()
+                self.position += 1
+            if ret:
+                ret, frame = self.capture.read()
+            if not ret:
+                logger.warning(
+                    f"Could not decode frame {frame_number} "
+                    f"of {self.video_path}"
+                )
+                return None
+            self.position += 1
+            self.buffer[frame_number] = frame
+            while len(self.buffer) > self.buffer_size:
+                self.buffer.popitem(last=False)
+        return frame
+
+    def read_frame_data(self, filename):
+        """Return the frame of a virtual file encoded as image bytes."""
+        index = self.index_of(filename)
+        if index is None:
+            return None
+        frame = self.read_frame(index)
+        if frame is None:
+            return None
+        # BMP is lossless and much cheaper to encode than JPEG or PNG
+        ret, data = cv2.imencode(".bmp", frame)
+        return data.tobytes() if ret else None
+
+    def materialize(self, callback=None):
+        """Write the frames that are not on disk yet as JPEG files.
+
+        `callback(done, total)` may return True to stop early.
+        """
+        missing = [f for f in self.files if not osp.exists(f)]
+        for i, filename in enumerate(missing):
+            frame = self.read_frame(self.index_of(filename))
+            if frame is not None:
+                cv2.imwrite(filename, frame)
+            if callback is not None and callback(i + 1, len(missing)):
+                break
+        return len(missing)
+
+    def release(self):
+        with self.lock:
+            self.capture.release()
+            self.buffer.clear()
+
+
+_video_sources = {}
+
+
+def get_video_source(path):
+    """Return the video source of a frame file or folder, or None.
+
+    Folders that were opened in streaming mode before are reopened from
+    their info file.
+    """
+    folder = path if osp.isdir(path) else osp.dirname(path)
+    folder = osp.normpath(folder)
+    source = _video_sources.get(folder)
+    if source is None and osp.isdir(path):
+        source = VideoFrameSource.from_folder(folder)
+        if source is not None:
+            _video_sources[folder] = source
+    return source
+
+
+def is_video_frame(filename):
+    """Return True if `filename` is a virtual frame of an open video."""
+    source = _video_sources.get(osp.normpath(osp.dirname(filename)))
+    return source is not None and source.index_of(filename) is not None
+
+
+def read_video_frame_data(filename):
+    """Decode a virtual frame file, or return None for other files."""
+    if not _video_sources or osp.exists(filename):
+        return None
+    source = _video_sources.get(osp.normpath(osp.dirname(filename)))
+    if source is None:
+        return None
+    return source.read_frame_data(filename)
+
+
+def open_video_source(parent, source_video_path):
+    """Open a video for annotation without extracting its frames.
+
+    Returns the folder of the virtual frame files, or None.
+    """
+    output_dir = osp.normpath(get_output_directory(source_video_path))
+    source = get_video_source(output_dir) if osp.isdir(output_dir) else None
+    if source is not None and source.video_path != source_video_path:
+        source = None
+    if source is None:
+        video_capture = cv2.VideoCapture(source_video_path)
+        if not video_capture.isOpened():
+            QMessageBox.critical(parent, "Error", "Failed to open video file.")
+            return None
+        total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = int(video_capture.get(cv2.CAP_PROP_FPS))
+        video_capture.release()
+
+        interval = get_frame_interval(parent, fps, total_frames)
+        if interval is None:
+            return None
+        source = VideoFrameSource(source_video_path, output_dir, interval)
+        source.save_info()
+        old_source = _video_sources.pop(output_dir, None)
+        if old_source is not None:
+            old_source.release()
+        _video_sources[output_dir] = source
+    return output_dir
+
+
+def materialize_video_frames(parent, folder):
+    """Write the virtual frames of `folder` to disk before an export.
+
+    Returns False if the user canceled.
+    """
+    source = _video_sources.get(osp.normpath(folder)) if folder else None
+    if source is None:
+        return True
+    missing = sum(1 for f in source.files if not osp.exists(f))
+    if not missing:
+        return True
+    progress_dialog = QProgressDialog(
+        parent.tr("Writing video frames. Please wait..."),
+        parent.tr("Cancel"),
+        0,
+        missing,
+        parent,
+    )
+    progress_dialog.setWindowModality(Qt.WindowModal)
+    progress_dialog.setWindowTitle("Progress")
+    progress_dialog.setStyleSheet(
+        """
+        QProgressDialog QProgressBar {
+            border: 1px solid grey;
+            border-radius: 5px;
+            text-align: center;
+        }
+        QProgressDialog QProgressBar::chunk {
+            background-color: orange;
+        }
+        """
+    )
+
+    def callback(done, total):
+        progress_dialog.setValue(done)
+        return progress_dialog.wasCanceled()
+
+    source.materialize(callback)
+    canceled = progress_dialog.wasCanceled()
+    progress_dialog.close()
+    return not canceled
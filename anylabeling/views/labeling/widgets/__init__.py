@@ -5,6 +5,7 @@ from .brightness_contrast_dialog import BrightnessContrastDialog
 from .canvas import Canvas
 from .color_dialog import ColorDialog
 from .file_dialog_preview import FileDialogPreview
+from .file_list_widget import FileListModel, FileListWidget
 from .filter_label_widget import LabelFilterComboBox
 from .general_dialog import CrosshairSettingsDialog
 from .image_dialog import ImageCropperDialog
@@ -11,6 +11,8 @@ from anylabeling.services.auto_labeling.types import AutoLabelingMode
 
 from .. import utils
 from ..shape import Shape
+from ..shape_history import ShapeHistory
+from ..shape_index import ShapeGridIndex, ShapeList
 
 CURSOR_DEFAULT = QtCore.Qt.ArrowCursor
 CURSOR_POINT = QtCore.Qt.PointingHandCursor
@@ -43,9 +45,17 @@ class Canvas(
     drawing_polygon = QtCore.pyqtSignal(bool)
     vertex_selected = QtCore.pyqtSignal(bool)
     auto_labeling_marks_updated = QtCore.pyqtSignal(list)
+    # Emitted from the pyramid builder when more image tiles are available
+    image_tiles_updated = QtCore.pyqtSignal()
 
     CREATE, EDIT = 0, 1
 
+    # Largest cached shape layer, in device pixels, that is kept as an
+    # image; larger layers are replayed from a QPicture instead
+    MAX_SHAPE_LAYER_PIXELS = 4096 * 4096
+    # Room around the image for vertices drawn across its border
+    SHAPE_LAYER_MARGIN = 16
+
     # polygon, rectangle, rotation, line, or point
     _create_mode = "polygon"
 
@@ -65,8 +75,9 @@ class Canvas(
         self.mode = self.EDIT
         self.is_auto_labeling = False
         self.auto_labeling_mode: AutoLabelingMode = None
+        self.shape_index = ShapeGridIndex()
         self.shapes = []
-        self.shapes_backups = []
+        self.shape_history = ShapeHistory(self.num_backups)
         self.current = None
         self.selected_shapes = []  # save the selected shapes here
         self.selected_shapes_copy = []
@@ -97,12 +108,15 @@ class Canvas(
         self.h_shape_is_hovered = None
         self.allowed_oop_shape_types = ["rotation"]
         self._painter = QtGui.QPainter()
+        self._shape_layer = None
+        self._shape_layer_key = None
         self._cursor = CURSOR_DEFAULT
         # Menus:
         # 0: right-click without selection and dragging of shapes
         # 1: right-click with selection and dragging of shapes
         self.menus = (QtWidgets.QMenu(), QtWidgets.QMenu())
         # Set widget options.
+        self.image_tiles_updated.connect(self.update)
         self.setMouseTracking(True)
         self.setFocusPolicy(QtCore.Qt.WheelFocus)
         self.show_groups = False
@@ -170,14 +184,26 @@ class Canvas(
             raise ValueError(f"Unsupported create_mode: {value}")
         self._create_mode = value
 
+    @property
+    def shapes(self):
+        """Shapes on the canvas, bottom-most first"""
+        return self._shapes
+
+    @shapes.setter
+    def shapes(self, value):
+        self._shapes = ShapeList(value)
+
+    def shapes_near(self, point):
+        """Return the visible shapes within hit-test distance of a point,
+        top-most first"""
+        candidates = self.shape_index.candidates(
+            self.shapes, point, self.epsilon / self.scale
+        )
+        return [s for s in candidates if self.is_visible(s)]
+
     def store_shapes(self):
         """Store shapes for restoring later (Undo feature)"""
-        shapes_backup = []
-        for shape in self.shapes:
-            shapes_backup.append(shape.copy())
-        if len(self.shapes_backups) > self.num_backups:
-            self.shapes_backups = self.shapes_backups[-self.num_backups - 1 :]
-        self.shapes_backups.append(shapes_backup)
+        self.shape_history.store(self.shapes)
 
     @property
     def is_shape_restorable(self):
@@ -185,9 +211,7 @@ class Canvas(
         # We save the state AFTER each edit (not before) so for an
         # edit to be undoable, we expect the CURRENT and the PREVIOUS state
         # to be in the undo stack.
-        if len(self.shapes_backups) < 2:
-            return False
-        return True
+        return self.shape_history.can_restore
 
     def restore_shape(self):
         """Restore/Undo a shape"""
@@ -196,12 +220,9 @@ class Canvas(
         # and app.py::load_shapes and our own Canvas::load_shapes function.
         if not self.is_shape_restorable:
             return
-        self.shapes_backups.pop()  # latest
-
         # The application will eventually call Canvas.load_shapes which will
         # push this right back onto the stack.
-        shapes_backup = self.shapes_backups.pop()
-        self.shapes = shapes_backup
+        self.shapes = self.shape_history.restore()
         self.selected_shapes = []
         for shape in self.shapes:
             shape.selected = False
@@ -293,7 +314,7 @@ class Canvas(
         self.show_shape.emit(-1, -1, pos)
 
         self.prev_move_point = pos
-        self.repaint()
+        self.update()
         self.restore_cursor()
 
         # Polygon drawing.
@@ -357,7 +378,7 @@ class Canvas(
             elif self.create_mode == "point":
                 self.line.points = [self.current[0]]
                 self.line.close()
-            self.repaint()
+            self.update()
             self.current.highlight_clear()
             return
 
@@ -366,12 +387,12 @@ class Canvas(
             if self.selected_shapes_copy and self.prev_point:
                 self.override_cursor(CURSOR_MOVE)
                 self.bounded_move_shapes(self.selected_shapes_copy, pos)
-                self.repaint()
+                self.update()
             elif self.selected_shapes:
                 self.selected_shapes_copy = [
                     s.copy() for s in self.selected_shapes
                 ]
-                self.repaint()
+                self.update()
             return
 
         # Polygon/Vertex moving.
@@ -379,7 +400,7 @@ class Canvas(
             if self.selected_vertex():
                 try:
                     self.bounded_move_vertex(pos)
-                    self.repaint()
+                    self.update()
                     self.moving_shape = True
                 except IndexError:
                     return
@@ -392,7 +413,7 @@ class Canvas(
             elif self.selected_shapes and self.prev_point:
                 self.override_cursor(CURSOR_MOVE)
                 self.bounded_move_shapes(self.selected_shapes, pos)
-                self.repaint()
+                self.update()
                 self.moving_shape = True
                 if self.selected_shapes[-1].shape_type == "rectangle":
                     p1 = self.selected_shapes[-1][0]
@@ -407,7 +428,7 @@ class Canvas(
         # - Highlight vertex
         # Update shape/vertex fill and tooltip value accordingly.
         self.setToolTip(self.tr("Image"))
-        for shape in reversed([s for s in self.shapes if self.is_visible(s)]):
+        for shape in self.shapes_near(pos):
             # Look for a nearby vertex to highlight. If that fails,
             # check if we happen to be inside a shape.
             index = shape.nearest_vertex(pos, self.epsilon / self.scale)
@@ -613,7 +634,7 @@ class Canvas(
                     pos, multiple_selection_mode=group_mode
                 )
                 self.prev_point = pos
-                self.repaint()
+                self.update()
         elif ev.button() == QtCore.Qt.RightButton and self.editing():
             group_mode = int(ev.modifiers()) == QtCore.Qt.ControlModifier
             if not self.selected_shapes or (
@@ -623,7 +644,7 @@ class Canvas(
                 self.select_shape_point(
                     pos, multiple_selection_mode=group_mode
                 )
-                self.repaint()
+                self.update()
             self.prev_point = pos
 
     # QT Overload
@@ -640,7 +661,7 @@ class Canvas(
             ):
                 # Cancel the move by deleting the shadow copy.
                 self.selected_shapes_copy = []
-                self.repaint()
+                self.update()
         elif ev.button() == QtCore.Qt.LeftButton:
             if self.editing():
                 if (
@@ -653,11 +674,7 @@ class Canvas(
                     )
 
         if self.moving_shape and self.h_hape:
-            index = self.shapes.index(self.h_hape)
-            if (
-                self.shapes_backups[-1][index].points
-                != self.shapes[index].points
-            ):
+            if not self.shape_history.is_stored(self.h_hape):
                 self.store_shapes()
                 self.shape_moved.emit()
 
@@ -676,7 +693,7 @@ class Canvas(
             for i, shape in enumerate(self.selected_shapes_copy):
                 self.selected_shapes[i].points = shape.points
         self.selected_shapes_copy = []
-        self.repaint()
+        self.update()
         self.store_shapes()
         return True
 
@@ -739,12 +756,8 @@ class Canvas(
                 return
 
         else:
-            for shape in reversed(self.shapes):
-                if (
-                    self.is_visible(shape)
-                    and len(shape.points) > 1
-                    and shape.contains_point(point)
-                ):
+            for shape in self.shapes_near(point):
+                if len(shape.points) > 1 and shape.contains_point(point):
                     self.set_hiding()
                     if shape not in self.selected_shapes:
                         if multiple_selection_mode:
@@ -1012,7 +1025,10 @@ class Canvas(
         p.scale(self.scale, self.scale)
         p.translate(self.offset_to_center())
 
-        p.drawPixmap(0, 0, self.pixmap)
+        if isinstance(self.pixmap, utils.TiledImage):
+            self.draw_image_tiles(p, event.rect())
+        else:
+            p.drawPixmap(0, 0, self.pixmap)
         Shape.scale = self.scale
 
         # Draw loading/waiting screen
@@ -1170,66 +1186,27 @@ class Canvas(
                 ]
                 p.drawPolygon(arrow_points)
 
-        # Draw degrees
+        # Draw shapes: all of them come from the cached layer, and the
+        # selected and hovered ones are painted again on top of it. Shapes
+        # that are being dragged are left out of the layer meanwhile.
+        layer_shapes, overlay_shapes = [], []
+        editing = self.moving_shape or self.rotating_shape
         for shape in self.shapes:
-            if (
-                shape.selected or not self._hide_backround
-            ) and self.is_visible(shape):
-                shape.fill = self._fill_drawing and (
-                    shape.selected or shape == self.h_hape
-                )
-                shape.paint(p)
-
-            if (
-                shape.shape_type == "rotation"
-                and len(shape.points) == 4
-                and self.is_visible(shape)
-            ):
-                d = shape.point_size / shape.scale
-                center = QtCore.QPointF(
-                    (shape.points[0].x() + shape.points[2].x()) / 2,
-                    (shape.points[0].y() + shape.points[2].y()) / 2,
-                )
-                if self.show_degrees:
-                    degrees = str(int(math.degrees(shape.direction))) + "°"
-                    p.setFont(
-                        QtGui.QFont(
-                            "Arial",
-                            int(max(6.0, int(round(8.0 / Shape.scale)))),
-                        )
-                    )
-                    pen = QtGui.QPen(
-                        QtGui.QColor("#FF9900"), 8, QtCore.Qt.SolidLine
-                    )
-                    p.setPen(pen)
-                    fm = QtGui.QFontMetrics(p.font())
-                    rect = fm.boundingRect(degrees)
-                    p.fillRect(
-                        int(rect.x() + center.x() - d),
-                        int(rect.y() + center.y() + d),
-                        int(rect.width()),
-                        int(rect.height()),
-                        QtGui.QColor("#FF9900"),
-                    )
-                    pen = QtGui.QPen(
-                        QtGui.QColor("#FFFFFF"), 7, QtCore.Qt.SolidLine
-                    )
-                    p.setPen(pen)
-                    p.drawText(
-                        int(center.x() - d),
-                        int(center.y() + d),
-                        degrees,
-                    )
-                else:
-                    cp = QtGui.QPainterPath()
-                    cp.addRect(
-                        int(center.x() - d / 2),
-                        int(center.y() - d / 2),
-                        int(d),
-                        int(d),
-                    )
-                    p.drawPath(cp)
-                    p.fillPath(cp, QtGui.QColor(255, 153, 0, 255))
+            if not self.is_visible(shape):
+                continue
+            hovered = shape is self.h_hape and not self._hide_backround
+            if shape.selected or hovered:
+                overlay_shapes.append(shape)
+                if editing:
+                    continue
+            layer_shapes.append(shape)
+        self.draw_shape_layer(p, layer_shapes)
+        for shape in overlay_shapes:
+            shape.fill = self._fill_drawing and (
+                shape.selected or shape == self.h_hape
+            )
+            shape.paint(p)
+            self.paint_degrees(p, shape)
 
         if self.current:
             self.current.paint(p)
@@ -1393,6 +1370,149 @@ class Canvas(
 
         p.end()
 
+    def draw_image_tiles(self, p, rect):
+        """Draw the tiles of a tiled image that cover `rect`, in widget
+        coordinates, at the pyramid level matching the zoom"""
+        image_rect = QtCore.QRectF(
+            self.transform_pos(QtCore.QPointF(rect.topLeft())),
+            self.transform_pos(QtCore.QPointF(rect.bottomRight())),
+        )
+        level = self.pixmap.level_for_scale(
+            self.scale * self.devicePixelRatioF()
+        )
+        # Tiles are drawn on whole device pixels, otherwise the blended
+        # edges of adjacent tiles show up as seams
+        transform = p.transform()
+        p.save()
+        p.resetTransform()
+        for target, tile, source in self.pixmap.visible_tiles(
+            image_rect, level
+        ):
+            device_rect = transform.mapRect(target)
+            left, top = round(device_rect.left()), round(device_rect.top())
+            p.drawImage(
+                QtCore.QRectF(
+                    left,
+                    top,
+                    round(device_rect.right()) - left,
+                    round(device_rect.bottom()) - top,
+                ),
+                tile,
+                source,
+            )
+        p.restore()
+
+    def paint_degrees(self, p, shape):
+        """Paint the direction marker of a rotation shape"""
+        if shape.shape_type != "rotation" or len(shape.points) != 4:
+            return
+        d = shape.point_size / shape.scale
+        center = QtCore.QPointF(
+            (shape.points[0].x() + shape.points[2].x()) / 2,
+            (shape.points[0].y() + shape.points[2].y()) / 2,
+        )
+        if self.show_degrees:
+            degrees = str(int(math.degrees(shape.direction))) + "°"
+            p.setFont(
+                QtGui.QFont(
+                    "Arial", int(max(6.0, int(round(8.0 / Shape.scale))))
+                )
+            )
+            pen = QtGui.QPen(QtGui.QColor("#FF9900"), 8, QtCore.Qt.SolidLine)
+            p.setPen(pen)
+            fm = QtGui.QFontMetrics(p.font())
+            rect = fm.boundingRect(degrees)
+            p.fillRect(
+                int(rect.x() + center.x() - d),
+                int(rect.y() + center.y() + d),
+                int(rect.width()),
+                int(rect.height()),
+                QtGui.QColor("#FF9900"),
+            )
+            pen = QtGui.QPen(QtGui.QColor("#FFFFFF"), 7, QtCore.Qt.SolidLine)
+            p.setPen(pen)
+            p.drawText(int(center.x() - d), int(center.y() + d), degrees)
+        else:
+            cp = QtGui.QPainterPath()
+            cp.addRect(
+                int(center.x() - d / 2),
+                int(center.y() - d / 2),
+                int(d),
+                int(d),
+            )
+            p.drawPath(cp)
+            p.fillPath(cp, QtGui.QColor(255, 153, 0, 255))
+
+    def draw_shape_layer(self, p, shapes):
+        """Draw shapes, in their unselected style, from a cached rendering.
+
+        The shapes are rendered once per zoom level into an image (or a
+        picture if the image would be too large) and re-rendered only
+        when one of them, their order or their style changed.
+        """
+        dpr = self.devicePixelRatioF()
+        key = (
+            self.scale,
+            dpr,
+            self.pixmap.cacheKey(),
+            self._hide_backround,
+            self.show_degrees,
+            [shape.paint_key() for shape in shapes],
+        )
+        if key != self._shape_layer_key:
+            self._shape_layer = self.render_shape_layer(shapes, dpr)
+            self._shape_layer_key = key
+        layer = self._shape_layer
+        if isinstance(layer, QtGui.QPicture):
+            p.drawPicture(0, 0, layer)
+            return
+        ratio = self.scale * dpr
+        margin = self.SHAPE_LAYER_MARGIN / ratio
+        p.drawImage(
+            QtCore.QRectF(
+                -margin,
+                -margin,
+                layer.width() / ratio,
+                layer.height() / ratio,
+            ),
+            layer,
+        )
+
+    def render_shape_layer(self, shapes, dpr):
+        picture = QtGui.QPicture()
+        painter = QtGui.QPainter(picture)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        for shape in shapes:
+            if not self._hide_backround:
+                selected = shape.selected
+                highlight_index = shape._highlight_index
+                shape.selected = False
+                shape._highlight_index = None
+                shape.fill = False
+                shape.paint(painter)
+                shape.selected = selected
+                shape._highlight_index = highlight_index
+            self.paint_degrees(painter, shape)
+        painter.end()
+
+        ratio = self.scale * dpr
+        margin = self.SHAPE_LAYER_MARGIN
+        width = math.ceil(self.pixmap.width() * ratio) + 2 * margin
+        height = math.ceil(self.pixmap.height() * ratio) + 2 * margin
+        if width * height > self.MAX_SHAPE_LAYER_PIXELS:
+            return picture
+        image = QtGui.QImage(
+            width, height, QtGui.QImage.Format_ARGB32_Premultiplied
+        )
+        image.fill(Qt.transparent)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.translate(margin, margin)
+        painter.scale(ratio, ratio)
+        painter.drawPicture(0, 0, picture)
+        painter.end()
+        return image
+
     def transform_pos(self, point):
         """Convert from widget-logical coordinates to painter-logical ones."""
         return point / self.scale - self.offset_to_center()
@@ -1596,7 +1716,7 @@ class Canvas(
             self.bounded_move_shapes(
                 self.selected_shapes, self.prev_point + offset
             )
-            self.repaint()
+            self.update()
             self.moving_shape = True
 
     def rotate_by_keyboard(self, theta):
@@ -1605,7 +1725,7 @@ class Canvas(
             for i, shape in enumerate(self.selected_shapes):
                 if shape._shape_type == "rotation":
                     self.bounded_rotate_shapes(i, shape, theta)
-                    self.repaint()
+                    self.update()
                     self.rotating_shape = True
 
     # QT Overload
@@ -1655,11 +1775,7 @@ class Canvas(
                 and self.selected_shapes
                 and self.selected_shapes[0] in self.shapes
             ):
-                index = self.shapes.index(self.selected_shapes[0])
-                if (
-                    self.shapes_backups[-1][index].points
-                    != self.shapes[index].points
-                ):
+                if not self.shape_history.is_stored(self.selected_shapes[0]):
                     self.store_shapes()
                     if self.moving_shape:
                         self.shape_moved.emit()
@@ -1679,7 +1795,7 @@ class Canvas(
         else:
             self.shapes[-1].label = text
         self.shapes[-1].flags = flags
-        self.shapes_backups.pop()
+        self.shape_history.pop()
         self.store_shapes()
         return self.shapes[-1]
 
@@ -1709,12 +1825,20 @@ class Canvas(
         self.update()
 
     def load_pixmap(self, pixmap, clear_shapes=True):
-        """Load pixmap"""
+        """Load pixmap, or a `TiledImage` for very large images"""
+        self.close_tiled_image(pixmap)
         self.pixmap = pixmap
         if clear_shapes:
             self.shapes = []
         self.update()
 
+    def close_tiled_image(self, replacement=None):
+        if (
+            isinstance(self.pixmap, utils.TiledImage)
+            and self.pixmap is not replacement
+        ):
+            self.pixmap.close()
+
     def load_shapes(self, shapes, replace=True):
         """Load shapes"""
         if replace:
@@ -1745,9 +1869,10 @@ class Canvas(
 
     def reset_state(self):
         """Clear shapes and pixmap"""
+        self.close_tiled_image()
         self.restore_cursor()
         self.pixmap = None
-        self.shapes_backups = []
+        self.shape_history.clear()
         self.update()
 
     def set_cross_line(self, show, width, color, opacity):
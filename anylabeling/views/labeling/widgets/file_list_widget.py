@@ -0,0 +1,170 @@
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtCore import Qt
+
+
+class FileListModel(QtCore.QAbstractListModel):
+    """Item model over a flat array of image paths.
+
+    Keeps the paths in a list, a name -> row dict and a bytearray that
+    records which images already have a label file, so lookups and
+    check state updates are O(1) and no per-row item objects are created.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files = []
+        self._index = {}
+        self._checked = bytearray()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._files[row]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, filename):
+        return filename in self._index
+
+    @property
+    def files(self):
+        """The image paths in display order; must not be modified."""
+        return self._files
+
+    def index_of(self, filename):
+        """Return the row of `filename`, or None if it is not listed."""
+        return self._index.get(filename)
+
+    def set_files(self, files, checked=None):
+        """Replace the listed files; `checked` flags the labeled ones."""
+        self.beginResetModel()
+        self._files = []
+        self._index = {}
+        self._checked = bytearray()
+        self._extend(*self._new_entries(files, checked))
+        self.endResetModel()
+
+    def add_files(self, files, checked=None):
+        """Append the files that are not listed yet."""
+        new_files, new_checked = self._new_entries(files, checked)
+        if not new_files:
+            return
+        start = len(self._files)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), start, start + len(new_files) - 1
+        )
+        self._extend(new_files, new_checked)
+        self.endInsertRows()
+
+    def _new_entries(self, files, checked):
+        files = list(files)
+        if checked is None:
+            checked = [False] * len(files)
+        new_files, new_checked = [], []
+        seen = set()
+        for filename, is_checked in zip(files, checked):
+            if filename in self._index or filename in seen:
+                continue
+            seen.add(filename)
+            new_files.append(filename)
+            new_checked.append(bool(is_checked))
+        return new_files, new_checked
+
+    def _extend(self, files, checked):
+        start = len(self._files)
+        self._files.extend(files)
+        self._checked.extend(checked)
+        for row, filename in enumerate(files, start):
+            self._index[filename] = row
+
+    def clear(self):
+        self.set_files([])
+
+    def is_checked(self, row):
+        return bool(self._checked[row])
+
+    def set_checked(self, filename, checked):
+        """Set the label state of `filename`; unknown files are ignored."""
+        row = self._index.get(filename)
+        if row is None or bool(self._checked[row]) == bool(checked):
+            return
+        self._checked[row] = bool(checked)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+
+
+class FileListWidget(QtWidgets.QListView):
+    """Virtual list view of the image files of the current folder."""
+
+    selection_changed = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_model = FileListModel(self)
+        self.setModel(self.file_model)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.selectionModel().selectionChanged.connect(
+            lambda *_: self.selection_changed.emit()
+        )
+
+    def __contains__(self, filename):
+        return str(filename) in self.file_model
+
+    def count(self):
+        return len(self.file_model)
+
+    def files(self):
+        return self.file_model.files
+
+    def filename(self, row):
+        return self.file_model.files[row]
+
+    def index_of(self, filename):
+        return self.file_model.index_of(str(filename))
+
+    def set_files(self, files, checked=None):
+        self.file_model.set_files(files, checked)
+
+    def add_files(self, files, checked=None):
+        self.file_model.add_files(files, checked)
+
+    def clear(self):
+        self.file_model.clear()
+
+    def is_checked(self, row):
+        return self.file_model.is_checked(row)
+
+    def set_checked(self, filename, checked):
+        self.file_model.set_checked(str(filename), checked)
+
+    def current_row(self):
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def set_current_row(self, row):
+        self.setCurrentIndex(self.file_model.index(row))
+
+    def selected_file(self):
+        """Return the selected file path, or None."""
+        indexes = self.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.file_model.files[indexes[0].row()]
@@ -298,12 +298,7 @@ class LabelModifyDialog(QtWidgets.QDialog):
         self.populate_table()
 
     def get_image_file_list(self):
-        image_file_list = []
-        count = self.parent.file_list_widget.count()
-        for c in range(count):
-            image_file = self.parent.file_list_widget.item(c).text()
-            image_file_list.append(image_file)
-        return image_file_list
+        return list(self.parent.image_list)
 
     def move_to_center(self):
         qr = self.frameGeometry()
@@ -17,6 +17,8 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
+from ..label_index import get_label_index
+
 
 class OverviewDialog(QtWidgets.QDialog):
     def __init__(self, parent):
@@ -110,12 +112,7 @@ class OverviewDialog(QtWidgets.QDialog):
         self.move(qr.topLeft())
 
     def get_image_file_list(self):
-        image_file_list = []
-        count = self.parent.file_list_widget.count()
-        for c in range(count):
-            image_file = self.parent.file_list_widget.item(c).text()
-            image_file_list.append(image_file)
-        return image_file_list
+        return list(self.parent.image_list)
 
     def get_label_infos(self, start_index: int = -1, end_index: int = -1):
         initial_nums = [0 for _ in range(len(self.supported_shape))]
@@ -143,23 +140,27 @@ class OverviewDialog(QtWidgets.QDialog):
         """
         )
 
+        label_index = get_label_index()
         if start_index == -1:
             start_index = self.start_index
         if end_index == -1:
             end_index = self.end_index
+        label_files = {}
         for i, image_file in enumerate(self.image_file_list):
             if i < start_index - 1 or i > end_index - 1:
                 continue
             label_dir, filename = os.path.split(image_file)
             if self.parent.output_dir:
                 label_dir = self.parent.output_dir
-            label_file = os.path.join(
+            label_files[i] = os.path.join(
                 label_dir, os.path.splitext(filename)[0] + ".json"
             )
-            if not os.path.exists(label_file):
+        # One index query for the whole range instead of one per file
+        label_data = label_index.load_many(list(label_files.values()))
+        for i, label_file in label_files.items():
+            data = label_data.get(label_file)
+            if data is None:
                 continue
-            with open(label_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
             filename = data["imagePath"]
             shapes = data.get("shapes", [])
             for shape in shapes:
@@ -0,0 +1,42 @@
+"""Compare the SAHI merge functions with their loop reference versions.
+
+Usage: python scripts/benchmark_sahi_postprocess.py [num_predictions ...]
+"""
+
+import sys
+import time
+
+from anylabeling.services.auto_labeling.utils.sahi.postprocess.combine import (
+    greedy_nmm,
+    nmm,
+)
+from tests.test_utils.test_sahi_postprocess import (
+    random_predictions,
+    reference_greedy_nmm,
+    reference_nmm,
+)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'function':<12}{'boxes':>8}{'loop (s)':>12}{'new (s)':>12}")
+    for num in sizes:
+        predictions = random_predictions(num, size=num // 2 + 500)
+        for name, func, reference in [
+            ("greedy_nmm", greedy_nmm, reference_greedy_nmm),
+            ("nmm", nmm, reference_nmm),
+        ]:
+            expected, loop_time = timed(reference, predictions, "IOS", 0.5)
+            found, new_time = timed(func, predictions, "IOS", 0.5)
+            if list(found.items()) != list(expected.items()):
+                raise SystemExit(f"{name} differs from reference for {num}")
+            print(f"{name:<12}{num:>8}{loop_time:>12.3f}{new_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
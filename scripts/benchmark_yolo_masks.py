@@ -0,0 +1,66 @@
+"""Compare the ROI mask pipeline of YOLO segmentation models with the
+former full-frame version, from mask head outputs to polygons.
+
+yolov5_seg, yolov8_seg and yolo11_seg share this path: a 32 channel
+proto at a quarter of the input size. Peak memory is measured with
+tracemalloc, which sees NumPy and OpenCV output arrays.
+
+Usage: python scripts/benchmark_yolo_masks.py [num_instances ...]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from anylabeling.services.auto_labeling.__base__.yolo import YOLO
+from anylabeling.services.auto_labeling.utils import masks2segments
+from tests.test_utils.test_yolo_masks import (
+    random_mask_inputs,
+    reference_process_mask,
+)
+
+
+def reference_pipeline(*inputs):
+    return masks2segments(reference_process_mask(*inputs, upsample=True))
+
+
+def roi_pipeline(*inputs):
+    return masks2segments(YOLO.process_mask(*inputs, upsample=True))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024**2
+
+
+def main(sizes):
+    print(
+        f"{'input':>6}{'masks':>7}{'full (s)':>10}{'full (MB)':>11}"
+        f"{'roi (s)':>10}{'roi (MB)':>10}"
+    )
+    for input_size in [640, 1280]:
+        for num in sizes:
+            inputs = random_mask_inputs(
+                num,
+                (input_size // 4, input_size // 4),
+                (input_size, input_size),
+            )
+            expected, full_time, full_peak = measure(
+                reference_pipeline, *inputs
+            )
+            found, roi_time, roi_peak = measure(roi_pipeline, *inputs)
+            if len(found) != len(expected):
+                raise SystemExit(f"Segments differ for {num} masks")
+            print(
+                f"{input_size:>6}{num:>7}{full_time:>10.3f}{full_peak:>11.0f}"
+                f"{roi_time:>10.3f}{roi_peak:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 100])
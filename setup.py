@@ -111,6 +111,7 @@ setup(
     entry_points={
         "console_scripts": [
             "anylabeling=anylabeling.app:main",
+            "anylabeling-batch=anylabeling.services.auto_labeling.batch_engine:main",
         ],
     },
 )
@@ -0,0 +1,112 @@
+import json
+import os.path as osp
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QPointF
+
+from anylabeling.services.auto_labeling.batch_engine import (
+    BatchLabelingEngine,
+)
+from anylabeling.services.auto_labeling.types import AutoLabelingResult
+from anylabeling.views.labeling.label_file import LabelFile
+from anylabeling.views.labeling.shape import Shape
+
+
+def make_shape(label):
+    shape = Shape(label=label, shape_type="rectangle")
+    for x, y in [(1, 1), (5, 1), (5, 5), (1, 5)]:
+        shape.add_point(QPointF(x, y))
+    return shape
+
+
+class StubModel:
+    def __init__(self, fail_on=()):
+        self.fail_on = fail_on
+        self.calls = []
+
+    def supports_batch_inference(self):
+        return False
+
+    def predict_shapes(self, image, filename=None):
+        self.calls.append(osp.basename(filename))
+        if osp.basename(filename) in self.fail_on:
+            raise RuntimeError("inference failed")
+        return AutoLabelingResult([make_shape("cat")], replace=False)
+
+
+class TestBatchLabelingEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.image_files = []
+        for i in range(3):
+            path = osp.join(self.tmp_dir.name, f"img{i}.png")
+            cv2.imwrite(path, np.zeros((8, 10, 3), dtype=np.uint8))
+            self.image_files.append(path)
+        self.progress_file = osp.join(self.tmp_dir.name, ".progress")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def load_labels(self, image_file):
+        label_file = osp.splitext(image_file)[0] + ".json"
+        with open(label_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_resume_skips_done_images(self):
+        model = StubModel()
+        engine = BatchLabelingEngine(
+            model, self.image_files[:2], progress_file=self.progress_file
+        )
+        engine.run()
+        self.assertEqual(model.calls, ["img0.png", "img1.png"])
+
+        model = StubModel()
+        progress = []
+        engine = BatchLabelingEngine(
+            model,
+            self.image_files,
+            progress_file=self.progress_file,
+            on_progress=lambda *args: progress.append(args),
+        )
+        self.assertEqual(engine.pending_files(), self.image_files[2:])
+        engine.run()
+        self.assertEqual(model.calls, ["img2.png"])
+        self.assertEqual(progress, [(3, 3, self.image_files[2])])
+
+    def test_merge_keeps_previous_shapes(self):
+        LabelFile().save(
+            filename=osp.splitext(self.image_files[0])[0] + ".json",
+            shapes=[make_shape("dog").to_dict()],
+            image_path="img0.png",
+            image_data=None,
+            image_height=8,
+            image_width=10,
+            other_data={"description": "kept"},
+            flags={"reviewed": True},
+        )
+        BatchLabelingEngine(StubModel(), self.image_files[:1]).run()
+        data = self.load_labels(self.image_files[0])
+        self.assertEqual([s["label"] for s in data["shapes"]], ["dog", "cat"])
+        self.assertEqual(data["flags"], {"reviewed": True})
+        self.assertEqual(data["description"], "kept")
+        self.assertEqual(data["imageHeight"], 8)
+
+    def test_failures_are_counted_and_not_marked_done(self):
+        broken = osp.join(self.tmp_dir.name, "broken.png")
+        with open(broken, "wb") as f:
+            f.write(b"not an image")
+        engine = BatchLabelingEngine(
+            StubModel(fail_on=("img1.png",)),
+            self.image_files + [broken],
+            progress_file=self.progress_file,
+        )
+        engine.run()
+        self.assertEqual(engine.num_failed, 2)
+        self.assertEqual(engine.pending_files(), [self.image_files[1], broken])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import gc
+import unittest
+from argparse import Namespace
+
+import numpy as np
+
+from anylabeling.services.auto_labeling.trackers.basetrack import TrackState
+from anylabeling.services.auto_labeling.trackers.bot_sort import BOTrack
+from anylabeling.services.auto_labeling.trackers.byte_tracker import (
+    BYTETracker,
+    STrack,
+    TrackTable,
+)
+from anylabeling.services.auto_labeling.trackers.utils.kalman_filter import (
+    KalmanFilterXYAH,
+    KalmanFilterXYWH,
+)
+
+
+def make_tracks(track_cls, kalman_filter, table, n, rng):
+    tracks = []
+    for i in range(n):
+        xywh = np.array([*rng.uniform(50, 500, 2), *rng.uniform(10, 60, 2), i])
+        track = track_cls(xywh, 0.9, 0)
+        track.activate(kalman_filter, 1, table)
+        tracks.append(track)
+    return tracks
+
+
+class TestTrackTable(unittest.TestCase):
+    def test_rows_are_grown_and_reused(self):
+        table = TrackTable(capacity=2)
+        tracks = make_tracks(
+            STrack, KalmanFilterXYAH(), table, 5, np.random.default_rng(0)
+        )
+        self.assertEqual(len(table), 5)
+        self.assertGreaterEqual(len(table.mean), 5)
+        means = [track.mean.copy() for track in tracks]
+        for track, mean in zip(tracks, means):
+            np.testing.assert_array_equal(track.mean, mean)
+        del tracks, track
+        gc.collect()
+        self.assertEqual(len(table), 0)
+
+    def test_batched_updates_match_single_updates(self):
+        for track_cls, kalman_filter in [
+            (STrack, KalmanFilterXYAH()),
+            (BOTrack, KalmanFilterXYWH()),
+        ]:
+            rng = np.random.default_rng(1)
+            batched = make_tracks(
+                track_cls, kalman_filter, TrackTable(), 6, rng
+            )
+            rng = np.random.default_rng(1)
+            single = make_tracks(track_cls, kalman_filter, None, 6, rng)
+            for tracks in (batched, single):
+                tracks[2].mark_lost()
+            detections = [
+                track_cls(
+                    np.array([*rng.uniform(50, 500, 2), 30, 40, i]), 0.8, 1
+                )
+                for i in range(6)
+            ]
+
+            track_cls.multi_predict(batched)
+            STrack.multi_gmc(batched, np.array([[1, 0.1, 5], [0, 1, -3]]))
+            activated, refind = STrack.multi_update(batched, detections, 2)
+            self.assertEqual(refind, [batched[2]])
+
+            for track in single:
+                track.predict()
+            for track in single:
+                track.mean = (
+                    np.kron(np.eye(4), [[1, 0.1], [0, 1]]) @ track.mean
+                )
+                track.mean[:2] += [5, -3]
+                R8x8 = np.kron(np.eye(4), [[1, 0.1], [0, 1]])
+                track.covariance = R8x8 @ track.covariance @ R8x8.T
+            for track, det in zip(single, detections):
+                if track.state == TrackState.Tracked:
+                    track.update(det, 2)
+                else:
+                    track.re_activate(det, 2)
+
+            for a, b in zip(batched, single):
+                np.testing.assert_allclose(a.mean, b.mean)
+                np.testing.assert_allclose(a.covariance, b.covariance)
+                self.assertEqual(a.state, TrackState.Tracked)
+                self.assertEqual(a.cls, 1)
+
+
+class TestBYTETracker(unittest.TestCase):
+    def test_ids_are_stable(self):
+        args = Namespace(
+            track_high_thresh=0.5,
+            track_low_thresh=0.1,
+            new_track_thresh=0.6,
+            track_buffer=30,
+            match_thresh=0.8,
+            fuse_score=True,
+        )
+        tracker = BYTETracker(args)
+        start = np.array([[100, 100, 40, 40], [300, 200, 60, 30.0]])
+        ids = None
+        for frame in range(10):
+            xywh = start + [[3 * frame, 0, 0, 0], [0, 2 * frame, 0, 0]]
+            results = tracker.update(
+                np.array([0.9, 0.9]), xywh, np.array([0.0, 1.0])
+            )
+            if frame > 0:
+                self.assertEqual(len(results), 2)
+                if ids is None:
+                    ids = results[:, 4].tolist()
+                self.assertEqual(results[:, 4].tolist(), ids)
+        np.testing.assert_allclose(
+            results[0, :4], [107, 80, 147, 120], atol=0.5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os.path as osp
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper
+
+from anylabeling.services.auto_labeling.__base__.clip import ChineseClipONNX
+
+
+def save_model(path, inputs, outputs, nodes, initializers=()):
+    graph = helper.make_graph(
+        nodes, "graph", inputs, outputs, initializer=list(initializers)
+    )
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 7
+    onnx.save(model, path)
+
+
+class TestClipTextCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.txt_model = osp.join(self.tmp_dir.name, "txt.onnx")
+        self.img_model = osp.join(self.tmp_dir.name, "img.onnx")
+        weight = np.random.default_rng(0).normal(size=(52, 3))
+        save_model(
+            self.txt_model,
+            [
+                helper.make_tensor_value_info(
+                    "t", TensorProto.INT64, [None, 52]
+                )
+            ],
+            [helper.make_tensor_value_info("f", TensorProto.FLOAT, [None, 3])],
+            [
+                helper.make_node("Cast", ["t"], ["c"], to=TensorProto.FLOAT),
+                helper.make_node("MatMul", ["c", "w"], ["f"]),
+            ],
+            [helper.make_tensor("w", TensorProto.FLOAT, [52, 3], weight.flat)],
+        )
+        save_model(
+            self.img_model,
+            [
+                helper.make_tensor_value_info(
+                    "i", TensorProto.FLOAT, [None, 3, 224, 224]
+                )
+            ],
+            [helper.make_tensor_value_info("f", TensorProto.FLOAT, [None, 3])],
+            [
+                helper.make_node(
+                    "ReduceMean", ["i"], ["f"], axes=[2, 3], keepdims=0
+                )
+            ],
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_clip(self):
+        clip = ChineseClipONNX(
+            self.txt_model,
+            self.img_model,
+            "ViT-B-16",
+            text_cache_dir=osp.join(self.tmp_dir.name, "cache"),
+        )
+        calls = []
+        encode_text = clip.encode_text
+        clip.encode_text = lambda text: calls.append(text) or encode_text(text)
+        return clip, calls
+
+    def test_text_features_are_cached(self):
+        classes = ["cat", "dog", "person"]
+        clip, calls = self.create_clip()
+        features = clip.txt_pipeline(classes)
+        self.assertEqual(features.shape, (3, 3))
+        np.testing.assert_allclose(np.linalg.norm(features, axis=1), 1.0)
+        clip.txt_pipeline(classes)
+        self.assertEqual(len(calls), 1)
+
+        clip, calls = self.create_clip()
+        np.testing.assert_array_equal(clip.txt_pipeline(classes), features)
+        self.assertEqual(calls, [])
+        clip.txt_pipeline(classes[:2])
+        self.assertEqual(len(calls), 1)
+
+    def test_batched_image_crops(self):
+        clip, _ = self.create_clip()
+        rng = np.random.default_rng(1)
+        crops = [
+            rng.integers(0, 255, (h, 40, 3)).astype(np.uint8) for h in (30, 50)
+        ]
+        batched = clip(crops, ["cat", "dog"])
+        self.assertEqual(batched.shape, (2, 2))
+        for crop, probabilities in zip(crops, batched):
+            np.testing.assert_allclose(
+                clip(crop, ["cat", "dog"])[0], probabilities, rtol=1e-5
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
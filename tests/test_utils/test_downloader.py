@@ -0,0 +1,144 @@
+import hashlib
+import os
+import os.path as osp
+import re
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from anylabeling.services.auto_labeling.downloader import (
+    DownloadError,
+    ModelDownloader,
+)
+
+PAYLOAD = os.urandom(100_000)
+RANGE_PATTERN = re.compile(r"bytes=(\d+)-(\d+)")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.headers.get("Range"))
+        match = RANGE_PATTERN.match(self.headers.get("Range") or "")
+        if match is None or not server.ranges:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+            return
+        start, end = int(match.group(1)), int(match.group(2))
+        body = PAYLOAD[start : end + 1]
+        self.send_response(206)
+        self.send_header(
+            "Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}"
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        with server.lock:
+            drop = start in server.drop_once
+            server.drop_once.discard(start)
+        if drop:
+            # Close the connection in the middle of the body
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class TestModelDownloader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = osp.join(self.tmp_dir.name, "models", "model.onnx")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.ranges = True
+        self.server.drop_once = set()
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/model.onnx"
+        self.sha256 = hashlib.sha256(PAYLOAD).hexdigest()
+        self.downloader = ModelDownloader(num_workers=3, chunk_size=16_384)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_parallel_download_with_retry(self):
+        self.server.drop_once = {32_768}
+        progress = []
+        sha256 = self.downloader.download(
+            self.url,
+            self.path,
+            sha256=self.sha256,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+        self.assertEqual(sha256, self.sha256)
+        self.assertEqual(self.read(), PAYLOAD)
+        self.assertEqual(progress[-1], (len(PAYLOAD), len(PAYLOAD)))
+        # Probe, 7 chunks and the rest of the dropped one
+        self.assertEqual(len(self.server.requests), 9)
+        self.assertIn("bytes=40960-49151", self.server.requests)
+        self.assertEqual(os.listdir(osp.dirname(self.path)), ["model.onnx"])
+
+    def test_resume(self):
+        self.server.drop_once = {49_152}
+        downloader = ModelDownloader(num_workers=1, chunk_size=16_384)
+        downloader.retries = 1
+        with self.assertRaises(DownloadError):
+            downloader.download(self.url, self.path)
+        self.assertFalse(osp.exists(self.path))
+
+        self.server.requests.clear()
+        self.downloader.download(self.url, self.path, sha256=self.sha256)
+        self.assertEqual(self.read(), PAYLOAD)
+        # Chunks finished before the failure are not fetched again
+        self.assertIn("bytes=49152-65535", self.server.requests)
+        for start in range(0, 49_152, 16_384):
+            self.assertNotIn(
+                f"bytes={start}-{start + 16_383}", self.server.requests
+            )
+
+    def test_checksum_mismatch(self):
+        with self.assertRaises(DownloadError):
+            self.downloader.download(self.url, self.path, sha256="0" * 64)
+        self.assertEqual(os.listdir(osp.dirname(self.path)), [])
+
+    def test_without_ranges(self):
+        self.server.ranges = False
+        self.downloader.download(self.url, self.path, sha256=self.sha256)
+        self.assertEqual(self.read(), PAYLOAD)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_concurrent_requests_share_a_download(self):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.downloader.download(self.url, self.path)
+                )
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [self.sha256] * 3)
+        self.assertEqual(len(self.server.requests), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
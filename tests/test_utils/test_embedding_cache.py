@@ -0,0 +1,103 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+import numpy as np
+
+from anylabeling.services.auto_labeling.embedding_cache import (
+    EmbeddingDiskStore,
+)
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class TestEmbeddingDiskStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = osp.join(self.tmp_dir.name, "store")
+        self.images = []
+        for i in range(3):
+            path = osp.join(self.tmp_dir.name, f"img{i}.jpg")
+            write(path, bytes([i]) * 64)
+            self.images.append(path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def embedding(self, size=1000):
+        return {
+            "image_embedding": np.arange(size, dtype=np.float32),
+            "original_size": (480, 640),
+            "scale": 0.5,
+        }
+
+    def test_round_trip(self):
+        store = EmbeddingDiskStore("model", root=self.root)
+        store.put(self.images[0], self.embedding())
+        embedding = EmbeddingDiskStore("model", root=self.root).get(
+            self.images[0]
+        )
+        np.testing.assert_array_equal(
+            embedding["image_embedding"], np.arange(1000, dtype=np.float32)
+        )
+        self.assertEqual(embedding["original_size"], (480, 640))
+        self.assertEqual(embedding["scale"], 0.5)
+
+    def test_content_hash_key(self):
+        store = EmbeddingDiskStore("model", root=self.root)
+        store.put(self.images[0], self.embedding())
+        copy = osp.join(self.tmp_dir.name, "copy.jpg")
+        write(copy, bytes([0]) * 64)
+        self.assertTrue(store.contains(copy))
+
+        # New bytes under the same name are a miss
+        write(self.images[0], bytes([7]) * 64)
+        os.utime(self.images[0], ns=(0, 0))
+        self.assertFalse(store.contains(self.images[0]))
+
+    def test_evict_by_bytes(self):
+        store = EmbeddingDiskStore("model", root=self.root, max_bytes=10000)
+        for i, image in enumerate(self.images[:2]):
+            store.put(image, self.embedding())
+            os.utime(osp.join(store.root, store.key(image)), ns=(i, i))
+        # Reading refreshes the entry, so the untouched one goes first
+        store.get(self.images[0])
+        store.put(self.images[2], self.embedding())
+        self.assertLessEqual(store.total_bytes, store.max_bytes)
+        self.assertTrue(store.contains(self.images[0]))
+        self.assertFalse(store.contains(self.images[1]))
+        self.assertTrue(store.contains(self.images[2]))
+
+    def test_unserializable_value(self):
+        store = EmbeddingDiskStore("model", root=self.root)
+        store.put(self.images[0], {"callback": object()})
+        self.assertFalse(store.contains(self.images[0]))
+        self.assertEqual(os.listdir(store.root), [])
+
+    def test_model_id_tracks_encoder_file(self):
+        encoder = osp.join(self.tmp_dir.name, "encoder.onnx")
+        write(encoder, b"weights")
+        config = {
+            "type": "segment_anything",
+            "name": "sam",
+            "input_size": 1024,
+            "embedding_cache_dir": self.root,
+        }
+        store = EmbeddingDiskStore.from_model_config(config, encoder)
+        self.assertEqual(
+            EmbeddingDiskStore.from_model_config(config, encoder).model_id,
+            store.model_id,
+        )
+        write(encoder, b"new weights")
+        self.assertNotEqual(
+            EmbeddingDiskStore.from_model_config(config, encoder).model_id,
+            store.model_id,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from PyQt5.QtCore import Qt
+
+from anylabeling.views.labeling.widgets.file_list_widget import FileListModel
+
+
+class TestFileListModel(unittest.TestCase):
+    def test_set_and_add_files(self):
+        model = FileListModel()
+        model.set_files(["a.jpg", "b.jpg", "a.jpg"], [True, False, False])
+        self.assertEqual(model.files, ["a.jpg", "b.jpg"])
+        self.assertEqual(model.rowCount(), 2)
+
+        model.add_files(["b.jpg", "c.jpg"], [True, True])
+        self.assertEqual(model.files, ["a.jpg", "b.jpg", "c.jpg"])
+        self.assertEqual(model.index_of("c.jpg"), 2)
+        self.assertIsNone(model.index_of("d.jpg"))
+        self.assertIn("a.jpg", model)
+
+    def test_check_state(self):
+        model = FileListModel()
+        model.set_files(["a.jpg", "b.jpg"], [True, False])
+        self.assertTrue(model.is_checked(0))
+        self.assertFalse(model.is_checked(1))
+
+        model.set_checked("b.jpg", True)
+        model.set_checked("missing.jpg", True)
+        self.assertEqual(
+            model.data(model.index(1), Qt.CheckStateRole), Qt.Checked
+        )
+
+        model.clear()
+        self.assertEqual(len(model), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
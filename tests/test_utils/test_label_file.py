@@ -0,0 +1,67 @@
+import json
+import os.path as osp
+import tempfile
+import unittest
+
+import numpy as np
+import PIL.Image
+
+from anylabeling.views.labeling.label_file import LabelFile
+
+
+class TestLabelFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.image_file = osp.join(self.tmp_dir.name, "image.png")
+        PIL.Image.fromarray(np.zeros((30, 40, 3), np.uint8)).save(
+            self.image_file
+        )
+        self.label_file = osp.join(self.tmp_dir.name, "image.json")
+        shape = {
+            "label": "cat",
+            "points": [[1, 1], [5, 1], [5, 5], [1, 5]],
+            "group_id": None,
+            "description": "",
+            "shape_type": "rectangle",
+            "flags": {},
+        }
+        LabelFile().save(
+            self.label_file,
+            shapes=[shape],
+            image_path="image.png",
+            image_height=10,
+            image_width=40,
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load(self):
+        label_file = LabelFile(self.label_file)
+        self.assertEqual(len(label_file.shapes), 1)
+        with open(self.image_file, "rb") as f:
+            self.assertEqual(label_file.image_data, f.read())
+
+    def test_load_shapes_only(self):
+        label_file = LabelFile(self.label_file, load_image=False)
+        self.assertEqual(label_file.shapes[0].label, "cat")
+        self.assertIsNone(label_file.image_data)
+
+    def test_save_fixes_size_from_image_header(self):
+        with open(self.image_file, "rb") as f:
+            image_data = f.read()
+        LabelFile().save(
+            self.label_file,
+            shapes=[],
+            image_path="image.png",
+            image_height=10,
+            image_width=40,
+            image_data=image_data,
+        )
+        with open(self.label_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual((data["imageHeight"], data["imageWidth"]), (30, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+from anylabeling.views.labeling.label_index import LabelIndex
+
+
+class TestLabelIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = LabelIndex(osp.join(self.tmp_dir.name, "index.sqlite"))
+        self.label_file = osp.join(self.tmp_dir.name, "a.json")
+        self.write({"shapes": [{"label": "cat"}], "imageData": "abc"})
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def write(self, data):
+        with open(self.label_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def test_load_and_invalidate(self):
+        data = self.index.load(self.label_file)
+        self.assertEqual(data["shapes"][0]["label"], "cat")
+        self.assertIsNone(data["imageData"])
+
+        # Served from the index while the file is unchanged
+        stat = os.stat(self.label_file)
+        self.index.update(self.label_file, {"shapes": [], "imageData": None})
+        self.assertEqual(self.index.load(self.label_file)["shapes"], [])
+
+        self.write({"shapes": [{"label": "dog"}, {"label": "cat"}]})
+        os.utime(self.label_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        data = self.index.load(self.label_file)
+        self.assertEqual(len(data["shapes"]), 2)
+
+    def test_missing_file(self):
+        missing = osp.join(self.tmp_dir.name, "missing.json")
+        results = self.index.load_many([self.label_file, missing])
+        self.assertEqual(list(results), [self.label_file])
+        self.assertIsNone(self.index.load(missing))
+
+
+if __name__ == "__main__":
+    unittest.main()
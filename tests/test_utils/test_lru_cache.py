@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from anylabeling.services.auto_labeling.lru_cache import LRUCache
+
+
+class DictStore:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def put(self, key, value):
+        self.data[key] = value
+
+    def contains(self, key):
+        return key in self.data
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evict_by_count(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertTrue(cache.find("a"))
+        self.assertFalse(cache.find("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_evict_by_bytes(self):
+        cache = LRUCache(maxsize=None, max_bytes=1000)
+        for key in range(4):
+            cache.put(key, {"embedding": np.zeros(100, dtype=np.float32)})
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(cache.total_bytes, 800)
+
+    def test_spill_to_second_tier(self):
+        store = DictStore()
+        cache = LRUCache(maxsize=1, second_tier=store)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertIn("a", store.data)
+        self.assertEqual(cache.get("a"), 1)
+        stats = cache.stats()
+        self.assertEqual(stats["spills"], 2)
+        self.assertEqual(stats["second_tier_hits"], 1)
+
+    def test_get_or_compute_single_flight(self):
+        cache = LRUCache(maxsize=4)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get_or_compute("key", compute)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 4)
@@ -0,0 +1,167 @@
+import ast
+import os.path as osp
+import unittest
+
+import yaml
+from PyQt5.QtCore import QObject
+
+from anylabeling.services.auto_labeling import model_registry
+from anylabeling.services.auto_labeling.model_manager import ModelManager
+from anylabeling.services.auto_labeling.model_pool import ModelPool
+
+
+class FakeModel:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+        self.unloaded = False
+
+    def get_memory_footprint(self):
+        return self.nbytes
+
+    def unload(self):
+        self.unloaded = True
+
+
+class FakeTracker(FakeModel):
+    def __init__(self, model_config, on_message=None):
+        super().__init__(100)
+        self.tracks = []
+
+    def set_auto_labeling_reset_tracker(self):
+        self.tracks = []
+
+
+def make_config(name, nbytes=100):
+    return {"type": "yolov8", "config_file": name, "model": FakeModel(nbytes)}
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_registry_covers_default_models(self):
+        configs_dir = osp.join(
+            osp.dirname(model_registry.__file__),
+            "..",
+            "..",
+            "configs",
+            "auto_labeling",
+        )
+        with open(osp.join(configs_dir, "models.yaml"), encoding="utf-8") as f:
+            config_files = [m["config_file"] for m in yaml.safe_load(f)]
+        for config_file in config_files:
+            path = osp.join(configs_dir, config_file.replace(":/", ""))
+            with open(path, encoding="utf-8") as f:
+                model_type = yaml.safe_load(f)["type"]
+            self.assertIn(model_type, model_registry.MODEL_REGISTRY)
+
+    def test_registered_classes_exist(self):
+        package_dir = osp.dirname(model_registry.__file__)
+        for model_type, spec in model_registry.MODEL_REGISTRY.items():
+            module_file = osp.join(package_dir, f"{model_type}.py")
+            with open(module_file, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            classes = {
+                node.name
+                for node in tree.body
+                if isinstance(node, ast.ClassDef)
+            }
+            self.assertIn(spec.class_name, classes, model_type)
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            model_registry.get_model_spec("unknown")
+
+
+class TestModelPool(unittest.TestCase):
+    def test_lru_eviction(self):
+        pool = ModelPool(max_models=2)
+        configs = [make_config(name) for name in "abc"]
+        for config in configs:
+            pool.release(ModelPool.make_key(config), config)
+        self.assertEqual(len(pool), 2)
+        self.assertTrue(configs[0]["model"].unloaded)
+
+        key = ModelPool.make_key(make_config("b"))
+        self.assertIs(pool.acquire(key), configs[1])
+        self.assertIsNone(pool.acquire(key))
+        self.assertFalse(configs[1]["model"].unloaded)
+
+    def test_memory_budget(self):
+        pool = ModelPool(max_models=5, max_bytes=250)
+        configs = [make_config(name) for name in "abc"]
+        for config in configs:
+            pool.release(ModelPool.make_key(config), config)
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.total_bytes, 200)
+        self.assertTrue(configs[0]["model"].unloaded)
+
+        too_large = make_config("d", nbytes=1000)
+        pool.release(ModelPool.make_key(too_large), too_large)
+        self.assertTrue(too_large["model"].unloaded)
+        pool.clear()
+        self.assertTrue(all(c["model"].unloaded for c in configs))
+
+    def test_disabled(self):
+        pool = ModelPool(max_models=0)
+        config = make_config("a")
+        pool.release(ModelPool.make_key(config), config)
+        self.assertTrue(config["model"].unloaded)
+        self.assertEqual(len(pool), 0)
+
+    def test_key_ignores_last_used(self):
+        config = make_config("a")
+        key = ModelPool.make_key(config)
+        config["last_used"] = 123.0
+        self.assertEqual(ModelPool.make_key(config), key)
+        config["score_threshold"] = 0.5
+        self.assertNotEqual(ModelPool.make_key(config), key)
+
+    def test_discard(self):
+        pool = ModelPool()
+        config = make_config("a")
+        pool.release(ModelPool.make_key(config), config)
+        pool.discard(ModelPool.make_key(config))
+        pool.discard("missing")
+        self.assertTrue(config["model"].unloaded)
+        self.assertEqual(len(pool), 0)
+
+
+class TestModelManagerPool(unittest.TestCase):
+    def setUp(self):
+        model_registry.register_model("fake_tracker", "FakeTracker", __name__)
+        # Skip __init__, which reads the user config and model list
+        self.manager = ModelManager.__new__(ModelManager)
+        QObject.__init__(self.manager)
+        self.manager.model_configs = [
+            {"type": "fake_tracker", "config_file": name} for name in "ab"
+        ] + [{"type": "unknown", "config_file": "c"}]
+        self.manager.loaded_model_config = None
+        self.manager.model_pool = ModelPool(max_models=2)
+
+    def tearDown(self):
+        del model_registry.MODEL_REGISTRY["fake_tracker"]
+
+    def test_switch_pools_and_unload_frees(self):
+        first = self.manager._load_model(0)["model"]
+        first.tracks.append("track")
+        self.manager._load_model(1)
+        self.assertFalse(first.unloaded)
+        self.assertEqual(len(self.manager.model_pool), 1)
+
+        # Switching back reuses the pooled model without its old tracks
+        self.assertIs(self.manager._load_model(0)["model"], first)
+        self.assertEqual(first.tracks, [])
+
+        self.manager.unload_model()
+        self.assertTrue(first.unloaded)
+        self.assertIsNone(self.manager.loaded_model_config)
+        self.assertNotIn(
+            ModelPool.make_key(self.manager.model_configs[0]),
+            self.manager.model_pool,
+        )
+
+    def test_unknown_type(self):
+        self.assertIsNone(self.manager._load_model(2))
+        self.assertIsNone(self.manager.loaded_model_config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+from anylabeling.services.auto_labeling.model_store import (
+    get_manifest_path,
+    get_variant_path,
+    read_manifest,
+    remove_model_file,
+    sha256sum,
+    verify_model_file,
+    write_manifest,
+)
+
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_file = osp.join(self.tmp_dir.name, "model.onnx")
+        with open(self.model_file, "wb") as f:
+            f.write(b"weights" * 1000)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_verify(self):
+        self.assertFalse(verify_model_file(self.model_file))
+        manifest = write_manifest(self.model_file, url="http://host/m")
+        self.assertEqual(manifest["sha256"], sha256sum(self.model_file))
+        self.assertEqual(
+            read_manifest(self.model_file)["url"], "http://host/m"
+        )
+        self.assertTrue(verify_model_file(self.model_file))
+
+        # Same content with a new mtime is hashed again and accepted
+        stat = os.stat(self.model_file)
+        os.utime(self.model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertTrue(verify_model_file(self.model_file))
+        self.assertEqual(
+            read_manifest(self.model_file)["mtime_ns"],
+            stat.st_mtime_ns + 1,
+        )
+
+        with open(self.model_file, "r+b") as f:
+            f.write(b"W")
+        os.utime(self.model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2))
+        self.assertFalse(verify_model_file(self.model_file))
+
+        with open(self.model_file, "ab") as f:
+            f.write(b"more")
+        self.assertFalse(verify_model_file(self.model_file))
+
+    def test_remove_with_variants(self):
+        write_manifest(self.model_file)
+        variant = get_variant_path(self.model_file, "optimized-0123")
+        self.assertEqual(
+            osp.basename(variant), "model.ort-optimized-0123.onnx"
+        )
+        sibling = osp.join(self.tmp_dir.name, "model.decoder.onnx")
+        for filename in [variant, sibling]:
+            with open(filename, "wb") as f:
+                f.write(b"x")
+        remove_model_file(self.model_file)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["model.decoder.onnx"])
+        self.assertFalse(osp.exists(get_manifest_path(self.model_file)))
+
+
+if __name__ == "__main__":
+    unittest.main()
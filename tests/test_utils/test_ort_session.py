@@ -0,0 +1,128 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+from onnx import TensorProto, helper
+
+from anylabeling.services.auto_labeling.engines.ort_session import (
+    build_session_options,
+    create_session,
+    get_optimized_model_path,
+    get_session_profile,
+    get_tuning_candidates,
+    use_session_profile,
+)
+from anylabeling.services.auto_labeling.model_store import write_manifest
+
+
+class TestOrtSession(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = osp.join(self.tmp_dir.name, "cache")
+        self.model_path = osp.join(self.tmp_dir.name, "model.onnx")
+        weight = np.random.default_rng(0).normal(size=(4, 4))
+        graph = helper.make_graph(
+            [
+                helper.make_node("MatMul", ["x", "w"], ["m"]),
+                helper.make_node("Relu", ["m"], ["y"]),
+            ],
+            "graph",
+            [helper.make_tensor_value_info("x", TensorProto.FLOAT, [None, 4])],
+            [helper.make_tensor_value_info("y", TensorProto.FLOAT, [None, 4])],
+            initializer=[
+                helper.make_tensor(
+                    "w",
+                    TensorProto.FLOAT,
+                    [4, 4],
+                    weight.astype(np.float32).ravel(),
+                )
+            ],
+        )
+        model = helper.make_model(
+            graph, opset_imports=[helper.make_opsetid("", 13)]
+        )
+        model.ir_version = 7
+        helper.set_model_props(model, {"kpt_shape": "[17, 3]"})
+        onnx.save(model, self.model_path)
+        self.x = np.ones((2, 4), np.float32)
+        self.expected = np.maximum(self.x @ weight.astype(np.float32), 0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_profile_layers(self):
+        self.assertEqual(get_session_profile()["intra_op_num_threads"], 0)
+        with use_session_profile({"intra_op_num_threads": 2}):
+            profile = get_session_profile({"execution_mode": "parallel"})
+        self.assertEqual(profile["intra_op_num_threads"], 2)
+        self.assertEqual(profile["execution_mode"], "parallel")
+        self.assertEqual(get_session_profile()["intra_op_num_threads"], 0)
+
+        sess_opts = build_session_options(profile, log_severity_level=3)
+        self.assertEqual(sess_opts.intra_op_num_threads, 2)
+        self.assertEqual(
+            sess_opts.execution_mode, ort.ExecutionMode.ORT_PARALLEL
+        )
+        with self.assertRaises(ValueError):
+            build_session_options({**profile, "execution_mode": "fast"})
+
+    def test_optimized_model_cache(self):
+        profile = {"optimized_model_cache": True}
+        providers = ["CPUExecutionProvider"]
+        optimized_path = get_optimized_model_path(
+            self.model_path,
+            providers,
+            get_session_profile(profile),
+            self.cache_dir,
+        )
+        for _ in range(2):
+            session = create_session(
+                self.model_path, profile=profile, cache_dir=self.cache_dir
+            )
+            self.assertTrue(osp.exists(optimized_path))
+            (y,) = session.run(None, {"x": self.x})
+            np.testing.assert_allclose(y, self.expected, rtol=1e-5)
+        self.assertEqual(
+            os.listdir(self.cache_dir), [osp.basename(optimized_path)]
+        )
+
+    def test_quantized_variant_next_to_downloaded_model(self):
+        write_manifest(self.model_path)
+        profile = {"quantization": "dynamic", "optimized_model_cache": True}
+        for _ in range(2):
+            session = create_session(self.model_path, profile=profile)
+            (y,) = session.run(None, {"x": self.x})
+            np.testing.assert_allclose(y, self.expected, atol=0.1)
+            metadata = session.get_modelmeta().custom_metadata_map
+            self.assertEqual(metadata["kpt_shape"], "[17, 3]")
+        variants = sorted(
+            f for f in os.listdir(self.tmp_dir.name) if ".ort-" in f
+        )
+        self.assertEqual(len(variants), 2)
+        self.assertTrue(variants[0].startswith("model.ort-dynamic-quantized-"))
+        self.assertTrue(
+            variants[1].startswith("model.ort-dynamic-quantized-")
+            and ".ort-optimized-" in variants[1]
+        )
+
+    def test_auto_tune(self):
+        self.assertEqual(
+            get_tuning_candidates(1)[0]["intra_op_num_threads"], 1
+        )
+        self.assertEqual(len(get_tuning_candidates(8)), 4)
+        session = create_session(
+            self.model_path,
+            profile={"auto_tune": True},
+            cache_dir=self.cache_dir,
+        )
+        (y,) = session.run(None, {"x": self.x})
+        np.testing.assert_allclose(y, self.expected, rtol=1e-5)
+        self.assertTrue(osp.exists(osp.join(self.cache_dir, "auto_tune.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os.path as osp
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from anylabeling.services.auto_labeling import ppocr_v4
+from anylabeling.services.auto_labeling.ppocr_v4 import PPOCRv4
+from anylabeling.services.auto_labeling.utils.ppocr_utils.text_system import (
+    TextSystem,
+)
+
+
+class FakeSession:
+    """Stands in for an ORT session; `forward` maps a batch to outputs"""
+
+    def __init__(self, forward, shape):
+        self.forward = forward
+        self.input = SimpleNamespace(name="x", shape=shape)
+        self.batch_sizes = []
+
+    def get_inputs(self):
+        return [self.input]
+
+    def run(self, output_names, input_dict):
+        blob = input_dict["x"]
+        self.batch_sizes.append(len(blob))
+        return [self.forward(blob)]
+
+
+def detect(blob):
+    # bright pixels are text
+    return 1 / (1 + np.exp(-5 * blob.mean(axis=1, keepdims=True)))
+
+
+def recognize(blob):
+    # one character per 8 columns, its class given by the crop brightness
+    columns = blob.mean(axis=(1, 2))[:, ::8]
+    classes = np.clip((columns * 4 + 5).astype(int), 1, 20)
+    probs = np.full((*classes.shape, 6625), 1e-3, dtype=np.float32)
+    np.put_along_axis(probs, classes[..., None], 1.0, axis=2)
+    probs[columns < -0.9] = 0
+    probs[columns < -0.9, 0] = 1.0
+    return probs
+
+
+class TestPPOCRBatch(unittest.TestCase):
+    def setUp(self):
+        self.det_net = FakeSession(detect, ["n", 3, "h", "w"])
+        self.rec_net = FakeSession(recognize, ["n", 3, 48, "w"])
+        model = SimpleNamespace(
+            det_net=self.det_net,
+            rec_net=self.rec_net,
+            cls_net=None,
+            drop_score=0.5,
+            use_angle_cls=False,
+            current_dir=osp.dirname(ppocr_v4.__file__),
+            rec_char_dict="ppocr_keys_v1.txt",
+        )
+        self.text_sys = TextSystem(PPOCRv4.parse_args(model))
+        self.images = []
+        rng = np.random.default_rng(0)
+        for num_lines in (3, 1, 0, 5, 2):
+            image = np.zeros((480, 640, 3), np.uint8)
+            for line in range(num_lines):
+                y = 40 + line * 80
+                width = int(rng.integers(150, 500))
+                value = int(rng.integers(120, 255))
+                image[y : y + 30, 50 : 50 + width] = value
+            self.images.append(image)
+
+    def test_batch_matches_single_image_results(self):
+        expected = [self.text_sys(image) for image in self.images]
+        self.det_net.batch_sizes.clear()
+        results = self.text_sys.batch(
+            self.images + [None], det_batch_num=3, rec_pool_size=4
+        )
+        self.assertEqual(self.det_net.batch_sizes, [3, 2])
+        self.assertEqual(results[-1], (None, None, None))
+        for (boxes, rec_res, scores), expected_result in zip(
+            results, expected
+        ):
+            expected_boxes, expected_rec_res, _ = expected_result
+            self.assertEqual(len(boxes), len(expected_boxes))
+            for box, expected_box in zip(boxes, expected_boxes):
+                np.testing.assert_array_equal(box, expected_box)
+            self.assertEqual(
+                [text for text, _ in rec_res],
+                [text for text, _ in expected_rec_res],
+            )
+        self.assertEqual([len(r[0]) for r in results[:-1]], [3, 1, 0, 5, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+
+from anylabeling.services.auto_labeling.lru_cache import LRUCache
+from anylabeling.services.auto_labeling.prefetcher import EmbeddingPrefetcher
+
+
+class BlockingEncoder:
+    """Records encoded files; encoding blocks until `release` is set."""
+
+    def __init__(self):
+        self.encoded = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def __call__(self, filename):
+        self.started.set()
+        self.release.wait(5)
+        with self.lock:
+            self.encoded.append(filename)
+        return {"embedding": filename}
+
+
+class TestEmbeddingPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(maxsize=10)
+        self.encoder = BlockingEncoder()
+        self.prefetcher = EmbeddingPrefetcher(self.cache, self.encoder)
+
+    def tearDown(self):
+        self.encoder.release.set()
+        self.prefetcher.stop()
+
+    def wait_for(self, files):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if all(self.cache.find(f) for f in files):
+                return
+            time.sleep(0.01)
+        self.fail(f"{files} were not prefetched")
+
+    def test_reschedule_drops_stale_jobs(self):
+        self.prefetcher.schedule(["a", "b", "c"])
+        self.assertTrue(self.encoder.started.wait(5))
+        # The user moved on while "a" is being encoded
+        self.prefetcher.schedule(["d", "a", "e", "d"])
+        self.encoder.release.set()
+        self.wait_for(["a", "d", "e"])
+        self.assertEqual(self.encoder.encoded, ["a", "d", "e"])
+        self.assertFalse(self.cache.find("b"))
+
+    def test_shares_running_encode_with_interactive_path(self):
+        self.prefetcher.schedule(["a"])
+        self.assertTrue(self.encoder.started.wait(5))
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                self.cache.get_or_compute("a", lambda: self.encoder("a"))
+            )
+        )
+        thread.start()
+        self.encoder.release.set()
+        thread.join(5)
+        self.assertEqual(result, [{"embedding": "a"}])
+        self.assertEqual(self.encoder.encoded, ["a"])
+
+    def test_multiple_workers(self):
+        self.encoder.release.set()
+        prefetcher = EmbeddingPrefetcher(
+            self.cache, self.encoder, num_workers=3
+        )
+        files = [f"img{i}" for i in range(6)]
+        prefetcher.schedule(files)
+        self.wait_for(files)
+        prefetcher.stop()
+        self.assertEqual(len(prefetcher.workers), 3)
+        self.assertEqual(sorted(self.encoder.encoded), files)
+
+    def test_stop(self):
+        self.prefetcher.stop()
+        self.prefetcher.schedule(["a"])
+        self.assertEqual(self.prefetcher.workers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from anylabeling.services.auto_labeling.utils.sahi.postprocess.combine import (
+    GreedyNMMPostprocess,
+    batched_greedy_nmm,
+    greedy_nmm,
+    nmm,
+    nms,
+)
+from anylabeling.services.auto_labeling.utils.sahi.prediction import (
+    ObjectPrediction,
+)
+
+
+def _match_values(predictions, idx, others, match_metric):
+    x1, y1, x2, y2 = (predictions[:, i] for i in range(4))
+    areas = (x2 - x1) * (y2 - y1)
+    w = np.maximum(
+        np.minimum(x2[others], x2[idx]) - np.maximum(x1[others], x1[idx]), 0.0
+    )
+    h = np.maximum(
+        np.minimum(y2[others], y2[idx]) - np.maximum(y1[others], y1[idx]), 0.0
+    )
+    inter = w * h
+    if match_metric == "IOU":
+        return inter / ((areas[others] - inter) + areas[idx])
+    return inter / np.minimum(areas[others], areas[idx])
+
+
+def reference_greedy_nmm(predictions, match_metric, match_threshold):
+    """Loop implementation the vectorised greedy_nmm replaced."""
+    keep_to_merge_list = {}
+    scores = predictions[:, 4]
+    order = np.argsort(-scores, kind="stable")[::-1]
+    while len(order) > 0:
+        idx = order[-1]
+        order = order[:-1]
+        if len(order) == 0:
+            keep_to_merge_list[int(idx)] = []
+            break
+        values = _match_values(predictions, idx, order, match_metric)
+        mask = values < match_threshold
+        keep_to_merge_list[int(idx)] = order[~mask].tolist()
+        order = order[mask]
+    return keep_to_merge_list
+
+
+def reference_nmm(predictions, match_metric, match_threshold):
+    """Loop implementation the vectorised nmm replaced."""
+    keep_to_merge_list = {}
+    merge_to_keep = {}
+    order = np.argsort(-predictions[:, 4], kind="stable")
+    for pred_ind in order.tolist():
+        others = order[order != pred_ind]
+        values = _match_values(predictions, pred_ind, others, match_metric)
+        matched = others[~(values < match_threshold)].tolist()
+        if pred_ind not in merge_to_keep:
+            keep_to_merge_list[pred_ind] = []
+            for ind in matched:
+                if ind not in merge_to_keep:
+                    keep_to_merge_list[pred_ind].append(ind)
+                    merge_to_keep[ind] = pred_ind
+        else:
+            keep = merge_to_keep[pred_ind]
+            for ind in matched:
+                if ind not in keep_to_merge_list and ind not in merge_to_keep:
+                    keep_to_merge_list[keep].append(ind)
+                    merge_to_keep[ind] = keep
+    return keep_to_merge_list
+
+
+def random_predictions(num, seed=0, size=2000, num_categories=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, size, (num // 4 + 1, 2))
+    xy = centers[rng.integers(0, len(centers), num)]
+    xy += rng.normal(0, 8, (num, 2))
+    wh = rng.uniform(10, 80, (num, 2))
+    predictions = np.zeros((num, 6), dtype=np.float32)
+    predictions[:, :2] = xy
+    predictions[:, 2:4] = xy + wh
+    predictions[:, 4] = rng.permutation(num) / num
+    predictions[:, 5] = rng.integers(0, num_categories, num)
+    return predictions
+
+
+class TestSahiPostprocess(unittest.TestCase):
+    def setUp(self):
+        self.predictions = random_predictions(600)
+
+    def test_greedy_nmm_and_nms_match_reference(self):
+        for metric, threshold in [("IOU", 0.5), ("IOS", 0.3), ("IOU", 0.0)]:
+            expected = reference_greedy_nmm(
+                self.predictions, metric, threshold
+            )
+            found = greedy_nmm(self.predictions, metric, threshold)
+            self.assertEqual(list(found.items()), list(expected.items()))
+            self.assertEqual(
+                nms(self.predictions, metric, threshold), list(expected)
+            )
+
+    def test_nmm_matches_reference(self):
+        for metric, threshold in [("IOU", 0.5), ("IOS", 0.3)]:
+            expected = reference_nmm(self.predictions, metric, threshold)
+            found = nmm(self.predictions, metric, threshold)
+            self.assertEqual(list(found.items()), list(expected.items()))
+
+    def test_empty_and_batched(self):
+        self.assertEqual(greedy_nmm(np.zeros((0, 6), np.float32)), {})
+        found = batched_greedy_nmm(self.predictions, "IOS", 0.5)
+        for keep, merge_list in found.items():
+            category_id = self.predictions[keep, 5]
+            self.assertTrue(
+                (self.predictions[merge_list, 5] == category_id).all()
+            )
+
+    def test_postprocess_merges_predictions(self):
+        predictions = [
+            ObjectPrediction(
+                bbox=box, category_id=0, category_name="a", score=score
+            )
+            for box, score in [
+                ([0, 0, 10, 10], 0.9),
+                ([1, 1, 11, 11], 0.8),
+                ([50, 50, 60, 60], 0.7),
+            ]
+        ]
+        postprocess = GreedyNMMPostprocess(
+            match_threshold=0.5, match_metric="IOS", class_agnostic=True
+        )
+        merged = postprocess(predictions)
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merged[0].bbox.to_xyxy(), [0, 0, 11, 11])
+        self.assertEqual(merged[0].score.value, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
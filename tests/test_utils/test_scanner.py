@@ -0,0 +1,72 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+import natsort
+
+from anylabeling.views.labeling.utils.scanner import ImageFolderScanner
+
+
+def touch(path):
+    os.makedirs(osp.dirname(path), exist_ok=True)
+    with open(path, "wb"):
+        pass
+
+
+class TestImageFolderScanner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = osp.join(self.tmp_dir.name, "images")
+        self.cache_dir = osp.join(self.tmp_dir.name, "cache")
+        for name in ["img10.jpg", "img2.jpg", "notes.txt", "sub/img1.PNG"]:
+            touch(osp.join(self.root, name))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_scan_and_snapshot(self):
+        scanner = ImageFolderScanner(
+            [".jpg", ".png"], num_workers=2, cache_dir=self.cache_dir
+        )
+        batches = []
+        files = scanner.scan(self.root, on_batch=batches.append)
+        expected = [
+            osp.join(self.root, "img2.jpg"),
+            osp.join(self.root, "img10.jpg"),
+            osp.join(self.root, "sub", "img1.PNG"),
+        ]
+        self.assertEqual(files, expected)
+        self.assertEqual(sorted(sum(batches, [])), sorted(expected))
+        self.assertIsNotNone(scanner.load_snapshot(self.root))
+
+        # A new file changes the directory mtime and invalidates it
+        touch(osp.join(self.root, "sub", "img3.jpg"))
+        os.utime(osp.join(self.root, "sub"), ns=(0, 0))
+        self.assertIsNone(scanner.load_snapshot(self.root))
+        self.assertEqual(len(scanner.scan(self.root)), 4)
+
+    def test_batches_in_natural_order(self):
+        for name in ["img1.jpg", "a/img20.jpg", "a/img3.jpg"]:
+            touch(osp.join(self.root, name))
+        scanner = ImageFolderScanner([".jpg", ".png"], cache_dir="")
+        batches = []
+        files = scanner.scan(self.root, on_batch=batches.append)
+        self.assertEqual(len(batches), 3)
+        for batch in batches:
+            self.assertEqual(batch, natsort.os_sorted(batch))
+        # The first image overall lives in a sub directory, which is why
+        # the UI waits for the final list before opening one
+        self.assertEqual(files[0], osp.join(self.root, "a", "img3.jpg"))
+        root_files = ["img1.jpg", "img2.jpg", "img10.jpg"]
+        self.assertEqual(
+            batches[0], [osp.join(self.root, f) for f in root_files]
+        )
+
+    def test_cancel(self):
+        scanner = ImageFolderScanner([".jpg"], cache_dir="")
+        self.assertIsNone(scanner.scan(self.root, is_canceled=lambda: True))
+
+
+if __name__ == "__main__":
+    unittest.main()
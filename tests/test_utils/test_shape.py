@@ -0,0 +1,71 @@
+import unittest
+
+from PyQt5 import QtCore
+
+from anylabeling.views.labeling.shape import Shape
+
+
+class TestShapeGeometry(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "label": "object",
+            "points": [[10.5, 20.25], [40, 20], [30, 60]],
+            "shape_type": "polygon",
+            "flags": {},
+            "custom": 1,
+        }
+        self.shape = Shape().load_from_dict(dict(self.data))
+
+    def test_round_trip(self):
+        data = self.shape.to_dict()
+        self.assertEqual(data["points"], [(10.5, 20.25), (40, 20), (30, 60)])
+        self.assertEqual(data["custom"], 1)
+        self.assertEqual(self.shape.points[1], QtCore.QPointF(40, 20))
+
+    def test_points_and_coords_stay_in_sync(self):
+        self.assertEqual(self.shape.bounding_box(), (10.5, 20, 40, 60))
+        self.shape.move_by(QtCore.QPointF(1, 2))
+        self.assertEqual(self.shape.points[0], QtCore.QPointF(11.5, 22.25))
+        self.shape.add_point(QtCore.QPointF(100, 0))
+        self.assertEqual(self.shape.coords.tolist()[-1], [100, 0])
+        self.assertEqual(self.shape.bounding_box(), (11.5, 0, 100, 62))
+        self.shape.remove_point(3)
+        self.assertEqual(len(self.shape), 3)
+        self.assertEqual(self.shape.bounding_rect().width(), 29.5)
+
+    def test_copy(self):
+        self.shape.line_color = QtCore.Qt.red
+        copied = self.shape.copy()
+        copied.move_vertex_by(0, QtCore.QPointF(5, 0))
+        self.assertEqual(self.shape.coords[0, 0], 10.5)
+        self.assertEqual(copied.coords[0, 0], 15.5)
+        self.assertEqual(copied.line_color, QtCore.Qt.red)
+        self.assertEqual(copied.other_data, {"custom": 1})
+
+    def test_drawing_overrides(self):
+        self.assertFalse(hasattr(self.shape, "__dict__"))
+        self.assertEqual(self.shape.line_color, Shape.default_line_color)
+        self.shape.fill_color = QtCore.Qt.blue
+        self.shape.closed = True
+        copied = self.shape.copy()
+        self.assertEqual(copied.fill_color, QtCore.Qt.blue)
+        self.assertTrue(copied.is_closed())
+        # Shapes without an override follow later changes of the defaults
+        default_line_width = Shape.default_line_width
+        try:
+            Shape.default_line_width = 5.0
+            self.assertEqual(copied.line_width, 5.0)
+        finally:
+            Shape.default_line_width = default_line_width
+        with self.assertRaises(AttributeError):
+            self.shape.unknown = 1
+
+    def test_circle_bounding_box(self):
+        circle = Shape(shape_type="circle")
+        circle.coords = [(10, 10), (13, 14)]
+        self.assertEqual(circle.bounding_box(), (5, 5, 15, 15))
+        self.assertTrue(circle.contains_point(QtCore.QPointF(6, 10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
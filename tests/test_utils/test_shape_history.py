@@ -0,0 +1,78 @@
+import unittest
+
+from PyQt5 import QtCore
+
+from anylabeling.views.labeling.shape import Shape
+from anylabeling.views.labeling.shape_history import ShapeHistory
+
+
+def make_polygon(x, label="object"):
+    shape = Shape(label=label, shape_type="polygon")
+    shape.points = [
+        QtCore.QPointF(x, 0),
+        QtCore.QPointF(x + 10, 0),
+        QtCore.QPointF(x + 5, 10),
+    ]
+    return shape
+
+
+class TestShapeHistory(unittest.TestCase):
+    def setUp(self):
+        self.shapes = [make_polygon(x) for x in range(0, 100, 20)]
+        self.history = ShapeHistory(max_states=3)
+        self.history.store(self.shapes)
+
+    def test_unchanged_shapes_are_shared(self):
+        self.shapes[1].move_by(QtCore.QPointF(1, 1))
+        self.shapes[3].label = "other"
+        self.history.store(self.shapes)
+        before, after = self.history.states
+        for i in (0, 2, 4):
+            self.assertIs(before[i], after[i])
+        for i in (1, 3):
+            self.assertIsNot(before[i], after[i])
+        self.assertEqual(before[3].label, "object")
+        self.assertEqual(after[1].points[0], QtCore.QPointF(21, 1))
+
+    def test_flags_changed_in_place(self):
+        self.shapes[0].flags = {"occluded": False}
+        self.history.store(self.shapes)
+        self.shapes[0].flags["occluded"] = True
+        self.history.store(self.shapes)
+        self.assertFalse(self.history.states[1][0].flags["occluded"])
+        self.assertTrue(self.history.states[2][0].flags["occluded"])
+
+    def test_color_override_is_recorded(self):
+        self.shapes[0].line_color = QtCore.Qt.red
+        self.history.store(self.shapes)
+        before, after = self.history.states
+        self.assertIsNot(before[0], after[0])
+        self.assertEqual(before[0].line_color, Shape.default_line_color)
+        self.assertEqual(after[0].line_color, QtCore.Qt.red)
+
+    def test_restore(self):
+        self.assertFalse(self.history.can_restore)
+        self.assertTrue(self.history.is_stored(self.shapes[2]))
+        self.shapes[2].move_by(QtCore.QPointF(5, 0))
+        self.assertFalse(self.history.is_stored(self.shapes[2]))
+        self.history.store(self.shapes)
+        self.assertTrue(self.history.can_restore)
+
+        restored = self.history.restore()
+        self.assertEqual(len(self.history), 0)
+        self.assertEqual(restored[2].points[0], QtCore.QPointF(40, 0))
+        self.assertIsNot(restored[2], self.shapes[2])
+        restored[0].move_by(QtCore.QPointF(1, 0))
+        self.history.store(restored)
+        self.assertEqual(self.history.last()[1].points[0].x(), 20)
+        self.assertEqual(self.history.last()[0].points[0].x(), 1)
+
+    def test_max_states(self):
+        for i in range(10):
+            self.shapes[0].move_by(QtCore.QPointF(1, 0))
+            self.history.store(self.shapes)
+        self.assertEqual(len(self.history), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
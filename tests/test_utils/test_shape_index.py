@@ -0,0 +1,77 @@
+import unittest
+
+from PyQt5 import QtCore
+
+from anylabeling.views.labeling.shape import Shape
+from anylabeling.views.labeling.shape_index import ShapeGridIndex, ShapeList
+
+
+def make_rectangle(x, y, size):
+    shape = Shape(label=f"{x},{y}", shape_type="rectangle")
+    shape.points = [
+        QtCore.QPointF(x, y),
+        QtCore.QPointF(x + size, y),
+        QtCore.QPointF(x + size, y + size),
+        QtCore.QPointF(x, y + size),
+    ]
+    return shape
+
+
+class TestShapeGridIndex(unittest.TestCase):
+    def setUp(self):
+        self.shapes = ShapeList(
+            make_rectangle(x, y, 10)
+            for x in range(0, 1000, 20)
+            for y in range(0, 1000, 20)
+        )
+        self.index = ShapeGridIndex()
+
+    def test_candidates_match_brute_force(self):
+        for x, y in [(5, 5), (15, 15), (500.5, 21), (999, 999), (-3, 4)]:
+            point = QtCore.QPointF(x, y)
+            expected = [
+                s
+                for s in reversed(self.shapes)
+                if s.bounding_rect().adjusted(-2, -2, 2, 2).contains(point)
+            ]
+            found = self.index.candidates(self.shapes, point, 2)
+            self.assertEqual(found, expected)
+
+    def test_z_order_and_updates(self):
+        point = QtCore.QPointF(5, 5)
+        top = make_rectangle(0, 0, 10)
+        self.shapes.append(top)
+        self.assertIs(self.index.candidates(self.shapes, point)[0], top)
+
+        top.move_by(QtCore.QPointF(100, 100))
+        found = self.index.candidates(self.shapes, point)
+        self.assertNotIn(top, found)
+        self.assertEqual(len(found), 1)
+
+        self.shapes.remove(found[0])
+        self.assertEqual(self.index.candidates(self.shapes, point), [])
+
+    def test_large_shape(self):
+        background = make_rectangle(-10, -10, 5000)
+        self.shapes.insert(0, background)
+        found = self.index.candidates(self.shapes, QtCore.QPointF(15, 15))
+        self.assertIs(found[-1], background)
+
+    def test_copy_drops_cached_path(self):
+        shape = self.shapes[0]
+        self.assertTrue(shape.contains_point(QtCore.QPointF(5, 5)))
+        copied = shape.copy()
+        self.assertTrue(copied.contains_point(QtCore.QPointF(5, 5)))
+
+    def test_simplified_points(self):
+        shape = Shape(shape_type="polygon")
+        shape.points = [QtCore.QPointF(x * 0.1, 0) for x in range(101)]
+        kept = shape.simplified_points(1.0)
+        self.assertEqual(len(kept), 11)
+        self.assertEqual(kept[-1], shape.points[-1])
+        shape.move_by(QtCore.QPointF(1, 1))
+        self.assertEqual(shape.simplified_points(1.0)[0].x(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+import PIL.Image
+from PyQt5 import QtCore
+
+from anylabeling.views.labeling.utils.tiled_image import TiledImage
+
+
+class TestTiledImage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.array = rng.integers(0, 255, (300, 500, 3), dtype=np.uint8)
+        self.image_file = osp.join(self.tmp_dir.name, "image.png")
+        cv2.imwrite(self.image_file, self.array)
+        self.image = TiledImage(
+            self.image_file,
+            tile_size=64,
+            cache_dir=osp.join(self.tmp_dir.name, "tiles"),
+        )
+
+    def tearDown(self):
+        self.image.close()
+        self.tmp_dir.cleanup()
+
+    def test_levels(self):
+        self.assertEqual((self.image.width(), self.image.height()), (500, 300))
+        self.assertEqual(self.image.num_levels, 4)
+        self.assertEqual(self.image.level_size(3), (63, 38))
+        self.assertEqual(self.image.level_for_scale(2.0), 0)
+        self.assertEqual(self.image.level_for_scale(0.3), 1)
+        self.assertEqual(self.image.level_for_scale(0.01), 3)
+
+    def test_build_and_read_region(self):
+        self.assertFalse(self.image.is_built())
+        self.assertTrue(self.image.build())
+        self.assertTrue(self.image.is_built())
+        region = self.image.read_region(50, 40, 100, 90)
+        expected = cv2.cvtColor(self.array[40:130, 50:150], cv2.COLOR_BGR2RGB)
+        np.testing.assert_array_equal(region, expected)
+
+    def test_levels_are_halved_from_the_previous_one(self):
+        self.image.build()
+        expected = self.array
+        for level in range(1, self.image.num_levels):
+            width, height = self.image.level_size(level)
+            if level < self.image.num_levels - 1:
+                expected = cv2.resize(
+                    expected, (width, height), interpolation=cv2.INTER_AREA
+                )
+            else:
+                # The top level is resized from the full image
+                expected = cv2.resize(
+                    self.array, (width, height), interpolation=cv2.INTER_AREA
+                )
+            region = self.image.read_region(0, 0, 500, 300, level)
+            np.testing.assert_array_equal(
+                region, cv2.cvtColor(expected, cv2.COLOR_BGR2RGB)
+            )
+
+    def test_visible_tiles_fall_back_to_coarser_levels(self):
+        self.image.build()
+        rect = QtCore.QRectF(0, 0, 100, 100)
+        tiles = list(self.image.visible_tiles(rect, 0))
+        self.assertEqual(len(tiles), 4)
+
+        os.remove(self.image.store.tile_file((0, 1, 1)))
+        self.image.tiles.clear()
+        tiles = list(self.image.visible_tiles(rect, 0))
+        self.assertEqual(len(tiles), 4)
+        target, tile, source = tiles[3]
+        self.assertEqual(target, QtCore.QRectF(64, 64, 64, 64))
+        self.assertEqual(tile.width(), 64)
+        self.assertEqual(source, QtCore.QRectF(32, 32, 32, 32))
+
+    def test_builds_of_the_same_file_share_a_lock(self):
+        other = TiledImage(
+            self.image_file,
+            tile_size=64,
+            cache_dir=osp.join(self.tmp_dir.name, "tiles"),
+        )
+        self.assertIs(other.lock, self.image.lock)
+        self.assertTrue(other.build())
+        self.assertTrue(self.image.is_built())
+
+    def test_old_pyramids_are_pruned(self):
+        self.image.build()
+        os.utime(self.image.folder, ns=(0, 0))
+        other_file = osp.join(self.tmp_dir.name, "other.png")
+        cv2.imwrite(other_file, self.array[:, ::-1])
+        other = TiledImage(
+            other_file,
+            tile_size=64,
+            cache_dir=osp.join(self.tmp_dir.name, "tiles"),
+            max_disk_bytes=1,
+        )
+        self.assertTrue(other.build())
+        self.assertFalse(osp.exists(self.image.folder))
+        self.assertTrue(other.is_built())
+
+    def test_exif_orientation(self):
+        image_file = osp.join(self.tmp_dir.name, "photos", "rotated.jpg")
+        os.makedirs(osp.dirname(image_file))
+        exif = PIL.Image.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees clockwise
+        PIL.Image.new("RGB", (40, 20)).save(image_file, exif=exif)
+        image = TiledImage(
+            image_file,
+            tile_size=64,
+            cache_dir=osp.join(self.tmp_dir.name, "tiles"),
+        )
+        self.assertEqual((image.width(), image.height()), (20, 40))
+        self.assertTrue(image.build())
+        self.assertEqual(image.read_region(0, 0, 20, 40).shape, (40, 20, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import os.path as osp
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from anylabeling.views.labeling.utils.video import VideoFrameSource
+
+
+class TestVideoFrameSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.video_path = osp.join(self.tmp_dir.name, "clip.avi")
+        writer = cv2.VideoWriter(
+            self.video_path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48)
+        )
+        for i in range(30):
+            writer.write(np.full((48, 64, 3), i * 8, np.uint8))
+        writer.release()
+        self.output_dir = osp.join(self.tmp_dir.name, "clip")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_random_access(self):
+        source = VideoFrameSource(self.video_path, self.output_dir, 3)
+        self.assertEqual(len(source.files), 10)
+        self.assertEqual(source.index_of(source.files[4]), 4)
+        self.assertIsNone(source.index_of("/elsewhere/00004.jpg"))
+        # Forward, backward and repeated reads return the same frames
+        for index in [0, 5, 2, 9, 5]:
+            frame = source.read_frame(index)
+            self.assertAlmostEqual(int(frame[0, 0, 0]), index * 24, delta=4)
+        source.release()
+
+    def test_materialize_and_reopen(self):
+        source = VideoFrameSource(self.video_path, self.output_dir, 10)
+        source.save_info()
+        self.assertEqual(source.materialize(), 3)
+        self.assertEqual(
+            sorted(
+                f for f in os.listdir(self.output_dir) if f.endswith("jpg")
+            ),
+            ["00000.jpg", "00001.jpg", "00002.jpg"],
+        )
+        source.release()
+
+        source = VideoFrameSource.from_folder(self.output_dir)
+        self.assertEqual(source.interval, 10)
+        self.assertEqual(source.materialize(), 0)
+        source.release()
+
+    def test_overreported_frame_count(self):
+        capture_class = cv2.VideoCapture
+
+        class Capture:
+            """Capture whose container claims 7 frames too many."""
+
+            def __init__(self, path):
+                self.capture = capture_class(path)
+
+            def __getattr__(self, name):
+                return getattr(self.capture, name)
+
+            def get(self, prop):
+                value = self.capture.get(prop)
+                if prop == cv2.CAP_PROP_FRAME_COUNT:
+                    value += 7
+                return value
+
+        with mock.patch.object(cv2, "VideoCapture", Capture):
+            source = VideoFrameSource(self.video_path, self.output_dir, 4)
+        self.assertEqual(source.total_frames, 30)
+        self.assertEqual(len(source.files), 8)
+        self.assertIsNotNone(source.read_frame(7))
+        source.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
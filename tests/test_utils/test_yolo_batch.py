@@ -0,0 +1,121 @@
+import os.path as osp
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+import PIL.Image
+from onnx import TensorProto, helper
+from PyQt5.QtGui import QImage
+
+from anylabeling.services.auto_labeling.__base__.yolo import YOLO
+from anylabeling.services.auto_labeling.engines import OnnxBaseModel
+from anylabeling.views.labeling.utils.image import img_pil_to_data
+
+
+def save_detector(model_path, batch_size="N"):
+    """A YOLOv8-style head with one box whose score is the image mean."""
+    graph = helper.make_graph(
+        [
+            helper.make_node(
+                "ReduceMean", ["x"], ["mean"], axes=[1, 2, 3], keepdims=1
+            ),
+            helper.make_node("Reshape", ["mean", "shape"], ["score"]),
+            helper.make_node("Mul", ["score", "zero"], ["zeros"]),
+            helper.make_node("Add", ["zeros", "box"], ["boxes"]),
+            helper.make_node("Concat", ["boxes", "score"], ["y"], axis=1),
+        ],
+        "graph",
+        [
+            helper.make_tensor_value_info(
+                "x", TensorProto.FLOAT, [batch_size, 3, 32, 32]
+            )
+        ],
+        [
+            helper.make_tensor_value_info(
+                "y", TensorProto.FLOAT, [batch_size, 5, 1]
+            )
+        ],
+        initializer=[
+            helper.make_tensor("shape", TensorProto.INT64, [3], [-1, 1, 1]),
+            helper.make_tensor("zero", TensorProto.FLOAT, [], [0.0]),
+            helper.make_tensor(
+                "box", TensorProto.FLOAT, [1, 4, 1], [16, 12, 8, 6]
+            ),
+        ],
+    )
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 7
+    onnx.save(model, model_path)
+
+
+def make_image(height, width, value):
+    array = np.full((height, width, 3), value, np.uint8)
+    return QImage.fromData(img_pil_to_data(PIL.Image.fromarray(array)))
+
+
+def summarize(result):
+    if not result:
+        return []
+    return [
+        (shape.label, [(p.x(), p.y()) for p in shape.points])
+        for shape in result.shapes
+    ]
+
+
+class TestYOLOBatchInference(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_path = osp.join(self.tmp_dir.name, "detector.onnx")
+        save_detector(self.model_path)
+        self.images = [
+            make_image(20, 40, 200),
+            make_image(30, 30, 0),
+            make_image(64, 32, 255),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_batch_matches_single_image_results(self):
+        model = YOLO(
+            {
+                "type": "yolov8",
+                "name": "detector",
+                "display_name": "Detector",
+                "model_path": self.model_path,
+                "classes": ["thing"],
+                "batch_size": 2,
+            },
+            on_message=None,
+        )
+        self.assertTrue(model.supports_batch_inference())
+        batch_results = model.predict_shapes_batch(self.images)
+        single_results = [model.predict_shapes(image) for image in self.images]
+        self.assertEqual(
+            [summarize(r) for r in batch_results],
+            [summarize(r) for r in single_results],
+        )
+        # Only the dark image has no detection
+        self.assertEqual([len(summarize(r)) for r in batch_results], [1, 0, 1])
+        self.assertNotEqual(
+            summarize(batch_results[0]), summarize(batch_results[2])
+        )
+
+    def test_static_batch_is_padded(self):
+        model_path = osp.join(self.tmp_dir.name, "static.onnx")
+        save_detector(model_path, batch_size=2)
+        net = OnnxBaseModel(model_path)
+        self.assertEqual(net.get_batch_size(), 2)
+        blob = np.random.default_rng(0).random((3, 3, 32, 32), np.float32)
+        outputs = net.get_ort_batch_inference(blob)
+        self.assertEqual(outputs[0].shape, (3, 5, 1))
+        np.testing.assert_allclose(
+            outputs[0][:, 4, 0], blob.mean(axis=(1, 2, 3)), rtol=1e-5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
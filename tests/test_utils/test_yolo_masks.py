@@ -0,0 +1,96 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from anylabeling.services.auto_labeling.__base__.yolo import YOLO
+from anylabeling.services.auto_labeling.utils import (
+    RoiMasks,
+    masks2segments,
+)
+
+
+def random_mask_inputs(num, mask_size=(160, 160), shape=(640, 640), seed=0):
+    """Return protos, mask coefficients and boxes like a YOLO seg head."""
+    rng = np.random.default_rng(seed)
+    mh, mw = mask_size
+    # Smooth protos so the masks form blobs rather than noise
+    protos = rng.normal(size=(32, mh // 8, mw // 8)).astype(np.float32)
+    protos = np.stack(
+        [
+            cv2.resize(p, (mw, mh), interpolation=cv2.INTER_CUBIC)
+            for p in protos
+        ]
+    )
+    masks_in = rng.normal(size=(num, 32)).astype(np.float32)
+    xy = rng.uniform(-20, [shape[1], shape[0]], size=(num, 2))
+    wh = rng.uniform(5, 300, size=(num, 2))
+    bboxes = np.concatenate([xy, xy + wh], axis=1).astype(np.float32)
+    return protos, masks_in, bboxes, shape
+
+
+def reference_process_mask(protos, masks_in, bboxes, shape, upsample=False):
+    """The former full-frame float64 implementation."""
+    c, mh, mw = protos.shape
+    ih, iw = shape
+    masks = 1 / (
+        1 + np.exp(-np.dot(masks_in, protos.reshape(c, -1).astype(float)))
+    )
+    masks = masks.reshape(-1, mh, mw)
+    downsampled_bboxes = bboxes.copy()
+    downsampled_bboxes[:, 0] *= mw / iw
+    downsampled_bboxes[:, 2] *= mw / iw
+    downsampled_bboxes[:, 3] *= mh / ih
+    downsampled_bboxes[:, 1] *= mh / ih
+    masks = YOLO.crop_mask_np(masks, downsampled_bboxes)
+    if upsample:
+        masks = np.stack(
+            [
+                cv2.resize(m, (iw, ih), interpolation=cv2.INTER_LINEAR)
+                for m in masks
+            ]
+        )
+    masks[masks > 0.5] = 1
+    masks[masks <= 0.5] = 0
+    return masks
+
+
+class TestYoloMasks(unittest.TestCase):
+    def assert_masks_match(self, found, expected, max_diff=1e-5):
+        self.assertIsInstance(found, RoiMasks)
+        self.assertEqual(found.shape, expected.shape[1:])
+        diff = np.count_nonzero(found.to_dense() != expected)
+        self.assertLessEqual(diff, max_diff * expected.size)
+
+    def test_process_mask_matches_full_frame(self):
+        inputs = random_mask_inputs(40)
+        expected = reference_process_mask(*inputs, upsample=True)
+        found = YOLO.process_mask(*inputs, upsample=True)
+        self.assert_masks_match(found, expected)
+
+        expected = reference_process_mask(*inputs)
+        found = YOLO.process_mask(*inputs)
+        self.assert_masks_match(found, expected)
+
+    def test_rectangular_and_fractional_scales(self):
+        for mask_size, shape in [
+            ((96, 160), (384, 640)),
+            ((160, 160), (600, 600)),
+        ]:
+            inputs = random_mask_inputs(10, mask_size, shape, seed=1)
+            expected = reference_process_mask(*inputs, upsample=True)
+            found = YOLO.process_mask(*inputs, upsample=True)
+            self.assert_masks_match(found, expected, max_diff=1e-4)
+
+    def test_segments_from_rois(self):
+        inputs = random_mask_inputs(20, seed=2)
+        masks = YOLO.process_mask(*inputs, upsample=True)
+        found = masks2segments(masks, 0.001)
+        expected = masks2segments(masks.to_dense(), 0.001)
+        self.assertEqual(len(found), len(expected))
+        for a, b in zip(found, expected):
+            np.testing.assert_array_equal(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()